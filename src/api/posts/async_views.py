@@ -0,0 +1,162 @@
+"""
+Native async read endpoints.
+
+DRF generics are sync-only, so under ASGI every request to them holds a
+worker thread. These plain Django async views serve the same envelopes from
+the async ORM and async cache calls and stay on the event loop.
+"""
+from functools import wraps
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, NotFound
+from rest_framework.request import Request
+
+from src.api.posts.pagination import PostCursorPagination
+from src.api.posts.serializers import PostReadSerializer, LikeReadSerializer, CommentReadSerializer
+from src.api.posts.views import apply_viewer_state, is_post_visible
+from src.api.users.authentication import aauthenticate
+from src.api.users.utils import standard_json_response
+from src.apps.posts import cache as post_cache
+from src.apps.posts.models import Post, Like, Comment
+from src.apps.posts.viewer import aviewer_state
+from src.core.cache import aread_through, aread_through_many
+from src.core.routers import aread_alias_for, reading_from
+
+
+def async_read_view(authenticated=False):
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return standard_json_response(
+                    success=False,
+                    message="Method not allowed.",
+                    status_code=status.HTTP_405_METHOD_NOT_ALLOWED
+                )
+            try:
+                user = await aauthenticate(request)
+                if authenticated and not user.is_authenticated:
+                    raise AuthenticationFailed("Authentication credentials were not provided.")
+                with reading_from(await aread_alias_for(user)):
+                    return await view(Request(request), user, *args, **kwargs)
+            except AuthenticationFailed as exc:
+                return standard_json_response(
+                    success=False,
+                    message="Authentication failed.",
+                    data={"detail": str(exc.detail)},
+                    status_code=status.HTTP_401_UNAUTHORIZED
+                )
+            except NotFound as exc:
+                return standard_json_response(
+                    success=False,
+                    message=str(exc.detail),
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+        return wrapper
+    return decorator
+
+
+async def aget_cached_posts(request, pks, loaded=None):
+    loaded = dict(loaded or {})
+    serializer = PostReadSerializer(context={'request': request})
+
+    async def build(missing):
+        pending = [pk for pk in missing if pk not in loaded]
+        if pending:
+            async for row in serializer.rows(Post.objects.filter(pk__in=pending)):
+                loaded[row['id']] = row
+        found = [pk for pk in missing if pk in loaded]
+        built = dict(zip(found, serializer.represent(loaded[pk] for pk in found)))
+        return {pk: built.get(pk, {}) for pk in missing}
+
+    return await aread_through_many(await post_cache.apost_detail_keys(pks), build, settings.POST_CACHE_TIMEOUT)
+
+
+async def awith_viewer_state(user, posts):
+    return apply_viewer_state(posts, await aviewer_state(user, [post['id'] for post in posts]))
+
+
+@async_read_view()
+async def public_feed(request, user):
+    paginator = PostCursorPagination()
+    cursor = request.query_params.get(paginator.cursor_query_param)
+    page_size = paginator.get_page_size(request)
+    loaded = {}
+
+    async def build_page():
+        queryset = Post.objects.filter(status='published').values(*PostReadSerializer.values)
+        page = await paginator.apaginate_queryset(queryset, request)
+        loaded.update((row['id'], row) for row in page)
+        return {'ids': [row['id'] for row in page], 'next_cursor': paginator.next_cursor}
+
+    page_key, depth = await post_cache.afeed_page_key(cursor, page_size)
+    if page_key is None:
+        feed = await build_page()
+    else:
+        feed = await aread_through(page_key, build_page, settings.FEED_CACHE_TIMEOUT)
+        await post_cache.aregister_next_cursor(feed['next_cursor'], page_size, depth)
+
+    cached = await aget_cached_posts(request, feed['ids'], loaded)
+    posts = [cached[pk] for pk in feed['ids'] if is_post_visible(cached[pk], user)]
+    return standard_json_response(
+        success=True,
+        message="Public posts retrieved successfully.",
+        data={"posts": await awith_viewer_state(user, posts), "next_cursor": feed['next_cursor']}
+    )
+
+
+@async_read_view()
+async def post_detail(request, user, pk):
+    data = (await aget_cached_posts(request, [pk]))[pk]
+    if not is_post_visible(data, user):
+        raise NotFound("No Post matches the given query.")
+
+    return standard_json_response(
+        success=True,
+        message="Post details retrieved.",
+        data={"post": (await awith_viewer_state(user, [data]))[0]}
+    )
+
+
+async def _aget_readable_post(post_id, user):
+    post = await Post.objects.only('id', 'status', 'user_id').filter(pk=post_id).afirst()
+    if post is None:
+        raise NotFound("No Post matches the given query.")
+    return not (post.status == 'draft' and post.user_id != user.id)
+
+
+@async_read_view(authenticated=True)
+async def like_list(request, user, post_id):
+    if not await _aget_readable_post(post_id, user):
+        return standard_json_response(
+            success=False,
+            message="Cannot view likes for someone else's draft.",
+            status_code=status.HTTP_403_FORBIDDEN
+        )
+
+    serializer = LikeReadSerializer(context={'request': request})
+    queryset = Like.objects.filter(post_id=post_id).order_by('-created_at', '-id')
+    return standard_json_response(
+        success=True,
+        message="Likes retrieved successfully.",
+        data={"likes": serializer.represent([row async for row in serializer.rows(queryset)])}
+    )
+
+
+@async_read_view(authenticated=True)
+async def comment_list(request, user, post_id):
+    if not await _aget_readable_post(post_id, user):
+        return standard_json_response(
+            success=False,
+            message="Cannot view comments for someone else's draft.",
+            status_code=status.HTTP_403_FORBIDDEN
+        )
+
+    serializer = CommentReadSerializer(context={'request': request})
+    queryset = Comment.objects.filter(post_id=post_id).order_by('-created_at', '-id')
+    return standard_json_response(
+        success=True,
+        message="Comments retrieved successfully.",
+        data={"comments": serializer.represent([row async for row in serializer.rows(queryset)])}
+    )
@@ -0,0 +1,145 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque cursor pagination on a unique ordering.
+
+    The cursor carries the ordering values of the last row of the page, so every
+    page is a single indexed range scan no matter how deep the client scrolls,
+    and rows inserted ahead of the cursor never shift the pages behind it.
+    """
+    ordering = None
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page_size = settings.POSTS_PAGE_SIZE
+        self.max_page_size = settings.POSTS_MAX_PAGE_SIZE
+        self.next_cursor = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, page_size = self.get_page_queryset(queryset, request)
+        return self.get_page(list(queryset), page_size)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset, page_size = self.get_page_queryset(queryset, request)
+        return self.get_page([row async for row in queryset], page_size)
+
+    def get_page_queryset(self, queryset, request):
+        self.next_cursor = None
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        # One extra row tells whether there is a next page.
+        return queryset[:page_size + 1], page_size
+
+    def get_page(self, rows, page_size):
+        page = rows[:page_size]
+        if len(rows) > page_size:
+            self.next_cursor = self.encode_cursor(page[-1])
+        return page
+
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            page_size = int(raw)
+        except ValueError:
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position_filter(self, position):
+        # (a, b) < (x, y) expanded so that each branch can use the index:
+        # a < x OR (a = x AND b < y)
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def encode_cursor(self, instance):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            # Rows may be model instances or .values() dicts.
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                self.to_python(model, field.lstrip('-'), value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def to_python(self, model, name, value):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations (e.g. a search rank) round-trip as plain JSON values.
+            return value
+        if value is None:
+            raise ValueError
+        return field.to_python(value)
+
+
+class PostCursorPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class CommentCursorPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class ReplyPagination(KeysetPagination):
+    """Replies to one comment, oldest first."""
+    ordering = ('id',)
+
+
+class ThreadPagination(KeysetPagination):
+    """Comments in depth-first thread order."""
+    ordering = ('path',)
+
+
+class TimelinePagination(KeysetPagination):
+    """Cursor format for home timelines, whose pages are ranges of post ids."""
+    ordering = ('-id',)
+
+
+class PostSearchPagination(KeysetPagination):
+    ordering = ('-rank', '-id')
+
+    def to_python(self, model, name, value):
+        if name == 'rank':
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError
+            return float(value)
+        return super().to_python(model, name, value)
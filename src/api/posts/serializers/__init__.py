@@ -1,3 +1,6 @@
 from .postserializer import PostSerializer, PostCreateSerializer, PostAuthorSerializer
 from .likeserializer import LikeSerializer
-from .commentserializer import CommentSerializer
\ No newline at end of file
+from .commentserializer import CommentSerializer
+from .postbatchserializer import PostBatchSerializer
+from .readserializers import PostReadSerializer, CommentReadSerializer, LikeReadSerializer
+from .postsearchserializer import PostSearchSerializer
@@ -6,7 +6,13 @@ from src.apps.posts.models import Comment
 class CommentSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     post = serializers.PrimaryKeyRelatedField(read_only=True)
+    parent = serializers.PrimaryKeyRelatedField(
+        queryset=Comment.objects.all(),
+        required=False,
+        allow_null=True,
+        help_text="Id of the comment being replied to; omit for a top-level comment."
+    )
 
     class Meta:
         model = Comment
-        fields = ['id', 'post', 'user', 'content', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'post', 'parent', 'user', 'content', 'depth', 'reply_count', 'created_at', 'updated_at']
@@ -0,0 +1,18 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+class PostBatchSerializer(serializers.Serializer):
+    ids = serializers.CharField(help_text="Comma-separated post ids, e.g. 4,8,15")
+
+    def validate_ids(self, value):
+        try:
+            ids = [int(part) for part in value.split(',') if part.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Ids must be integers.")
+
+        if not ids:
+            raise serializers.ValidationError("At least one id is required.")
+        if len(ids) > settings.POSTS_BATCH_MAX_IDS:
+            raise serializers.ValidationError(f"At most {settings.POSTS_BATCH_MAX_IDS} ids per request.")
+        return ids
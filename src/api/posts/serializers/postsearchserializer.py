@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+
+class PostSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(
+        min_length=2,
+        max_length=200,
+        help_text='Search terms; supports "quoted phrases", OR and -exclusions.',
+    )
@@ -2,22 +2,46 @@ from rest_framework import serializers
 
 from src.apps.posts.models import Post
 from src.apps.users.models import Users
+from src.core.media import variant_urls
 
 class PostAuthorSerializer(serializers.ModelSerializer):
+    profile_image_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Users
-        fields = ['id', 'username', 'profile_image']
+        fields = ['id', 'username', 'profile_image', 'profile_image_variants']
+
+    def get_profile_image_variants(self, obj):
+        return variant_urls(obj.profile_image_variants, obj.profile_image.storage, self.context.get('request'))
 
 class PostSerializer(serializers.ModelSerializer):
     user = PostAuthorSerializer(read_only=True)
     likes_count = serializers.IntegerField(read_only=True)
     comments_count = serializers.IntegerField(read_only=True)
+    # Filled from the ``liked_post_ids`` / ``commented_post_ids`` context sets,
+    # computed once per page by ``src.apps.posts.viewer.viewer_state``.
+    liked_by_me = serializers.SerializerMethodField()
+    commented_by_me = serializers.SerializerMethodField()
+    photo_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
-        fields = ['id', 'title', 'body', 'photo', 'user', 'status', 'created_at', 'updated_at', 'likes_count', 'comments_count']
+        fields = ['id', 'title', 'body', 'photo', 'photo_variants', 'user', 'status', 'created_at', 'updated_at', 'likes_count',
+                  'comments_count', 'liked_by_me', 'commented_by_me']
+
+    def get_photo_variants(self, obj):
+        return variant_urls(obj.photo_variants, obj.photo.storage, self.context.get('request'))
+
+    def get_liked_by_me(self, obj):
+        return obj.pk in self.context.get('liked_post_ids', ())
+
+    def get_commented_by_me(self, obj):
+        return obj.pk in self.context.get('commented_post_ids', ())
 
 class PostCreateSerializer(serializers.ModelSerializer):
+    # 'deleted' is set by src.apps.posts.deletion only.
+    status = serializers.ChoiceField(choices=['draft', 'published'], required=False)
+
     class Meta:
         model = Post
         fields = ['title', 'body', 'photo', 'status']
@@ -0,0 +1,123 @@
+from rest_framework import serializers
+
+from src.apps.posts.models import Comment, Like, Post
+from src.apps.users.models import Users
+from src.core.instrumentation import timed
+from src.core.media import variant_urls
+
+
+class ValuesReadSerializer:
+    """
+    Read-only fast path for list endpoints.
+
+    Rows come from ``queryset.values(*self.values)`` and are projected into
+    plain dicts by a hand-written ``to_representation``, skipping the per-row
+    field binding of ``ModelSerializer``. The output must stay identical to
+    the matching ``ModelSerializer``; the conformance tests in
+    ``src/apps/posts/tests.py`` diff the two.
+    """
+    values = ()
+    datetime_field = serializers.DateTimeField()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.request = self.context.get('request')
+
+    def rows(self, queryset):
+        return queryset.values(*self.values)
+
+    def serialize(self, queryset):
+        return self.represent(list(self.rows(queryset)))
+
+    def represent(self, rows):
+        """``to_representation`` of each row, reported as serializer time when instrumented."""
+        with timed('serialize'):
+            return [self.to_representation(row) for row in rows]
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    def datetime(self, value):
+        return self.datetime_field.to_representation(value)
+
+    def file_url(self, name, storage):
+        # Mirrors serializers.ImageField.to_representation with use_url=True.
+        if not name:
+            return None
+        url = storage.url(name)
+        if self.request is not None:
+            return self.request.build_absolute_uri(url)
+        return url
+
+
+class PostReadSerializer(ValuesReadSerializer):
+    """Fast equivalent of ``PostSerializer``."""
+    values = (
+        'id', 'title', 'body', 'photo', 'photo_variants', 'user_id', 'user__username', 'user__profile_image',
+        'user__profile_image_variants', 'status', 'created_at', 'updated_at', 'likes_count', 'comments_count',
+    )
+    photo_storage = Post._meta.get_field('photo').storage
+    profile_image_storage = Users._meta.get_field('profile_image').storage
+
+    def __init__(self, context=None):
+        super().__init__(context)
+        self.liked = self.context.get('liked_post_ids', ())
+        self.commented = self.context.get('commented_post_ids', ())
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'body': row['body'],
+            'photo': self.file_url(row['photo'], self.photo_storage),
+            'photo_variants': variant_urls(row['photo_variants'], self.photo_storage, self.request),
+            'user': {
+                'id': row['user_id'],
+                'username': row['user__username'],
+                'profile_image': self.file_url(row['user__profile_image'], self.profile_image_storage),
+                'profile_image_variants': variant_urls(
+                    row['user__profile_image_variants'], self.profile_image_storage, self.request,
+                ),
+            },
+            'status': row['status'],
+            'created_at': self.datetime(row['created_at']),
+            'updated_at': self.datetime(row['updated_at']),
+            'likes_count': row['likes_count'],
+            'comments_count': row['comments_count'],
+            'liked_by_me': row['id'] in self.liked,
+            'commented_by_me': row['id'] in self.commented,
+        }
+
+
+class CommentReadSerializer(ValuesReadSerializer):
+    """Fast equivalent of ``CommentSerializer``; ``user`` is ``str(user)``, i.e. the username."""
+    values = (
+        'id', 'post_id', 'parent_id', 'user__username', 'content', 'depth', 'reply_count', 'created_at',
+        'updated_at',
+    )
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'post': row['post_id'],
+            'parent': row['parent_id'],
+            'user': row['user__username'],
+            'content': row['content'],
+            'depth': row['depth'],
+            'reply_count': row['reply_count'],
+            'created_at': self.datetime(row['created_at']),
+            'updated_at': self.datetime(row['updated_at']),
+        }
+
+
+class LikeReadSerializer(ValuesReadSerializer):
+    """Fast equivalent of ``LikeSerializer``."""
+    values = ('id', 'post_id', 'user__username', 'created_at')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'post': row['post_id'],
+            'user': row['user__username'],
+            'created_at': self.datetime(row['created_at']),
+        }
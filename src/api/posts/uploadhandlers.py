@@ -0,0 +1,95 @@
+import os
+import warnings
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from PIL import Image
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class UploadRejected(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Upload rejected.'
+    default_code = 'upload_rejected'
+
+
+class UnsupportedImage(UploadRejected):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = 'Upload a valid image.'
+    default_code = 'invalid_image'
+
+
+class StreamingImageUploadHandler(TemporaryFileUploadHandler):
+    """
+    Enforce photo limits while the upload streams in.
+
+    The declared request size is checked before the body is read, the byte
+    count as chunks arrive, and the pixel dimensions as soon as the image
+    header has been received, so oversized files and decompression bombs are
+    rejected without being buffered or decoded. Chunks go to a temporary file
+    under ``FILE_UPLOAD_TEMP_DIR``, which sits outside ``MEDIA_ROOT`` but on
+    the same volume, so the final ``storage.save`` is a rename.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_bytes = settings.POST_PHOTO_MAX_BYTES
+        self.max_pixels = settings.POST_PHOTO_MAX_PIXELS
+        self.header_bytes = settings.POST_PHOTO_HEADER_BYTES
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # The non-file fields are bounded by DATA_UPLOAD_MAX_MEMORY_SIZE.
+        if content_length and content_length > self.max_bytes + settings.DATA_UPLOAD_MAX_MEMORY_SIZE:
+            raise UploadRejected(self.too_large_message())
+
+    def new_file(self, *args, **kwargs):
+        if settings.FILE_UPLOAD_TEMP_DIR:
+            os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.header = bytearray()
+        self.checked = False
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_bytes:
+            raise UploadRejected(self.too_large_message())
+        if not self.checked:
+            self.header += raw_data
+            self.check_header(final=len(self.header) >= self.header_bytes)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if not self.checked:
+            self.check_header(final=True)
+        return super().file_complete(file_size)
+
+    def check_header(self, final):
+        """Read format and size from the bytes received so far; nothing is decoded."""
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+                with Image.open(BytesIO(self.header)) as image:
+                    image_format, (width, height) = image.format, image.size
+        except Image.DecompressionBombError:
+            raise UploadRejected(self.too_many_pixels_message())
+        except Exception:
+            # Usually just a header that hasn't fully arrived yet.
+            if final:
+                raise UnsupportedImage()
+            return
+
+        if image_format not in settings.POST_PHOTO_FORMATS:
+            raise UnsupportedImage(f"Unsupported image format: {image_format}.")
+        if width * height > self.max_pixels:
+            raise UploadRejected(self.too_many_pixels_message())
+        self.checked = True
+        self.header = None
+
+    def too_large_message(self):
+        return f"Photo exceeds the {self.max_bytes // (1024 * 1024)} MB limit."
+
+    def too_many_pixels_message(self):
+        return f"Photo exceeds the {self.max_pixels // 1_000_000} megapixel limit."
@@ -1,9 +1,13 @@
 from django.urls import path
+
+from . import async_views
 from .views import (
     PostDetailView, PostCreateView,
     MyDraftPostListView, MyPublishedPostListView,
-    LikeListView, LikeCreateView,
-    CommentListView, CommentCreateView, PublicPostListView, PostUpdateView, PostDeleteView
+    LikeListView, LikeCreateView, LikeStateView,
+    CommentListView, CommentCreateView, CommentReplyListView, CommentThreadView,
+    PublicPostListView, PostUpdateView, PostDeleteView,
+    PostBatchView, PostSearchView, HomeTimelineView, HotPostListView,
 )
 
 urlpatterns = [
@@ -17,10 +21,23 @@ urlpatterns = [
     path('posts/<int:pk>/delete/', PostDeleteView.as_view(), name='post-delete'),
 
     path('<int:pk>/', PostDetailView.as_view(), name='post-detail'),
+    path('batch/', PostBatchView.as_view(), name='post-batch'),
+    path('search/', PostSearchView.as_view(), name='post-search'),
+    path('timeline/', HomeTimelineView.as_view(), name='post-timeline'),
+    path('hot/', HotPostListView.as_view(), name='post-hot'),
 
     path('<int:post_id>/likes/', LikeListView.as_view(), name='post-like-list'),
     path('<int:post_id>/likes/create/', LikeCreateView.as_view(), name='post-like-create'),
+    path('<int:post_id>/like/', LikeStateView.as_view(), name='post-like-state'),
 
     path('<int:post_id>/comments/', CommentListView.as_view(), name='post-comment-list'),
     path('<int:post_id>/comments/create/', CommentCreateView.as_view(), name='post-comment-create'),
+    path('<int:post_id>/comments/thread/', CommentThreadView.as_view(), name='post-comment-thread'),
+    path('comments/<int:comment_id>/replies/', CommentReplyListView.as_view(), name='comment-replies'),
+    path('comments/<int:comment_id>/thread/', CommentThreadView.as_view(), name='comment-thread'),
+
+    path('async/', async_views.public_feed, name='post-list-async'),
+    path('async/<int:pk>/', async_views.post_detail, name='post-detail-async'),
+    path('async/<int:post_id>/likes/', async_views.like_list, name='post-like-list-async'),
+    path('async/<int:post_id>/comments/', async_views.comment_list, name='post-comment-list-async'),
 ]
@@ -1,14 +1,33 @@
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import generics
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.generics import ListAPIView, get_object_or_404
 from rest_framework.permissions import IsAuthenticated, AllowAny
-
-from src.api.posts.serializers import PostSerializer, LikeSerializer, CommentSerializer, PostCreateSerializer
+from rest_framework.views import APIView
+
+from src.api.posts.pagination import (
+    CommentCursorPagination, PostCursorPagination, PostSearchPagination, ReplyPagination, ThreadPagination,
+    TimelinePagination,
+)
+from src.api.posts.serializers import (
+    PostSerializer, LikeSerializer, CommentSerializer, PostCreateSerializer, PostBatchSerializer,
+    PostReadSerializer, LikeReadSerializer, CommentReadSerializer, PostSearchSerializer,
+)
+from src.api.posts.uploadhandlers import StreamingImageUploadHandler, UploadRejected
+from src.api.routing import ReplicaReadMixin
 from src.api.users.utils import standard_response
+from src.apps.posts import cache as post_cache, likebuffer
+from src.apps.posts.deletion import delete_post
 from src.apps.posts.models import Post, Like, Comment
+from src.apps.posts.models.comments import MAX_DEPTH
+from src.apps.posts.hot import top_post_ids
+from src.apps.posts.search import search_posts
+from src.apps.posts.timeline import timeline_page
+from src.apps.posts.viewer import viewer_state
+from src.core.cache import read_through, read_through_many
 from rest_framework import generics, status
-from django.db.models import Count, Q
 
 class PostBaseQuerysetMixin:
     def get_queryset(self):
@@ -18,10 +37,6 @@ class PostBaseQuerysetMixin:
         qs = (
             Post.objects
             .select_related('user')
-            .annotate(
-                likes_count=Count('likes', distinct=True),
-                comments_count=Count('comments', distinct=True),
-            )
             .order_by('-created_at')
         )
 
@@ -35,25 +50,111 @@ class PostBaseQuerysetMixin:
         return qs.filter(status='published')
 
 
+def is_post_visible(data, user):
+    if not data:
+        return False
+    if data['status'] == 'published':
+        return True
+    return user.is_authenticated and data['user']['id'] == user.id
+
+
+def apply_viewer_state(posts, state):
+    return [
+        {
+            **post,
+            'liked_by_me': post['id'] in state['liked_post_ids'],
+            'commented_by_me': post['id'] in state['commented_post_ids'],
+        }
+        for post in posts
+    ]
+
+
+class CachedPostMixin:
+    """
+    Serves serialized posts from the versioned post-detail cache.
+
+    Entries hold the viewer-independent ``PostReadSerializer`` output (an empty
+    dict marks a missing post), so visibility is checked on the cached data
+    and the viewer's like/comment flags are overlaid per request.
+    """
+
+    def get_cached_posts(self, pks, loaded=None):
+        """``loaded`` maps pk to ``PostReadSerializer`` rows already fetched by the caller."""
+        loaded = dict(loaded or {})
+        serializer = PostReadSerializer(context={'request': self.request})
+
+        def build(missing):
+            pending = [pk for pk in missing if pk not in loaded]
+            if pending:
+                loaded.update((row['id'], row) for row in serializer.rows(Post.objects.filter(pk__in=pending)))
+            found = [pk for pk in missing if pk in loaded]
+            built = dict(zip(found, serializer.represent(loaded[pk] for pk in found)))
+            return {pk: built.get(pk, {}) for pk in missing}
+
+        return read_through_many(post_cache.post_detail_keys(pks), build, settings.POST_CACHE_TIMEOUT)
 
-class PublicPostListView(generics.ListAPIView):
+    def is_visible(self, data, user):
+        return is_post_visible(data, user)
+
+    def with_viewer_state(self, posts):
+        return apply_viewer_state(posts, viewer_state(self.request.user, [post['id'] for post in posts]))
+
+
+class PublicPostListView(ReplicaReadMixin, CachedPostMixin, generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [AllowAny]
+    pagination_class = PostCursorPagination
 
     def get_queryset(self):
-        return Post.objects.filter(status='published').order_by('-created_at')
+        return Post.objects.select_related('user').filter(status='published')
 
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
+        cursor = request.query_params.get(self.paginator.cursor_query_param)
+        page_size = self.paginator.get_page_size(request)
+        loaded = {}
+
+        def build_page():
+            queryset = self.filter_queryset(self.get_queryset()).values(*PostReadSerializer.values)
+            page = self.paginate_queryset(queryset)
+            loaded.update((row['id'], row) for row in page)
+            return {'ids': [row['id'] for row in page], 'next_cursor': self.paginator.next_cursor}
+
+        page_key, depth = post_cache.feed_page_key(cursor, page_size)
+        if page_key is None:
+            feed = build_page()
+        else:
+            feed = read_through(page_key, build_page, settings.FEED_CACHE_TIMEOUT)
+            post_cache.register_next_cursor(feed['next_cursor'], page_size, depth)
+
+        cached = self.get_cached_posts(feed['ids'], loaded)
+        posts = [cached[pk] for pk in feed['ids'] if self.is_visible(cached[pk], request.user)]
+        posts = self.with_viewer_state(posts)
         return standard_response(
             success=True,
             message="Public posts retrieved successfully.",
-            data={"posts": serializer.data}
+            data={"posts": posts, "next_cursor": feed['next_cursor']}
         )
 
 
-class PostCreateView(generics.CreateAPIView):
+class StreamingPhotoUploadMixin:
+    """Parse multipart bodies with ``StreamingImageUploadHandler`` instead of the default handlers."""
+
+    def initialize_request(self, request, *args, **kwargs):
+        # Must be set before anything reads the body.
+        request.upload_handlers = [StreamingImageUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, UploadRejected):
+            return standard_response(
+                success=False,
+                message=str(exc.detail),
+                status_code=exc.status_code
+            )
+        return super().handle_exception(exc)
+
+
+class PostCreateView(StreamingPhotoUploadMixin, generics.CreateAPIView):
     serializer_class = PostCreateSerializer
     permission_classes = [IsAuthenticated]
 
@@ -77,21 +178,149 @@ class PostCreateView(generics.CreateAPIView):
         )
 
 
-class PostDetailView(PostBaseQuerysetMixin, generics.RetrieveAPIView):
+class HotPostListView(ReplicaReadMixin, CachedPostMixin, generics.ListAPIView):
+    """Top posts by time-decayed likes and comments; ``?limit=`` caps the count."""
+    serializer_class = PostSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get('limit', settings.POSTS_PAGE_SIZE))
+        except ValueError:
+            limit = settings.POSTS_PAGE_SIZE
+        limit = min(max(limit, 1), settings.POSTS_MAX_PAGE_SIZE)
+
+        ids = top_post_ids(limit)
+        cached = self.get_cached_posts(ids)
+        posts = [cached[pk] for pk in ids if cached[pk].get('status') == 'published']
+        return standard_response(
+            success=True,
+            message="Hot posts retrieved successfully.",
+            data={"posts": self.with_viewer_state(posts)}
+        )
+
+
+class HomeTimelineView(ReplicaReadMixin, CachedPostMixin, generics.ListAPIView):
+    """Newest posts from followed users and the viewer, read from the materialized timeline."""
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = TimelinePagination
+
+    def list(self, request, *args, **kwargs):
+        position = self.paginator.decode_cursor(request, Post)
+        page_size = self.paginator.get_page_size(request)
+        ids = timeline_page(request.user.id, position[0] if position else None, page_size)
+        page = [row['id'] for row in self.paginator.get_page([{'id': pk} for pk in ids], page_size)]
+
+        cached = self.get_cached_posts(page)
+        posts = [cached[pk] for pk in page if self.is_visible(cached[pk], request.user)]
+        return standard_response(
+            success=True,
+            message="Home timeline retrieved successfully.",
+            data={"posts": self.with_viewer_state(posts), "next_cursor": self.paginator.next_cursor}
+        )
+
+
+class PostSearchView(ReplicaReadMixin, CachedPostMixin, PostBaseQuerysetMixin, generics.ListAPIView):
+    serializer_class = PostSerializer
+    permission_classes = [AllowAny]
+    pagination_class = PostSearchPagination
+
+    def list(self, request, *args, **kwargs):
+        params = PostSearchSerializer(data=request.query_params)
+        if not params.is_valid():
+            return standard_response(
+                success=False,
+                message="Invalid search.",
+                data=params.errors,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        # PostBaseQuerysetMixin supplies the published-or-own visibility rule.
+        queryset = search_posts(self.get_queryset(), params.validated_data['q']).values(
+            *PostReadSerializer.values, 'rank', 'title_headline', 'body_headline', 'comment_headline',
+        )
+        hits = self.paginate_queryset(queryset)
+        cached = self.get_cached_posts([hit['id'] for hit in hits], {hit['id']: hit for hit in hits})
+
+        visible = [hit for hit in hits if self.is_visible(cached[hit['id']], request.user)]
+        posts = self.with_viewer_state([cached[hit['id']] for hit in visible])
+        results = [
+            {
+                **post,
+                'rank': hit['rank'],
+                'highlight': {
+                    'title': hit['title_headline'],
+                    'body': hit['body_headline'],
+                    'comment': hit['comment_headline'],
+                },
+            }
+            for post, hit in zip(posts, visible)
+        ]
+        return standard_response(
+            success=True,
+            message="Search results retrieved successfully.",
+            data={"posts": results, "next_cursor": self.paginator.next_cursor}
+        )
+
+
+class PostDetailView(ReplicaReadMixin, CachedPostMixin, PostBaseQuerysetMixin, generics.RetrieveAPIView):
     serializer_class = PostSerializer
     permission_classes = [AllowAny]
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
+        pk = self.kwargs['pk']
+        data = self.get_cached_posts([pk])[pk]
+        if not self.is_visible(data, request.user):
+            raise NotFound("No Post matches the given query.")
+
         return standard_response(
             success=True,
             message="Post details retrieved.",
-            data={"post": serializer.data}
+            data={"post": self.with_viewer_state([data])[0]}
+        )
+
+
+class PostBatchView(ReplicaReadMixin, CachedPostMixin, generics.GenericAPIView):
+    serializer_class = PostSerializer
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        params = PostBatchSerializer(data=request.query_params)
+        if not params.is_valid():
+            return standard_response(
+                success=False,
+                message="Invalid batch request.",
+                data=params.errors,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        ids = params.validated_data['ids']
+        cached = self.get_cached_posts(list(dict.fromkeys(ids)))
+        visible = {
+            pk: data for pk, data in cached.items()
+            if self.is_visible(data, request.user)
+        }
+        visible = {post['id']: post for post in self.with_viewer_state(list(visible.values()))}
+
+        results = []
+        for pk in ids:
+            if pk in visible:
+                results.append({"id": pk, "post": visible[pk], "error": None})
+            elif cached[pk]:
+                results.append({"id": pk, "post": None, "error": "forbidden"})
+            else:
+                results.append({"id": pk, "post": None, "error": "not_found"})
+
+        return standard_response(
+            success=True,
+            message="Posts retrieved.",
+            data={"posts": results}
         )
 
 
-class PostUpdateView(generics.UpdateAPIView):
+class PostUpdateView(StreamingPhotoUploadMixin, generics.UpdateAPIView):
     serializer_class = PostCreateSerializer
     permission_classes = [IsAuthenticated]
 
@@ -131,49 +360,62 @@ class PostDeleteView(generics.DestroyAPIView):
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        instance.delete()
+        # Hidden now; likes and comments are purged in the background.
+        job = delete_post(instance)
         return standard_response(
             success=True,
             message="Post deleted successfully.",
-            data={}
+            data={"deletion_job": job.pk}
         )
 
 
-class MyPublishedPostListView(generics.ListAPIView):
+class MyPublishedPostListView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PostCursorPagination
 
     def get_queryset(self):
-        return Post.objects.filter(user=self.request.user, status='published')
+        return Post.objects.select_related('user').filter(user=self.request.user, status='published')
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        queryset = self.get_queryset().values(*PostReadSerializer.values)
+        page = self.paginate_queryset(queryset)
+        serializer = PostReadSerializer(context={
+            **self.get_serializer_context(),
+            **viewer_state(request.user, [row['id'] for row in page]),
+        })
         return standard_response(
             success=True,
             message="Your published posts.",
-            data={"posts": serializer.data}
+            data={"posts": serializer.represent(page),
+                  "next_cursor": self.paginator.next_cursor}
         )
 
 
-class MyDraftPostListView(generics.ListAPIView):
+class MyDraftPostListView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PostCursorPagination
 
     def get_queryset(self):
-        return Post.objects.filter(user=self.request.user, status='draft')
+        return Post.objects.select_related('user').filter(user=self.request.user, status='draft')
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        queryset = self.get_queryset().values(*PostReadSerializer.values)
+        page = self.paginate_queryset(queryset)
+        serializer = PostReadSerializer(context={
+            **self.get_serializer_context(),
+            **viewer_state(request.user, [row['id'] for row in page]),
+        })
         return standard_response(
             success=True,
             message="Your draft posts.",
-            data={"posts": serializer.data}
+            data={"posts": serializer.represent(page),
+                  "next_cursor": self.paginator.next_cursor}
         )
 
 
-class LikeListView(generics.ListAPIView):
+class LikeListView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = LikeSerializer
     permission_classes = [IsAuthenticated]
 
@@ -182,11 +424,11 @@ class LikeListView(generics.ListAPIView):
         post = get_object_or_404(Post, pk=post_id)
 
         user = self.request.user
-        if post.status == 'draft' and post.user != user:
+        if post.status == 'draft' and post.user_id != user.id:
             # We will handle this in the list method for consistency
             return None
 
-        return Like.objects.filter(post_id=post_id)
+        return Like.objects.select_related('user').filter(post_id=post_id).order_by('-created_at', '-id')
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
@@ -197,79 +439,204 @@ class LikeListView(generics.ListAPIView):
                 status_code=status.HTTP_403_FORBIDDEN
             )
 
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = LikeReadSerializer(context=self.get_serializer_context())
         return standard_response(
             success=True,
             message="Likes retrieved successfully.",
-            data={"likes": serializer.data}
+            data={"likes": serializer.serialize(queryset)}
         )
 
 
-class LikeCreateView(generics.CreateAPIView):
+class WriteBehindLikeMixin(CachedPostMixin):
+    """
+    With ``LIKES_WRITE_BEHIND`` on, likes are queued on the Redis stream and
+    acknowledged with 202; ``flush_likes`` applies them. Visibility is checked
+    against the cached post, so a queued tap costs no database round trip.
+    """
+
+    def queue_like(self, op, post_id):
+        data = self.get_cached_posts([post_id])[post_id]
+        if not data:
+            raise NotFound("No Post matches the given query.")
+        if not self.is_visible(data, self.request.user):
+            return standard_response(
+                success=False,
+                message="Cannot like someone else's draft." if op == likebuffer.LIKE
+                else "Cannot unlike someone else's draft.",
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+
+        likebuffer.enqueue(op, post_id, self.request.user.id)
+        return standard_response(
+            success=True,
+            message="Like queued." if op == likebuffer.LIKE else "Unlike queued.",
+            data={"post_id": post_id, "queued": True},
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
+
+class LikeCreateView(WriteBehindLikeMixin, generics.CreateAPIView):
     serializer_class = LikeSerializer
     permission_classes = [IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
-        post_id = self.kwargs.get('post_id')
-        user = self.request.user
-        post = get_object_or_404(Post, pk=post_id)
+        if settings.LIKES_WRITE_BEHIND:
+            return self.queue_like(likebuffer.LIKE, self.kwargs.get('post_id'))
 
-        if post.status == 'draft' and post.user != user:
+        post_id = self.kwargs.get('post_id')
+        visible, created, like_instance = Like.objects.like(post_id, request.user)
+        if visible and like_instance is None:
+            # The insert hit a like that a concurrent unlike removed before it
+            # could be read back; by now that unlike has committed.
+            visible, created, like_instance = Like.objects.like(post_id, request.user)
+
+        if visible is None:
+            raise NotFound("No Post matches the given query.")
+        if not visible:
             return standard_response(
                 success=False,
                 message="Cannot like someone else's draft.",
                 status_code=status.HTTP_403_FORBIDDEN
             )
-
-        serializer = self.get_serializer(data=request.data)
-        if not serializer.is_valid():
+        if like_instance is None:
             return standard_response(
                 success=False,
-                message="Validation error.",
-                data=serializer.errors,
-                status_code=status.HTTP_400_BAD_REQUEST
+                message="The like changed while it was being saved; please retry.",
+                status_code=status.HTTP_409_CONFLICT
             )
 
-        like_instance = serializer.save(user=user, post=post)
         return standard_response(
             success=True,
-            message="Post liked successfully.",
+            message="Post liked successfully." if created else "Post already liked.",
             data=LikeSerializer(like_instance).data,
-            status_code=status.HTTP_201_CREATED
+            status_code=status.HTTP_201_CREATED if created else status.HTTP_200_OK
         )
 
 
-class CommentListView(generics.ListAPIView):
-    serializer_class = CommentSerializer
+class LikeStateView(WriteBehindLikeMixin, APIView):
+    """Idempotent like (PUT) / unlike (DELETE); repeating either call changes nothing."""
     permission_classes = [IsAuthenticated]
 
-    def get_queryset(self):
-        post_id = self.kwargs.get('post_id')
-        post = get_object_or_404(Post, pk=post_id)
+    def put(self, request, post_id):
+        if settings.LIKES_WRITE_BEHIND:
+            return self.queue_like(likebuffer.LIKE, post_id)
+        return self.set_state(Like.objects.like, post_id, "Post liked.", "Cannot like someone else's draft.")
 
-        user = self.request.user
-        if post.status == 'draft' and post.user != user:
-            return None
+    def delete(self, request, post_id):
+        if settings.LIKES_WRITE_BEHIND:
+            return self.queue_like(likebuffer.UNLIKE, post_id)
+        return self.set_state(Like.objects.unlike, post_id, "Post unliked.", "Cannot unlike someone else's draft.")
 
-        return Comment.objects.filter(post_id=post_id)
+    def set_state(self, action, post_id, message, forbidden_message):
+        visible, changed, _ = action(post_id, self.request.user)
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+        if visible is None:
+            raise NotFound("No Post matches the given query.")
+        if not visible:
+            return standard_response(
+                success=False,
+                message=forbidden_message,
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+
+        return standard_response(
+            success=True,
+            message=message,
+            data={"post_id": post_id, "changed": changed}
+        )
+
+
+class CommentPageMixin:
+    """Keyset-paginated comment pages, readable when the post is published or the viewer's own."""
+    serializer_class = CommentSerializer
+    permission_classes = [IsAuthenticated]
+    forbidden_message = "Cannot view comments for someone else's draft."
+
+    def can_read(self, post):
+        # Comments are looked up directly, so their post may be awaiting deletion.
+        if post.status == 'deleted':
+            raise NotFound("No Post matches the given query.")
+        return not (post.status == 'draft' and post.user_id != self.request.user.id)
+
+    def comment_page(self, queryset, message):
         if queryset is None:
             return standard_response(
                 success=False,
-                message="Cannot view comments for someone else's draft.",
+                message=self.forbidden_message,
                 status_code=status.HTTP_403_FORBIDDEN
             )
 
-        serializer = self.get_serializer(queryset, many=True)
+        rows = self.paginate_queryset(queryset.values(*CommentReadSerializer.values))
+        serializer = CommentReadSerializer(context=self.get_serializer_context())
         return standard_response(
             success=True,
-            message="Comments retrieved successfully.",
-            data={"comments": serializer.data}
+            message=message,
+            data={"comments": serializer.represent(rows),
+                  "next_cursor": self.paginator.next_cursor}
         )
 
 
+class CommentListView(ReplicaReadMixin, CommentPageMixin, generics.ListAPIView):
+    """Top-level comments of a post, newest first; replies are fetched per comment."""
+    pagination_class = CommentCursorPagination
+
+    def get_queryset(self):
+        post_id = self.kwargs.get('post_id')
+        post = get_object_or_404(Post, pk=post_id)
+        if not self.can_read(post):
+            return None
+
+        return Comment.objects.filter(post_id=post_id, parent__isnull=True).order_by('-created_at', '-id')
+
+    def list(self, request, *args, **kwargs):
+        return self.comment_page(self.get_queryset(), "Comments retrieved successfully.")
+
+
+class CommentReplyListView(ReplicaReadMixin, CommentPageMixin, generics.ListAPIView):
+    """Direct replies to a comment, oldest first."""
+    pagination_class = ReplyPagination
+
+    def get_queryset(self):
+        parent = get_object_or_404(Comment.objects.select_related('post'), pk=self.kwargs.get('comment_id'))
+        if not self.can_read(parent.post):
+            return None
+
+        return Comment.objects.filter(parent_id=parent.pk)
+
+    def list(self, request, *args, **kwargs):
+        return self.comment_page(self.get_queryset(), "Replies retrieved successfully.")
+
+
+class CommentThreadView(ReplicaReadMixin, CommentPageMixin, generics.ListAPIView):
+    """
+    A whole post's comments (``post_id``) or one comment's subtree
+    (``comment_id``) in depth-first order, read as a single range of the
+    ``(post, path)`` index. ``?depth=`` limits how many levels below the
+    starting point are included.
+    """
+    pagination_class = ThreadPagination
+
+    def get_queryset(self):
+        if 'comment_id' in self.kwargs:
+            root = get_object_or_404(Comment.objects.select_related('post'), pk=self.kwargs['comment_id'])
+            post, path, depth = root.post, root.path, root.depth
+        else:
+            post = get_object_or_404(Post, pk=self.kwargs.get('post_id'))
+            path, depth = '', -1
+        if not self.can_read(post):
+            return None
+
+        # Path segments are hex digits, all of which sort below "~".
+        queryset = Comment.objects.filter(post_id=post.pk, path__gte=path, path__lt=path + '~')
+        levels = self.request.query_params.get('depth')
+        if levels is not None and levels.isdigit():
+            queryset = queryset.filter(depth__lte=depth + int(levels))
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        return self.comment_page(self.get_queryset(), "Comment thread retrieved successfully.")
+
+
 class CommentCreateView(generics.CreateAPIView):
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
@@ -279,7 +646,7 @@ class CommentCreateView(generics.CreateAPIView):
         user = self.request.user
         post = get_object_or_404(Post, pk=post_id)
 
-        if post.status == 'draft' and post.user != user:
+        if post.status == 'draft' and post.user_id != user.id:
             return standard_response(
                 success=False,
                 message="Cannot comment on someone else's draft.",
@@ -295,7 +662,24 @@ class CommentCreateView(generics.CreateAPIView):
                 status_code=status.HTTP_400_BAD_REQUEST
             )
 
-        comment_instance = serializer.save(user=user, post=post)
+        parent = serializer.validated_data.get('parent')
+        if parent is not None and parent.post_id != post.pk:
+            return standard_response(
+                success=False,
+                message="Validation error.",
+                data={"parent": ["Reply must belong to the same post."]},
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        if parent is not None and parent.depth >= MAX_DEPTH:
+            return standard_response(
+                success=False,
+                message="Validation error.",
+                data={"parent": [f"Threads are limited to {MAX_DEPTH} levels of replies."]},
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            comment_instance = serializer.save(user=user, post=post)
         return standard_response(
             success=True,
             message="Comment added successfully.",
@@ -0,0 +1,21 @@
+from src.core.routers import read_alias_for, reset_read_alias, set_read_alias
+
+
+class ReplicaReadMixin:
+    """
+    Serve a read-only view's queries from a replica (``src.core.routers``).
+
+    The replica is picked after authentication, so users who have just
+    written something are served from the primary instead.
+    """
+    _read_alias_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._read_alias_token = set_read_alias(read_alias_for(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._read_alias_token is not None:
+            reset_read_alias(self._read_alias_token)
+            self._read_alias_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
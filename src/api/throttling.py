@@ -0,0 +1,73 @@
+import time
+import uuid
+
+from django_redis import get_redis_connection
+from rest_framework.throttling import SimpleRateThrottle
+
+# Sliding-window log: one sorted-set member per admitted request, scored by
+# its timestamp. Trimming, counting and admitting happen in one atomic step;
+# rejected requests are not recorded, so a client is let back in as soon as
+# its oldest admitted request leaves the window.
+_ADMIT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[1]) - tonumber(ARGV[2]))
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+    redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])))
+    return -1
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return tostring(tonumber(oldest[2]) + tonumber(ARGV[2]) - tonumber(ARGV[1]))
+"""
+_admit_script = None
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    ``SimpleRateThrottle`` with its history kept in Redis and updated atomically,
+    so concurrent requests across processes cannot overshoot the rate.
+
+    Rates come from ``DEFAULT_THROTTLE_RATES`` under ``scope``.
+    """
+    cache_format = 'throttle_%(scope)s_%(ident)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        global _admit_script
+        if _admit_script is None:
+            _admit_script = get_redis_connection('default').register_script(_ADMIT)
+        wait = float(_admit_script(
+            keys=[self.key],
+            args=[time.time(), self.duration, self.num_requests, uuid.uuid4().hex],
+        ))
+        self.wait_seconds = None if wait < 0 else wait
+        return self.wait_seconds is None
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AuthIPThrottle(SlidingWindowThrottle):
+    scope = 'auth_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class AuthUsernameThrottle(SlidingWindowThrottle):
+    """Per target account, whichever IPs the attempts come from."""
+    scope = 'auth_username'
+
+    def get_cache_key(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': username.lower()[:150]}
+
+
+class UsernameCheckThrottle(AuthIPThrottle):
+    scope = 'username_check'
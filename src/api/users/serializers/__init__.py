@@ -1,3 +1,5 @@
 from .usersserializer import UsersSerializer
-from .userregisterserializer import UserRegisterSerializer
-from .tokenconfirmserializer import TokenConfirmSerializer
\ No newline at end of file
+from .userregisterserializer import UserRegisterSerializer, UsernameAvailabilitySerializer
+from .tokenconfirmserializer import TokenConfirmSerializer
+from .tokenrefreshserializer import RevocableTokenRefreshSerializer
+from .logoutserializer import LogoutSerializer
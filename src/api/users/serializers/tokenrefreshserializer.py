@@ -0,0 +1,22 @@
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from src.apps.users.revocation import claim_token, is_revoked
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh against the Redis revocation store instead of the DB blacklist.
+
+    With ``ROTATE_REFRESH_TOKENS`` the presented refresh token is claimed
+    (single use) before a new pair is issued.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_revoked(refresh):
+            raise TokenError("Token has been revoked")
+        if api_settings.ROTATE_REFRESH_TOKENS and not claim_token(refresh):
+            raise TokenError("Token has been revoked")
+        return super().validate(attrs)
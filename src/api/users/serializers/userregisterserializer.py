@@ -3,6 +3,20 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core import exceptions
 from src.apps.users.models import Users
+from src.apps.users.usernames import is_username_taken
+
+USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9]+$')
+
+
+def validate_username_format(value):
+    # STRICT: Only letters and numbers. No @, no dots, no quotes.
+    if not USERNAME_PATTERN.match(value):
+        raise serializers.ValidationError(
+            "Username must be alphanumeric (letters and numbers only)."
+        )
+
+    if len(value) < 4:
+        raise serializers.ValidationError("Too short.")
 
 
 class UserRegisterSerializer(serializers.ModelSerializer):
@@ -14,16 +28,9 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         fields = ['username', 'email', 'password']
 
     def validate_username(self, value):
-        # STRICT: Only letters and numbers. No @, no dots, no quotes.
-        if not re.match(r'^[a-zA-Z0-9]+$', value):
-            raise serializers.ValidationError(
-                "Username must be alphanumeric (letters and numbers only)."
-            )
+        validate_username_format(value)
 
-        if len(value) < 4:
-            raise serializers.ValidationError("Too short.")
-
-        if Users.objects.filter(username__iexact=value).exists():
+        if is_username_taken(value):
             raise serializers.ValidationError("Taken.")
 
         return value
@@ -33,4 +40,8 @@ class UserRegisterSerializer(serializers.ModelSerializer):
             validate_password(value)
         except exceptions.ValidationError as e:
             raise serializers.ValidationError(list(e.messages))
-        return value
\ No newline at end of file
+        return value
+
+
+class UsernameAvailabilitySerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150, validators=[validate_username_format])
@@ -1,8 +1,16 @@
 from rest_framework import serializers
 from src.apps.users.models import Users
+from src.core.media import variant_urls
 
 
 class UsersSerializer(serializers.ModelSerializer):
+    profile_image_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Users
-        fields = ['id', 'username', 'first_name', 'last_name', 'bio', 'profile_image']
+        fields = ['id', 'username', 'first_name', 'last_name', 'bio', 'profile_image', 'profile_image_variants',
+                  'followers_count', 'following_count']
+        read_only_fields = ['profile_image_variants', 'followers_count', 'following_count']
+
+    def get_profile_image_variants(self, obj):
+        return variant_urls(obj.profile_image_variants, obj.profile_image.storage, self.context.get('request'))
@@ -1,20 +1,26 @@
 from src.api.users.views import UserRegisterInitView, UserRegisterConfirmView, UserLoginView, UserListView, \
-    UserDetailView, UserUpdateInitView, UserUpdateConfirmView, UserDeleteInitView, UserDeleteConfirmView
+    UserDetailView, UserUpdateInitView, UserUpdateConfirmView, UserDeleteInitView, UserDeleteConfirmView, \
+    UserAuthCacheStatsView, UserLogoutView, UserFollowView, UsernameAvailabilityView
 
 from django.urls import path
 
 urlpatterns = [
     path('auth/register/init/', UserRegisterInitView.as_view(), name='reg-init'),
     path('auth/register/confirm/', UserRegisterConfirmView.as_view(), name='reg-confirm'),
+    path('auth/username-available/', UsernameAvailabilityView.as_view(), name='username-available'),
 
     path('auth/login/', UserLoginView.as_view(), name='login'),
+    path('auth/logout/', UserLogoutView.as_view(), name='logout'),
 
     path('users/', UserListView.as_view(), name='user-list'),
     path('users/<int:pk>/', UserDetailView.as_view(), name='user-detail'),
+    path('users/<int:pk>/follow/', UserFollowView.as_view(), name='user-follow'),
 
     path('update/init/', UserUpdateInitView.as_view(), name='user-update-init'),
     path('update/confirm/', UserUpdateConfirmView.as_view(), name='user-update-confirm'),
 
     path('delete/init/', UserDeleteInitView.as_view(), name='user-delete-init'),
     path('delete/confirm/', UserDeleteConfirmView.as_view(), name='user-delete-confirm'),
+
+    path('auth/cache-stats/', UserAuthCacheStatsView.as_view(), name='auth-cache-stats'),
 ]
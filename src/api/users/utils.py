@@ -1,8 +1,22 @@
+from django.http import JsonResponse
 from rest_framework.response import Response
 
+from src.core.instrumentation import timed
+
 def standard_response(success=True, message="", data=None, status_code=200):
     return Response({
         "success": success,
         "message": message,
         "data": data if data is not None else {}
-    }, status=status_code)
\ No newline at end of file
+    }, status=status_code)
+
+
+def standard_json_response(success=True, message="", data=None, status_code=200):
+    # Same envelope as standard_response, for plain (async) Django views.
+    # JsonResponse encodes up front, so rendering is timed here.
+    with timed('render'):
+        return JsonResponse({
+            "success": success,
+            "message": message,
+            "data": data if data is not None else {}
+        }, status=status_code)
@@ -1,16 +1,24 @@
 import uuid
 from django.core.cache import cache
 from rest_framework.exceptions import AuthenticationFailed
-from rest_framework.generics import RetrieveAPIView, ListAPIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.generics import RetrieveAPIView, ListAPIView, get_object_or_404
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from src.api.users.serializers import UserRegisterSerializer, UsersSerializer, TokenConfirmSerializer
-from src.apps.users.models import Users
+from src.api.routing import ReplicaReadMixin
+from src.api.throttling import AuthIPThrottle, AuthUsernameThrottle, UsernameCheckThrottle
+from src.api.users.serializers import UserRegisterSerializer, UsersSerializer, TokenConfirmSerializer, \
+    LogoutSerializer, UsernameAvailabilitySerializer
+from src.apps.posts.deletion import delete_user
+from src.apps.users.cache import cache_stats
+from src.apps.users.models import Follow, Users
+from src.apps.users.revocation import revoke_all_for_user, revoke_token
+from src.apps.users.usernames import is_username_taken
+from src.core.hashers import PasswordHashingBusy
 
 from .utils import standard_response
 from rest_framework import status
@@ -19,6 +27,7 @@ import uuid
 
 class UserRegisterInitView(generics.GenericAPIView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthUsernameThrottle]
     serializer_class = UserRegisterSerializer
 
     def post(self, request):
@@ -49,6 +58,7 @@ class UserRegisterInitView(generics.GenericAPIView):
 
 class UserRegisterConfirmView(generics.GenericAPIView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle]
     serializer_class = TokenConfirmSerializer
 
     def post(self, request):
@@ -94,6 +104,13 @@ class UserRegisterConfirmView(generics.GenericAPIView):
                 status_code=status.HTTP_201_CREATED
             )
 
+        except PasswordHashingBusy as e:
+            # The pending registration is kept, so the same token can be retried.
+            return standard_response(
+                success=False,
+                message=str(e.detail),
+                status_code=e.status_code
+            )
         except Exception as e:
             return standard_response(
                 success=False,
@@ -106,7 +123,7 @@ from .utils import standard_response
 from rest_framework import status
 
 
-class UserListView(generics.ListAPIView):
+class UserListView(ReplicaReadMixin, generics.ListAPIView):
     queryset = Users.objects.filter(is_active=True)
     serializer_class = UsersSerializer
     permission_classes = [IsAuthenticated]
@@ -131,7 +148,7 @@ class UserListView(generics.ListAPIView):
         )
 
 
-class UserDetailView(generics.RetrieveAPIView):
+class UserDetailView(ReplicaReadMixin, generics.RetrieveAPIView):
     queryset = Users.objects.filter(is_active=True)
     serializer_class = UsersSerializer
     permission_classes = [IsAuthenticated]
@@ -149,8 +166,33 @@ class UserDetailView(generics.RetrieveAPIView):
         )
 
 
+class UsernameAvailabilityView(generics.GenericAPIView):
+    """Live availability check for sign-up forms; most free names never reach the database."""
+    permission_classes = [AllowAny]
+    serializer_class = UsernameAvailabilitySerializer
+    throttle_classes = [UsernameCheckThrottle]
+
+    def get(self, request):
+        serializer = self.get_serializer(data=request.query_params)
+        if not serializer.is_valid():
+            return standard_response(
+                success=False,
+                message="Invalid username.",
+                data=serializer.errors,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        username = serializer.validated_data['username']
+        return standard_response(
+            success=True,
+            message="Username availability checked.",
+            data={"username": username, "available": not is_username_taken(username)}
+        )
+
+
 class UserLoginView(TokenObtainPairView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthUsernameThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -166,6 +208,12 @@ class UserLoginView(TokenObtainPairView):
                 status_code=status.HTTP_200_OK
             )
 
+        except PasswordHashingBusy as e:
+            return standard_response(
+                success=False,
+                message=str(e.detail),
+                status_code=e.status_code
+            )
         except AuthenticationFailed as e:
             # This catches the "No active account found" error
             return standard_response(
@@ -183,6 +231,32 @@ class UserLoginView(TokenObtainPairView):
                 status_code=status.HTTP_400_BAD_REQUEST
             )
 
+class UserLogoutView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = LogoutSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return standard_response(
+                success=False,
+                message="Logout failed.",
+                data=serializer.errors,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Revoke both the refresh token and the access token used for this call
+        revoke_token(serializer.validated_data['refresh'])
+        if request.auth is not None:
+            revoke_token(request.auth)
+
+        return standard_response(
+            success=True,
+            message="Logged out successfully.",
+            data={}
+        )
+
+
 class UserUpdateInitView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserRegisterSerializer
@@ -213,6 +287,7 @@ class UserUpdateInitView(generics.GenericAPIView):
 
 class UserUpdateConfirmView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [AuthIPThrottle]
 
     def post(self, request):
         user_id = str(request.user.id)
@@ -229,13 +304,24 @@ class UserUpdateConfirmView(APIView):
 
         # Apply data from Redis to the authenticated user
         user = request.user
-        for attr, value in pending_data.items():
-            if attr == 'password':
-                user.set_password(value)
-            else:
-                setattr(user, attr, value)
+        try:
+            for attr, value in pending_data.items():
+                if attr == 'password':
+                    user.set_password(value)
+                else:
+                    setattr(user, attr, value)
+        except PasswordHashingBusy as e:
+            # Nothing is saved and the pending update stays, so the client can retry.
+            return standard_response(
+                success=False,
+                message=str(e.detail),
+                status_code=e.status_code
+            )
 
-        user.save()
+        # request.user may come from the auth cache, so a full save could write
+        # back stale follower counts; only the confirmed fields are written.
+        # set_password() only touches the ``password`` field.
+        user.save(update_fields=list(pending_data))
         cache.delete(cache_key)
 
         return standard_response(
@@ -276,8 +362,9 @@ class UserDeleteConfirmView(APIView):
                 status_code=status.HTTP_400_BAD_REQUEST
             )
 
-        # Final action: Delete the user from the database
-        request.user.delete()
+        # Deactivate and hide the account now; its rows are purged in the background.
+        job = delete_user(request.user)
+        revoke_all_for_user(request.user.id)
 
         # Clean up Redis
         cache.delete(cache_key)
@@ -285,6 +372,47 @@ class UserDeleteConfirmView(APIView):
         return standard_response(
             success=True,
             message="Account deleted successfully.",
-            data={},
+            data={"deletion_job": job.pk},
             status_code=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+
+
+class UserFollowView(APIView):
+    """Idempotent follow (PUT) / unfollow (DELETE); repeating either call changes nothing."""
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, pk):
+        followee = get_object_or_404(Users, pk=pk, is_active=True)
+        if followee.pk == request.user.pk:
+            return standard_response(
+                success=False,
+                message="You cannot follow yourself.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        _, created = Follow.objects.get_or_create(follower=request.user, followee=followee)
+        return standard_response(
+            success=True,
+            message="User followed.",
+            data={"user_id": pk, "changed": created}
+        )
+
+    def delete(self, request, pk):
+        deleted, _ = Follow.objects.filter(follower=request.user, followee_id=pk).delete()
+        return standard_response(
+            success=True,
+            message="User unfollowed.",
+            data={"user_id": pk, "changed": bool(deleted)}
+        )
+
+
+class UserAuthCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        # Counters are per process; each worker reports its own hit rate.
+        return standard_response(
+            success=True,
+            message="Authentication cache statistics.",
+            data=cache_stats()
+        )
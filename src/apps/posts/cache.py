@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from src.core.cache import aget_versions, bump_version, bump_versions, get_versions
+
+FEED_VERSION_KEY = 'post_feed_version'
+
+
+def post_version_key(pk):
+    return f"post_version_{pk}"
+
+
+def post_detail_keys(pks):
+    versions = get_versions([post_version_key(pk) for pk in pks])
+    return {pk: f"post_detail_{pk}_{versions[post_version_key(pk)]}" for pk in pks}
+
+
+async def apost_detail_keys(pks):
+    versions = await aget_versions([post_version_key(pk) for pk in pks])
+    return {pk: f"post_detail_{pk}_{versions[post_version_key(pk)]}" for pk in pks}
+
+
+def _feed_version():
+    return get_versions([FEED_VERSION_KEY])[FEED_VERSION_KEY]
+
+
+async def _afeed_version():
+    return (await aget_versions([FEED_VERSION_KEY]))[FEED_VERSION_KEY]
+
+
+def _cursor_depth_key(version, page_size, cursor):
+    return f"post_feed_cursor_{version}_{page_size}_{cursor}"
+
+
+def _feed_page_key(version, cursor, page_size, depth):
+    if depth is None:
+        return None, None
+    return f"post_feed_{version}_{page_size}_{cursor or 'first'}", depth
+
+
+def feed_page_key(cursor, page_size):
+    """
+    Return ``(cache_key, depth)`` for a public-feed page, or ``(None, None)``
+    when the page lies beyond the first ``FEED_CACHE_PAGES`` pages.
+
+    Cursors are opaque, so the depth of a cursor is learnt from the cached
+    page that handed it out (see ``register_next_cursor``).
+    """
+    version = _feed_version()
+    depth = cache.get(_cursor_depth_key(version, page_size, cursor)) if cursor else 1
+    return _feed_page_key(version, cursor, page_size, depth)
+
+
+async def afeed_page_key(cursor, page_size):
+    version = await _afeed_version()
+    depth = await cache.aget(_cursor_depth_key(version, page_size, cursor)) if cursor else 1
+    return _feed_page_key(version, cursor, page_size, depth)
+
+
+def register_next_cursor(cursor, page_size, depth):
+    if cursor and depth < settings.FEED_CACHE_PAGES:
+        cache.set(_cursor_depth_key(_feed_version(), page_size, cursor), depth + 1,
+                  timeout=settings.FEED_CACHE_TIMEOUT)
+
+
+async def aregister_next_cursor(cursor, page_size, depth):
+    if cursor and depth < settings.FEED_CACHE_PAGES:
+        await cache.aset(_cursor_depth_key(await _afeed_version(), page_size, cursor), depth + 1,
+                         timeout=settings.FEED_CACHE_TIMEOUT)
+
+
+def invalidate_post(pk):
+    transaction.on_commit(lambda: bump_version(post_version_key(pk)))
+
+
+def invalidate_posts(pks):
+    keys = [post_version_key(pk) for pk in pks]
+    if keys:
+        transaction.on_commit(lambda: bump_versions(keys))
+
+
+def invalidate_feed():
+    transaction.on_commit(lambda: bump_version(FEED_VERSION_KEY))
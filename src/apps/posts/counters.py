@@ -0,0 +1,34 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Like
+
+
+def _count_subquery(model):
+    counts = (
+        model.objects
+        .filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def actual_likes_count():
+    return _count_subquery(Like)
+
+
+def actual_comments_count():
+    return _count_subquery(Comment)
+
+
+def find_counter_drift(queryset):
+    """Return ``(pk, likes, comments)`` for posts whose stored counters disagree with the rows."""
+    return list(
+        queryset
+        .annotate(actual_likes=actual_likes_count(), actual_comments=actual_comments_count())
+        .filter(~Q(likes_count=F('actual_likes')) | ~Q(comments_count=F('actual_comments')))
+        .values_list('pk', 'actual_likes', 'actual_comments')
+    )
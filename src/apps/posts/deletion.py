@@ -0,0 +1,280 @@
+"""
+Background deletion of posts and user accounts.
+
+Deleting a post or an account through the ORM collects every dependent row
+into memory and deletes them one by one inside the request. Here the request
+only hides the target (the post's status becomes ``deleted``, which the
+default ``Post`` manager leaves out; the account is deactivated and its posts
+hidden the same way) and records a ``DeletionJob``. A background task then
+purges the dependents in batches of ``DELETION_BATCH_SIZE`` rows, fixing the
+counters of the rows that survive, and finally deletes the target itself.
+
+Every batch is idempotent and the job's stage is saved as it advances, so an
+interrupted job is simply run again; ``purge_deletions`` does that for jobs
+whose worker died.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from src.apps.users.cache import invalidate_user
+from src.apps.users.models import Follow, Users
+from src.core.background import submit_on_commit
+from .cache import invalidate_feed, invalidate_post, invalidate_posts
+from .hot import record_engagement, remove_post, remove_posts
+from .models import Comment, DeletionJob, Like, Post
+from .timeline import invalidate_timeline
+
+
+def delete_post(post):
+    """Hide ``post`` now and purge it in the background; returns the job."""
+    with transaction.atomic():
+        job, _ = DeletionJob.objects.get_or_create(kind='post', target_id=post.pk)
+        Post.all_objects.filter(pk=post.pk).update(status='deleted')
+        invalidate_post(post.pk)
+        remove_post(post.pk)
+        if post.status == 'published':
+            invalidate_feed()
+        submit_on_commit(run_job, job.pk)
+    return job
+
+
+def delete_user(user):
+    """Deactivate ``user``, hide their posts and purge both in the background; returns the job."""
+    with transaction.atomic():
+        job, _ = DeletionJob.objects.get_or_create(kind='user', target_id=user.pk)
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        posts = Post.all_objects.filter(user_id=user.pk).exclude(status='deleted')
+        post_ids = list(posts.values_list('pk', flat=True))
+        posts.update(status='deleted')
+        invalidate_posts(post_ids)
+        remove_posts(post_ids)
+        invalidate_feed()
+        submit_on_commit(run_job, job.pk)
+    return job
+
+
+def _execute(sql, params, **tables):
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(**tables), params)
+        return cursor.rowcount, cursor.fetchall() if cursor.description else []
+
+
+def _purge_post_likes(post_id, limit):
+    deleted, _ = _execute(
+        """
+        DELETE FROM {like_table} WHERE id IN (
+            SELECT id FROM {like_table} WHERE post_id = %(post_id)s LIMIT %(limit)s
+        )
+        """,
+        {'post_id': post_id, 'limit': limit},
+        like_table=Like._meta.db_table,
+    )
+    return deleted
+
+
+def _purge_post_comments(post_id, limit):
+    # Descending path order reaches every reply before the comment it answers,
+    # so no batch leaves a reply pointing at a deleted parent.
+    deleted, _ = _execute(
+        """
+        DELETE FROM {comment_table} WHERE id IN (
+            SELECT id FROM {comment_table} WHERE post_id = %(post_id)s ORDER BY path DESC LIMIT %(limit)s
+        )
+        """,
+        {'post_id': post_id, 'limit': limit},
+        comment_table=Comment._meta.db_table,
+    )
+    return deleted
+
+
+def _purge_post_row(post_id):
+    # Nothing depends on the post any more, so the collector has nothing to load.
+    deleted, _ = Post.all_objects.filter(pk=post_id).delete()
+    return deleted
+
+
+def _purge_post(post_id, limit):
+    return _purge_post_likes(post_id, limit) or _purge_post_comments(post_id, limit) or _purge_post_row(post_id)
+
+
+def _purge_user_posts(user_id, limit):
+    post_id = Post.all_objects.filter(user_id=user_id).values_list('pk', flat=True).first()
+    if post_id is None:
+        return 0
+    return _purge_post(post_id, limit)
+
+
+def _purge_user_likes(user_id, limit):
+    _, counts = _execute(
+        """
+        WITH deleted AS (
+            DELETE FROM {like_table} WHERE id IN (
+                SELECT id FROM {like_table} WHERE user_id = %(user_id)s LIMIT %(limit)s
+            )
+            RETURNING post_id, created_at
+        ), counts AS (
+            SELECT post_id, count(*) AS n, array_agg(created_at) AS created FROM deleted GROUP BY post_id
+        ), counted AS (
+            UPDATE {post_table} p SET likes_count = p.likes_count - counts.n
+            FROM counts WHERE p.id = counts.post_id
+        )
+        SELECT post_id, n, created FROM counts
+        """,
+        {'user_id': user_id, 'limit': limit},
+        like_table=Like._meta.db_table, post_table=Post._meta.db_table,
+    )
+    for post_id, _, created in counts:
+        invalidate_post(post_id)
+        record_engagement(post_id, -settings.HOT_LIKE_WEIGHT, at=created)
+    return sum(n for _, n, _ in counts)
+
+
+def _purge_user_comments(user_id, limit):
+    # A comment goes with its whole reply subtree, as ON DELETE CASCADE would
+    # have it; the subtree is one path range of the (post, path) index. A
+    # batch takes the deepest ``limit`` rows of those subtrees, so one popular
+    # comment cannot turn a batch into an unbounded delete, and descending
+    # path order removes every reply before the comment it answers.
+    _, counts = _execute(
+        """
+        WITH targets AS (
+            SELECT DISTINCT c.id, c.post_id, c.path
+            FROM {comment_table} r
+            JOIN {comment_table} c ON c.post_id = r.post_id AND c.path >= r.path AND c.path < r.path || '~'
+            WHERE r.user_id = %(user_id)s
+            ORDER BY c.post_id, c.path DESC LIMIT %(limit)s
+        ), deleted AS (
+            DELETE FROM {comment_table} c USING targets t WHERE c.id = t.id
+            RETURNING c.id, c.post_id, c.parent_id, c.created_at
+        ), counts AS (
+            SELECT post_id, count(*) AS n, array_agg(created_at) AS created FROM deleted GROUP BY post_id
+        ), counted AS (
+            UPDATE {post_table} p SET comments_count = p.comments_count - counts.n
+            FROM counts WHERE p.id = counts.post_id
+        ), replies AS (
+            SELECT parent_id, count(*) AS n FROM deleted
+            WHERE parent_id IS NOT NULL AND parent_id NOT IN (SELECT id FROM deleted)
+            GROUP BY parent_id
+        ), replied AS (
+            UPDATE {comment_table} c SET reply_count = c.reply_count - replies.n
+            FROM replies WHERE c.id = replies.parent_id
+        )
+        SELECT post_id, n, created FROM counts
+        """,
+        {'user_id': user_id, 'limit': limit},
+        comment_table=Comment._meta.db_table, post_table=Post._meta.db_table,
+    )
+    for post_id, _, created in counts:
+        invalidate_post(post_id)
+        record_engagement(post_id, -settings.HOT_COMMENT_WEIGHT, at=created)
+    return sum(n for _, n, _ in counts)
+
+
+def _purge_follows(column, other, counter, user_id, limit):
+    _, rows = _execute(
+        """
+        WITH deleted AS (
+            DELETE FROM {follow_table} WHERE id IN (
+                SELECT id FROM {follow_table} WHERE {column} = %(user_id)s LIMIT %(limit)s
+            )
+            RETURNING {other}
+        ), counted AS (
+            UPDATE {user_table} SET {counter} = {counter} - 1 WHERE id IN (SELECT {other} FROM deleted)
+        )
+        SELECT {other} FROM deleted
+        """,
+        {'user_id': user_id, 'limit': limit},
+        follow_table=Follow._meta.db_table, user_table=Users._meta.db_table,
+        column=column, other=other, counter=counter,
+    )
+    users = [user for user, in rows]
+    for user in users:
+        invalidate_user(user)
+    return users
+
+
+def _purge_user_follows(user_id, limit):
+    followees = _purge_follows('follower_id', 'followee_id', 'followers_count', user_id, limit)
+    if followees:
+        return len(followees)
+    followers = _purge_follows('followee_id', 'follower_id', 'following_count', user_id, limit)
+    for follower in followers:
+        transaction.on_commit(lambda follower=follower: invalidate_timeline(follower))
+    return len(followers)
+
+
+def _purge_user_row(user_id, limit):
+    deleted, _ = Users.objects.filter(pk=user_id).delete()
+    transaction.on_commit(lambda: invalidate_timeline(user_id))
+    return deleted
+
+
+# Stage name -> step(target_id, limit), which deletes one batch and returns
+# how many rows it removed; a stage is finished once its step returns 0.
+STAGES = {
+    'post': [
+        ('likes', _purge_post_likes),
+        ('comments', _purge_post_comments),
+        ('row', lambda post_id, limit: _purge_post_row(post_id)),
+    ],
+    'user': [
+        ('posts', _purge_user_posts),
+        ('likes', _purge_user_likes),
+        ('comments', _purge_user_comments),
+        ('follows', _purge_user_follows),
+        ('row', _purge_user_row),
+    ],
+}
+
+
+def _claim(job_id):
+    """Mark the job as running unless a live worker already has it."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.DELETION_STALE_AFTER)
+    return DeletionJob.objects.filter(
+        Q(status__in=['pending', 'failed']) | Q(status='running', updated_at__lt=stale),
+        pk=job_id,
+    ).update(status='running', updated_at=now) == 1
+
+
+def run_job(job_id, batch_size=None):
+    """
+    Purge a job's target batch by batch; returns ``False`` when the job is
+    finished or being run elsewhere.
+    """
+    if not _claim(job_id):
+        return False
+    job = DeletionJob.objects.get(pk=job_id)
+    limit = batch_size or settings.DELETION_BATCH_SIZE
+    stages = STAGES[job.kind]
+    names = [name for name, _ in stages]
+    start = names.index(job.stage) if job.stage in names else 0
+
+    try:
+        for name, step in stages[start:]:
+            while True:
+                with transaction.atomic():
+                    deleted = step(job.target_id, limit)
+                    DeletionJob.objects.filter(pk=job_id).update(
+                        stage=name, deleted_rows=F('deleted_rows') + deleted, updated_at=timezone.now(),
+                    )
+                if not deleted:
+                    break
+                time.sleep(settings.DELETION_BATCH_PAUSE)
+    except Exception as exc:
+        DeletionJob.objects.filter(pk=job_id).update(status='failed', error=repr(exc), updated_at=timezone.now())
+        raise
+
+    now = timezone.now()
+    DeletionJob.objects.filter(pk=job_id).update(status='done', error='', updated_at=now, finished_at=now)
+    return True
+
+
+def open_jobs():
+    return DeletionJob.objects.exclude(status='done').order_by('id')
@@ -0,0 +1,110 @@
+"""
+Trending posts: a Redis sorted set of time-decayed engagement scores.
+
+Each like or comment adds ``weight * 2 ** ((now - epoch) / HOT_HALF_LIFE)``.
+Scores in the set are therefore all relative to the same ``epoch``, so newer
+engagement outweighs older engagement without touching existing members, and
+reading the top K is a single ``ZREVRANGE``. ``decay`` moves the epoch to now,
+rescaling every score by the same factor (which keeps the order) so they stay
+small, and compacts the set. Taking engagement back (an unlike, a deleted
+comment) subtracts what it added, computed from when it happened.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+
+HOT_KEY = 'hot_posts'
+HOT_EPOCH_KEY = 'hot_posts_epoch'
+
+# Both scripts read the epoch inside Redis, so an increment can never be
+# computed against an epoch that a concurrent decay has just replaced.
+_INCREMENT = """
+local epoch = tonumber(redis.call('GET', KEYS[2]))
+if not epoch then
+    epoch = tonumber(ARGV[1])
+    redis.call('SET', KEYS[2], ARGV[1])
+end
+local half_life = tonumber(ARGV[4])
+-- One unit of weight per timestamp in ARGV[6..], or one unit now.
+local units = 0
+if #ARGV == 5 then
+    units = 2 ^ ((tonumber(ARGV[1]) - epoch) / half_life)
+else
+    for i = 6, #ARGV do
+        units = units + 2 ^ ((tonumber(ARGV[i]) - epoch) / half_life)
+    end
+end
+local weight = tonumber(ARGV[3])
+local score = tonumber(redis.call('ZINCRBY', KEYS[1], weight * units, ARGV[2]))
+-- A take-back that leaves (about) nothing drops the member, as the next
+-- decay would; this also covers members decay has already compacted away.
+if weight < 0 and score < tonumber(ARGV[5]) then
+    redis.call('ZREM', KEYS[1], ARGV[2])
+end
+return tostring(score)
+"""
+_DECAY = """
+local epoch = tonumber(redis.call('GET', KEYS[2]))
+if epoch and redis.call('EXISTS', KEYS[1]) == 1 then
+    local factor = 2 ^ (-(tonumber(ARGV[1]) - epoch) / tonumber(ARGV[2]))
+    redis.call('ZUNIONSTORE', KEYS[1], 1, KEYS[1], 'WEIGHTS', factor)
+end
+redis.call('SET', KEYS[2], ARGV[1])
+local removed = redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[3])
+removed = removed + redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -tonumber(ARGV[4]) - 1)
+return {removed, redis.call('ZCARD', KEYS[1])}
+"""
+_scripts = {}
+
+
+def _redis():
+    return get_redis_connection('default')
+
+
+def _script(source):
+    if source not in _scripts:
+        _scripts[source] = _redis().register_script(source)
+    return _scripts[source]
+
+
+def _increment(post_id, weight, at):
+    _script(_INCREMENT)(
+        keys=[HOT_KEY, HOT_EPOCH_KEY],
+        args=[time.time(), post_id, weight, settings.HOT_HALF_LIFE, settings.HOT_MIN_SCORE, *at],
+    )
+
+
+def record_engagement(post_id, weight, at=()):
+    """
+    Add (or, with a negative weight, take back) engagement once the transaction commits.
+
+    ``at`` holds the creation times (datetimes) of the likes or comments
+    being taken back, one unit of ``weight`` each, so that each subtracts
+    exactly what it added. Without it, ``weight`` counts as of now.
+    """
+    timestamps = [moment.timestamp() for moment in at]
+    transaction.on_commit(lambda: _increment(post_id, weight, timestamps))
+
+
+def remove_post(post_id):
+    transaction.on_commit(lambda: _redis().zrem(HOT_KEY, post_id))
+
+
+def remove_posts(post_ids):
+    if post_ids:
+        transaction.on_commit(lambda: _redis().zrem(HOT_KEY, *post_ids))
+
+
+def decay():
+    """Rebase scores on the current time and compact; returns ``(removed, remaining)``."""
+    removed, remaining = _script(_DECAY)(
+        keys=[HOT_KEY, HOT_EPOCH_KEY],
+        args=[time.time(), settings.HOT_HALF_LIFE, settings.HOT_MIN_SCORE, settings.HOT_MAX_SIZE],
+    )
+    return removed, remaining
+
+
+def top_post_ids(limit):
+    return [int(member) for member in _redis().zrevrange(HOT_KEY, 0, limit - 1)]
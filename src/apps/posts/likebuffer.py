@@ -0,0 +1,203 @@
+"""
+Write-behind likes: taps are appended to a Redis stream and applied to the
+``Like`` table in batches.
+
+Delivery is at-least-once. An entry is acknowledged (and deleted from the
+stream) only after the transaction applying its batch has committed. A
+replayed batch is harmless as long as it is applied before anything newer:
+inserts ignore the unique ``(post, user)`` constraint, deletes of missing
+rows do nothing, and ``likes_count`` moves by the rows that actually changed,
+so each batch costs the same however many likes a post already has.
+
+Within a batch the last operation per ``(post, user)`` wins. Ordering across
+batches holds only with a single flusher per stream, which is what
+``flush_likes`` runs, under a consumer name that survives restarts
+(``LIKES_CONSUMER_NAME``): a restarted flusher first re-applies the entries
+it had read but not acknowledged, and only then reads new ones. Entries
+pending under any other consumer name are claimed after
+``LIKES_CLAIM_IDLE_MS``; that fallback is for retired names only, since
+newer taps may already have been applied by then.
+
+A like is durable once Redis has persisted it (AOF ``everysec`` loses up to
+about a second of taps on a Redis crash). Until its batch is flushed it is
+missing from ``likes_count`` and the like lists.
+"""
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from src.apps.users.models import Users
+from .cache import invalidate_post
+from .hot import record_engagement
+from .models import Like, Post
+
+LIKE = 'like'
+UNLIKE = 'unlike'
+
+
+def _redis():
+    return get_redis_connection('default')
+
+
+def enqueue(op, post_id, user_id):
+    _redis().xadd(settings.LIKES_STREAM_KEY, {'op': op, 'post_id': post_id, 'user_id': user_id})
+
+
+def ensure_group():
+    try:
+        _redis().xgroup_create(settings.LIKES_STREAM_KEY, settings.LIKES_STREAM_GROUP, id='0', mkstream=True)
+    except ResponseError as exc:
+        if 'BUSYGROUP' not in str(exc):
+            raise
+
+
+def consumer_name():
+    # Stable across restarts, so a restarted flusher finds its own pending entries.
+    return settings.LIKES_CONSUMER_NAME
+
+
+def read_batch(consumer, block_ms):
+    """
+    Entries this consumer read but never acknowledged (it crashed before
+    XACK) first, then entries left by retired consumers, then new ones.
+    """
+    redis = _redis()
+    streams = redis.xreadgroup(
+        settings.LIKES_STREAM_GROUP, consumer, {settings.LIKES_STREAM_KEY: '0'},
+        count=settings.LIKES_FLUSH_BATCH,
+    )
+    if streams and streams[0][1]:
+        return streams[0][1]
+    _, entries, _ = redis.xautoclaim(
+        settings.LIKES_STREAM_KEY, settings.LIKES_STREAM_GROUP, consumer,
+        min_idle_time=settings.LIKES_CLAIM_IDLE_MS, count=settings.LIKES_FLUSH_BATCH,
+    )
+    if entries:
+        return entries
+    streams = redis.xreadgroup(
+        settings.LIKES_STREAM_GROUP, consumer, {settings.LIKES_STREAM_KEY: '>'},
+        count=settings.LIKES_FLUSH_BATCH, block=block_ms,
+    )
+    return streams[0][1] if streams else []
+
+
+def _final_operations(entries):
+    final = {}
+    for _, fields in entries:
+        final[int(fields[b'post_id']), int(fields[b'user_id'])] = fields[b'op'].decode()
+    return final
+
+
+def _insert_likes(pairs):
+    """Insert the (post, user) likes; returns ``{post_id: inserted}``, existing rows not counted."""
+    inserted = Counter()
+    if not pairs:
+        return inserted
+    post_ids, user_ids = zip(*pairs)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {Like._meta.db_table} (post_id, user_id, created_at)
+            SELECT post_id, user_id, %s FROM unnest(%s::integer[], %s::bigint[]) AS t(post_id, user_id)
+            ON CONFLICT (post_id, user_id) DO NOTHING
+            RETURNING post_id
+            """,
+            [timezone.now(), list(post_ids), list(user_ids)],
+        )
+        inserted.update(post_id for post_id, in cursor.fetchall())
+    return inserted
+
+
+def _adjust_likes_counts(deltas):
+    if not deltas:
+        return
+    post_ids, amounts = zip(*sorted(deltas.items()))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {Post._meta.db_table} p SET likes_count = p.likes_count + d.delta
+            FROM unnest(%s::integer[], %s::integer[]) AS d(id, delta)
+            WHERE p.id = d.id
+            """,
+            [list(post_ids), list(amounts)],
+        )
+
+
+def _delete_likes(pairs):
+    """Delete the (post, user) likes; returns ``{post_id: [created_at, ...]}`` of the rows removed."""
+    removed = defaultdict(list)
+    if not pairs:
+        return removed
+    post_ids, user_ids = zip(*pairs)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            DELETE FROM {Like._meta.db_table}
+            WHERE (post_id, user_id) IN (SELECT * FROM unnest(%s::integer[], %s::bigint[]))
+            RETURNING post_id, created_at
+            """,
+            [list(post_ids), list(user_ids)],
+        )
+        for post_id, created_at in cursor.fetchall():
+            removed[post_id].append(created_at)
+    return removed
+
+
+def apply_batch(entries):
+    """Apply one batch in one transaction; returns the number of entries that took effect."""
+    final = _final_operations(entries)
+    posts = {
+        pk: (post_status, owner)
+        for pk, post_status, owner in Post.objects.filter(pk__in={post for post, _ in final})
+        .values_list('id', 'status', 'user_id')
+    }
+    users = set(Users.objects.filter(pk__in={user for _, user in final}).values_list('pk', flat=True))
+
+    likes, unlikes = [], []
+    for (post_id, user_id), op in final.items():
+        post = posts.get(post_id)
+        if post is None or user_id not in users:
+            continue
+        if op == UNLIKE:
+            unlikes.append((post_id, user_id))
+        elif post[0] == 'published' or post[1] == user_id:
+            likes.append((post_id, user_id))
+
+    touched = {post_id for post_id, _ in likes} | {post_id for post_id, _ in unlikes}
+    if not touched:
+        return 0
+
+    with transaction.atomic():
+        # The raw insert and delete send no signals; counters, cache and hot
+        # scores are settled below, once per post.
+        inserted = _insert_likes(likes)
+        removed = _delete_likes(unlikes)
+        deltas = {post_id: inserted[post_id] - len(removed[post_id]) for post_id in touched}
+        _adjust_likes_counts({post_id: delta for post_id, delta in deltas.items() if delta})
+
+        for post_id in touched:
+            if inserted[post_id] or removed[post_id]:
+                invalidate_post(post_id)
+            if inserted[post_id]:
+                record_engagement(post_id, inserted[post_id] * settings.HOT_LIKE_WEIGHT)
+            if removed[post_id]:
+                # Removed likes take back what they added when they were made.
+                record_engagement(post_id, -settings.HOT_LIKE_WEIGHT, at=removed[post_id])
+    return len(likes) + len(unlikes)
+
+
+def acknowledge(entries):
+    ids = [entry_id for entry_id, _ in entries]
+    pipe = _redis().pipeline()
+    pipe.xack(settings.LIKES_STREAM_KEY, settings.LIKES_STREAM_GROUP, *ids)
+    pipe.xdel(settings.LIKES_STREAM_KEY, *ids)
+    pipe.execute()
+
+
+def backlog():
+    """Entries not yet applied; acknowledged entries are deleted, so that is the stream length."""
+    return _redis().xlen(settings.LIKES_STREAM_KEY)
@@ -0,0 +1,88 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from src.apps.posts.models import Post
+
+
+def _summary(latencies, elapsed):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (
+        f"{len(latencies) / elapsed:8.1f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms   "
+        f"p99 {p99 * 1000:7.2f} ms"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare req/s and p99 latency of the WSGI (sync DRF) and ASGI (native async) read paths. "
+        "Requests go through the in-process handlers, so the numbers compare handler and ORM cost, "
+        "not socket handling; use a real server and load generator for slow-client tests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=50)
+
+    def handle(self, *args, requests, concurrency, **options):
+        post = Post.objects.filter(status='published').select_related('user').first()
+        if post is None:
+            raise CommandError("Seed at least one published post first.")
+
+        headers = {
+            'host': 'localhost',
+            'authorization': f"Bearer {AccessToken.for_user(post.user)}",
+        }
+        endpoints = [
+            ('feed', reverse('post-list'), reverse('post-list-async')),
+            ('detail', reverse('post-detail', args=[post.pk]), reverse('post-detail-async', args=[post.pk])),
+            ('likes', reverse('post-like-list', args=[post.pk]), reverse('post-like-list-async', args=[post.pk])),
+            ('comments', reverse('post-comment-list', args=[post.pk]),
+             reverse('post-comment-list-async', args=[post.pk])),
+        ]
+
+        for name, sync_path, async_path in endpoints:
+            self.stdout.write(f"{name:<9} wsgi  {self.run_wsgi(sync_path, headers, requests, concurrency)}")
+            self.stdout.write(f"{name:<9} asgi  {self.run_asgi(async_path, headers, requests, concurrency)}")
+
+    def run_wsgi(self, path, headers, requests, concurrency):
+        def worker(count):
+            client = Client(headers=headers)
+            latencies = []
+            for _ in range(count):
+                start = time.perf_counter()
+                client.get(path)
+                latencies.append(time.perf_counter() - start)
+            return latencies
+
+        per_worker = max(1, requests // concurrency)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(worker, [per_worker] * concurrency))
+        return _summary([latency for result in results for latency in result], time.perf_counter() - start)
+
+    def run_asgi(self, path, headers, requests, concurrency):
+        async def run():
+            client = AsyncClient(headers=headers)
+            gate = asyncio.Semaphore(concurrency)
+            latencies = []
+
+            async def one():
+                async with gate:
+                    start = time.perf_counter()
+                    await client.get(path)
+                    latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(max(1, requests // concurrency) * concurrency)))
+            return _summary(latencies, time.perf_counter() - start)
+
+        return asyncio.run(run())
@@ -0,0 +1,77 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import override_settings
+
+from src.apps.posts import likebuffer
+from src.apps.posts.models import Like, Post
+from src.apps.users.models import Users
+
+USERNAME_PREFIX = 'bench_like_'
+
+
+class Command(BaseCommand):
+    help = (
+        "Sustained likes/s on a single post: one INSERT per tap (Like.objects.like) against "
+        "write-behind (stream append, then batched flush). Uses its own stream key."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--likes', type=int, default=20000, help="Distinct users tapping like.")
+        parser.add_argument('--concurrency', type=int, default=32)
+
+    def handle(self, *args, likes, concurrency, **options):
+        users = Users.objects.bulk_create(
+            Users(username=f"{USERNAME_PREFIX}{i}", email=f"{USERNAME_PREFIX}{i}@example.com")
+            for i in range(likes)
+        )
+        try:
+            with override_settings(LIKES_STREAM_KEY='likes_stream_bench', LIKES_STREAM_GROUP='like_flushers_bench'):
+                self.run(users, concurrency)
+        finally:
+            likebuffer._redis().delete('likes_stream_bench')
+            Post.objects.filter(user__username__startswith=USERNAME_PREFIX).delete()
+            Users.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def run(self, users, concurrency):
+        direct_post = Post.objects.create(user=users[0], title='Bench', body='Bench', status='published')
+        seconds = self.parallel(lambda user: Like.objects.like(direct_post.pk, user), users, concurrency)
+        self.report('direct', len(users), seconds)
+
+        buffered_post = Post.objects.create(user=users[0], title='Bench', body='Bench', status='published')
+        likebuffer.ensure_group()
+        seconds = self.parallel(
+            lambda user: likebuffer.enqueue(likebuffer.LIKE, buffered_post.pk, user.pk), users, concurrency,
+        )
+        self.report('enqueue', len(users), seconds)
+
+        consumer = likebuffer.consumer_name()
+        start = time.perf_counter()
+        batches = 0
+        while entries := likebuffer.read_batch(consumer, None):
+            likebuffer.apply_batch(entries)
+            likebuffer.acknowledge(entries)
+            batches += 1
+        self.report('flush', len(users), time.perf_counter() - start, f"   {batches} batch(es)")
+
+        buffered_post.refresh_from_db()
+        self.stdout.write(f"likes_count after flush: {buffered_post.likes_count} (expected {len(users)})")
+
+    def parallel(self, tap, users, concurrency):
+        def worker(chunk):
+            try:
+                for user in chunk:
+                    tap(user)
+            finally:
+                connections.close_all()
+
+        chunks = [users[i::concurrency] for i in range(concurrency)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, chunks))
+        return time.perf_counter() - start
+
+    def report(self, label, count, seconds, extra=''):
+        self.stdout.write(f"{label:<8} {count} likes   {seconds:7.2f} s   {count / seconds:9.0f} likes/s{extra}")
@@ -0,0 +1,57 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from src.core.imaging import render_variants
+from src.core.media import _get_pool
+
+
+def synthetic_jpeg(width, height):
+    # Noise compresses (and resizes) like a photo rather than a flat fill.
+    image = Image.frombytes('RGB', (width, height), os.urandom(width * height * 3))
+    image = image.resize((width // 4, height // 4)).resize((width, height), Image.Resampling.BILINEAR)
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = "Measure media-pipeline throughput (images/s, images/s per core) on synthetic photos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images', type=int, default=48)
+        parser.add_argument('--width', type=int, default=4032)
+        parser.add_argument('--height', type=int, default=3024)
+
+    def handle(self, *args, images, width, height, **options):
+        sources = [synthetic_jpeg(width, height) for _ in range(min(images, 8))]
+        jobs = [sources[i % len(sources)] for i in range(images)]
+        render_args = (settings.MEDIA_VARIANTS, settings.MEDIA_VARIANT_FORMAT, settings.MEDIA_VARIANT_QUALITY)
+
+        start = time.perf_counter()
+        for data in jobs:
+            render_variants(data, *render_args)
+        inline = time.perf_counter() - start
+        self.report('inline', images, inline, 1)
+
+        pool = _get_pool()
+        # Warm the spawned workers so start-up isn't billed to the run.
+        list(pool.map(render_variants, sources[:1] * settings.MEDIA_PROCESS_WORKERS,
+                      *[[arg] * settings.MEDIA_PROCESS_WORKERS for arg in render_args]))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=settings.MEDIA_PROCESS_WORKERS) as threads:
+            list(threads.map(lambda data: pool.submit(render_variants, data, *render_args).result(), jobs))
+        pooled = time.perf_counter() - start
+        self.report('pool', images, pooled, settings.MEDIA_PROCESS_WORKERS)
+
+    def report(self, label, images, seconds, cores):
+        rate = images / seconds
+        self.stdout.write(
+            f"{label:<7} {cores:3d} worker(s)   {seconds:7.2f} s   {rate:7.1f} images/s   "
+            f"{rate / cores:6.1f} images/s/core"
+        )
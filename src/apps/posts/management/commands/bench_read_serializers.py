@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from src.api.posts.serializers import (
+    CommentReadSerializer, CommentSerializer, LikeReadSerializer, LikeSerializer, PostReadSerializer, PostSerializer,
+)
+from src.apps.posts.models import Comment, Like, Post
+
+
+class Command(BaseCommand):
+    help = "Benchmark ModelSerializer against the .values() read serializers on existing rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500)
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, rows, iterations, **options):
+        cases = [
+            ('posts', Post.objects.select_related('user').order_by('-id'), PostSerializer, PostReadSerializer),
+            ('comments', Comment.objects.select_related('user').order_by('-id'), CommentSerializer,
+             CommentReadSerializer),
+            ('likes', Like.objects.select_related('user').order_by('-id'), LikeSerializer, LikeReadSerializer),
+        ]
+        for name, queryset, model_serializer, read_serializer in cases:
+            queryset = queryset[:rows]
+            count = queryset.count()
+            if not count:
+                self.stdout.write(f"{name:<9} no rows, skipped")
+                continue
+
+            # Fetch + serialize, the way the list endpoints do it.
+            slow = self.time(lambda: model_serializer(list(queryset.all()), many=True).data, iterations)
+            fast = self.time(lambda: read_serializer().serialize(queryset.all()), iterations)
+            self.stdout.write(
+                f"{name:<9} {count:>6} rows   ModelSerializer {slow * 1000:8.2f} ms   "
+                f"values() {fast * 1000:8.2f} ms   x{slow / fast:5.1f}"
+            )
+
+    def time(self, fn, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return (time.perf_counter() - start) / iterations
@@ -0,0 +1,68 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from src.api.posts.serializers import CommentSerializer, PostSerializer
+from src.api.renderers import ORJSONRenderer, orjson
+from src.apps.posts.models import Comment, Post
+from src.apps.users.models import Users
+
+
+def build_payloads(size):
+    now = timezone.now()
+    authors = [Users(id=i, username=f"author{i}", bio="Bio ✓") for i in range(1, 21)]
+    posts = [
+        Post(
+            id=i, user=authors[i % len(authors)], title=f"Post title {i} — ünïcode",
+            body="Lorem ipsum dolor sit amet, " * 20, status='published',
+            created_at=now - timedelta(minutes=i), updated_at=now, likes_count=i * 3, comments_count=i,
+        )
+        for i in range(1, size + 1)
+    ]
+    comments = [
+        Comment(
+            id=i, post=posts[i % size], user=authors[i % len(authors)],
+            content="Nice post! " * 5, created_at=now - timedelta(seconds=i), updated_at=now,
+        )
+        for i in range(1, size + 1)
+    ]
+    envelope = lambda key, data: {"success": True, "message": "Retrieved.", "data": {key: data}}
+    return {
+        'posts': envelope('posts', PostSerializer(posts, many=True).data),
+        'comments': envelope('comments', CommentSerializer(comments, many=True).data),
+    }
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark JSONRenderer against ORJSONRenderer on post/comment page payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=500, help="Rows per payload.")
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, size, iterations, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed.")
+
+        renderers = [('json', JSONRenderer()), ('orjson', ORJSONRenderer())]
+        for name, payload in build_payloads(size).items():
+            outputs = [renderer.render(payload) for _, renderer in renderers]
+            if outputs[0] != outputs[1]:
+                raise CommandError(f"Renderers disagree on the {name} payload.")
+
+            timings = []
+            for label, renderer in renderers:
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    renderer.render(payload)
+                timings.append((label, (time.perf_counter() - start) / iterations))
+
+            baseline = timings[0][1]
+            for label, seconds in timings:
+                self.stdout.write(
+                    f"{name:<9} {label:<7} {seconds * 1000:8.3f} ms/render   "
+                    f"x{baseline / seconds:5.1f}   {len(outputs[0]) / 1024:8.1f} KiB"
+                )
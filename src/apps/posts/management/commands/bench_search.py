@@ -0,0 +1,112 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max
+
+from src.apps.posts.models import Comment, Post
+from src.apps.posts.search import search_posts, update_comment_search_vectors, update_post_search_vectors
+from src.apps.users.models import Users
+
+BENCH_USERNAME = 'bench_search'
+# Zipf-ish vocabulary: a few very common words, a long tail of rare ones.
+COMMON = ['photo', 'today', 'great', 'city', 'food', 'weekend', 'music', 'travel']
+RARE = [f'term{i}' for i in range(5000)]
+
+
+def random_text(rng, words):
+    return ' '.join(
+        rng.choice(COMMON) if rng.random() < 0.6 else rng.choice(RARE)
+        for _ in range(words)
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark post search (GIN-indexed tsvector, ranked keyset pages). "
+        "--seed first adds a synthetic dataset owned by a dedicated user; --cleanup removes it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, metavar='POSTS', help="Seed this many posts first.")
+        parser.add_argument('--comments-per-post', type=int, default=2)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--queries', type=int, default=50, help="Timed queries per search term.")
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--cleanup', action='store_true', help="Delete the seeded dataset and exit.")
+
+    def handle(self, *args, seed, comments_per_post, batch_size, queries, page_size, cleanup, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Search requires PostgreSQL.")
+        if cleanup:
+            deleted, _ = Users.objects.filter(username=BENCH_USERNAME).delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} row(s)."))
+            return
+        if seed:
+            self.seed(seed, comments_per_post, batch_size)
+
+        self.stdout.write(
+            f"dataset: {Post.objects.count()} posts, {Comment.objects.count()} comments"
+        )
+        terms = [
+            ('common', COMMON[0]),
+            ('rare', RARE[42]),
+            ('phrase', f'"{COMMON[1]} {COMMON[2]}"'),
+            ('and', f'{COMMON[3]} {RARE[7]}'),
+            ('exclude', f'{COMMON[4]} -{COMMON[5]}'),
+        ]
+        for label, text in terms:
+            self.bench(label, text, queries, page_size)
+
+    def seed(self, posts, comments_per_post, batch_size):
+        rng = random.Random(0)
+        user, _ = Users.objects.get_or_create(username=BENCH_USERNAME)
+        first_post = (Post.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        first_comment = (Comment.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+        start = time.perf_counter()
+        for offset in range(0, posts, batch_size):
+            created = Post.objects.bulk_create(
+                Post(user=user, title=random_text(rng, 6), body=random_text(rng, 40),
+                     status='published' if rng.random() < 0.9 else 'draft')
+                for _ in range(min(batch_size, posts - offset))
+            )
+            Comment.objects.bulk_create(
+                Comment(post=post, user=user, content=random_text(rng, 12))
+                for post in created
+                for _ in range(comments_per_post)
+            )
+            self.stdout.write(f"seeded {offset + len(created)}/{posts} posts", ending='\r')
+        self.stdout.write('')
+
+        # Vectors are filled the way the migration backfill does it: one pk range per statement.
+        for model, update, first in ((Post, update_post_search_vectors, first_post),
+                                     (Comment, update_comment_search_vectors, first_comment)):
+            last = model.objects.aggregate(last=Max('pk'))['last'] or 0
+            for low in range(first, last + 1, batch_size):
+                update(model.objects.filter(pk__gte=low, pk__lt=low + batch_size))
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Post._meta.db_table}, {Comment._meta.db_table}')
+        self.stdout.write(f"seeding took {time.perf_counter() - start:.1f} s")
+
+    def bench(self, label, text, queries, page_size):
+        queryset = (
+            search_posts(Post.objects.filter(status='published'), text)
+            .order_by('-rank', '-id')
+            .values('id', 'rank', 'title_headline', 'body_headline', 'comment_headline')[:page_size + 1]
+        )
+        matches = search_posts(Post.objects.filter(status='published'), text).count()
+
+        latencies = []
+        for _ in range(queries):
+            start = time.perf_counter()
+            list(queryset)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f"{label:<8} {text!r:<24} {matches:>9} matches   "
+            f"p50 {statistics.median(latencies) * 1000:8.2f} ms   p95 {p95 * 1000:8.2f} ms"
+        )
@@ -0,0 +1,131 @@
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from src.apps.posts.models import Post
+from src.apps.posts.timeline import fan_out_post, invalidate_timeline, rebuild_timeline, timeline_page
+from src.apps.users.models import Follow, Users
+
+USERNAME_PREFIX = 'bench_timeline_'
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _summary(latencies):
+    return (
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms   "
+        f"p99 {_percentile(latencies, 0.99) * 1000:7.2f} ms   "
+        f"max {max(latencies) * 1000:7.2f} ms"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test home timelines on a synthetic follow graph with a power-law follower distribution: "
+        "fan-out latency and write amplification per published post, and p99 timeline read latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20000)
+        parser.add_argument('--follows-per-user', type=int, default=100)
+        parser.add_argument('--zipf', type=float, default=1.1, help="Exponent of the follower distribution.")
+        parser.add_argument('--active', type=float, default=0.2, help="Share of users with a live timeline.")
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--reads', type=int, default=5000)
+        parser.add_argument('--keep', action='store_true', help="Keep the synthetic users afterwards.")
+
+    def handle(self, *args, users, follows_per_user, zipf, active, posts, reads, keep, **options):
+        rng = random.Random(0)
+        try:
+            accounts = self.seed_graph(rng, users, follows_per_user, zipf)
+            self.report_distribution(accounts)
+
+            live = rng.sample(accounts, int(len(accounts) * active))
+            for user_id in live:
+                rebuild_timeline(user_id)
+
+            self.publish(rng, accounts, posts)
+            self.read(rng, live, reads)
+        finally:
+            if not keep:
+                for user_id in Users.objects.filter(username__startswith=USERNAME_PREFIX).values_list('pk', flat=True):
+                    invalidate_timeline(user_id)
+                Users.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def seed_graph(self, rng, users, follows_per_user, zipf):
+        created = Users.objects.bulk_create(
+            Users(username=f"{USERNAME_PREFIX}{i}", email=f"{USERNAME_PREFIX}{i}@example.com")
+            for i in range(users)
+        )
+        ids = [user.pk for user in created]
+        # Popularity by rank: a few accounts collect most of the follows.
+        weights = [1 / (rank + 1) ** zipf for rank in range(users)]
+
+        batch = []
+        for follower in ids:
+            followees = set(rng.choices(ids, weights=weights, k=follows_per_user))
+            followees.discard(follower)
+            batch.extend(Follow(follower_id=follower, followee_id=followee) for followee in followees)
+            if len(batch) >= 10000:
+                Follow.objects.bulk_create(batch)
+                batch = []
+        Follow.objects.bulk_create(batch)
+
+        # bulk_create skips the signals that maintain the counters.
+        def count_of(field):
+            counts = (
+                Follow.objects.filter(**{field: OuterRef('pk')}).order_by().values(field)
+                .annotate(total=Count('pk')).values('total')
+            )
+            return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+        Users.objects.filter(pk__in=ids).update(
+            followers_count=count_of('followee'), following_count=count_of('follower'),
+        )
+        return ids
+
+    def report_distribution(self, accounts):
+        counts = sorted(
+            Users.objects.filter(pk__in=accounts).values_list('followers_count', flat=True), reverse=True,
+        )
+        celebrities = sum(1 for count in counts if count >= settings.TIMELINE_CELEBRITY_FOLLOWERS)
+        self.stdout.write(
+            f"graph: {len(accounts)} users, {sum(counts)} follows, max followers {counts[0]}, "
+            f"median {statistics.median(counts)}, {celebrities} celebrity account(s) "
+            f"(>= {settings.TIMELINE_CELEBRITY_FOLLOWERS} followers)"
+        )
+
+    def publish(self, rng, accounts, posts):
+        authors = rng.choices(accounts, k=posts)
+        created = Post.objects.bulk_create(
+            Post(user_id=author, title='Bench', body='Bench', status='published') for author in authors
+        )
+
+        latencies, written = [], []
+        for post in created:
+            start = time.perf_counter()
+            written.append(fan_out_post(post.pk))
+            latencies.append(time.perf_counter() - start)
+
+        self.stdout.write(f"fan-out  {posts} posts   {_summary(latencies)}")
+        self.stdout.write(
+            f"writes   {sum(written)} timeline writes, {sum(written) / posts:.1f} per post "
+            f"(max {max(written)})"
+        )
+
+    def read(self, rng, live, reads):
+        latencies = []
+        for _ in range(reads):
+            user_id = rng.choice(live)
+            start = time.perf_counter()
+            timeline_page(user_id, None, settings.POSTS_PAGE_SIZE)
+            latencies.append(time.perf_counter() - start)
+        self.stdout.write(f"read     {reads} first pages   {_summary(latencies)}")
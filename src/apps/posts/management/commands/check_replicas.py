@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from src.apps.posts.models import Post
+from src.apps.users.models import Users
+from src.core.routers import pin_to_primary, read_alias_for, reading_from
+
+
+class Command(BaseCommand):
+    help = (
+        "Check read-replica routing against live databases: each replica's recovery state and replay lag, "
+        "where reads are routed for anonymous and freshly-pinned users, and how long a write takes to "
+        "become visible on each replica. For a local two-instance setup, start a second Postgres as a "
+        "streaming replica of the first (pg_basebackup -R into a new data directory, on another port) "
+        "and set DB_REPLICAS=localhost:<port>."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--timeout', type=float, default=10.0,
+                            help="Seconds to wait for a write to reach each replica.")
+
+    def handle(self, *args, timeout, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No replicas configured; set DB_REPLICAS.")
+
+        for alias in settings.DATABASE_REPLICAS:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_is_in_recovery(), "
+                    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+                )
+                in_recovery, lag = cursor.fetchone()
+            state = 'replica' if in_recovery else 'NOT IN RECOVERY (is this the primary?)'
+            replay = f"{lag:.3f} s since last replay" if lag is not None else "nothing replayed yet"
+            self.stdout.write(f"{alias:<10} {state}, {replay}")
+
+        user = Users.objects.order_by('pk').first()
+        if user is None:
+            raise CommandError("Create at least one user first.")
+        with reading_from(read_alias_for(AnonymousUser())):
+            self.stdout.write(f"anonymous reads     -> {Post.objects.all().db}")
+        pin_to_primary(user.pk)
+        with reading_from(read_alias_for(user)):
+            self.stdout.write(f"pinned user reads   -> {Post.objects.all().db}")
+
+        post = Post.objects.create(user=user, title='Replica check', body='', status='draft')
+        try:
+            written = time.perf_counter()
+            for alias in settings.DATABASE_REPLICAS:
+                while not Post.all_objects.using(alias).filter(pk=post.pk).exists():
+                    if time.perf_counter() - written > timeout:
+                        self.stdout.write(self.style.ERROR(f"{alias:<10} write not visible after {timeout} s"))
+                        break
+                    time.sleep(0.005)
+                else:
+                    visible = time.perf_counter() - written
+                    self.stdout.write(
+                        f"{alias:<10} write visible after {visible * 1000:.1f} ms "
+                        f"(pin lasts {settings.DATABASE_REPLICA_PIN_SECONDS} s)"
+                    )
+        finally:
+            Post.all_objects.filter(pk=post.pk).delete()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.posts.hot import decay
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebase hot-post scores on the current time and drop the ones that have decayed below "
+        "HOT_MIN_SCORE or fall outside the top HOT_MAX_SIZE. Run periodically, e.g. hourly from cron."
+    )
+
+    def handle(self, *args, **options):
+        removed, remaining = decay()
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} post(s); {remaining} remain ranked."))
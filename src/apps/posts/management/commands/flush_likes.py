@@ -0,0 +1,43 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from src.apps.posts import likebuffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply write-behind likes from the Redis stream to the Like table in batches. "
+        "SIGTERM/SIGINT stop reading new work after draining what is queued; --drain does that and exits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--drain', action='store_true', help="Flush everything queued, then exit.")
+        parser.add_argument('--block-ms', type=int, default=1000)
+
+    def handle(self, *args, drain, block_ms, **options):
+        self.stopping = drain
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        likebuffer.ensure_group()
+        consumer = likebuffer.consumer_name()
+        applied = 0
+        while True:
+            # Once stopping, poll without blocking and exit when nothing is left.
+            entries = likebuffer.read_batch(consumer, None if self.stopping else block_ms)
+            if not entries:
+                if self.stopping:
+                    break
+                continue
+            applied += likebuffer.apply_batch(entries)
+            likebuffer.acknowledge(entries)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Applied {applied} like operation(s); {likebuffer.backlog()} left in the stream."
+        ))
+
+    def stop(self, signum, frame):
+        if not self.stopping:
+            self.stdout.write("Draining queued likes before exit...")
+        self.stopping = True
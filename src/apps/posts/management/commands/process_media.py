@@ -0,0 +1,43 @@
+from concurrent.futures import wait
+
+from django.core.management.base import BaseCommand
+
+from src.apps.posts.media import process_post_photo
+from src.apps.posts.models import Post
+from src.apps.users.media import process_profile_image
+from src.apps.users.models import Users
+from src.core.background import submit
+
+
+class Command(BaseCommand):
+    help = "Generate size variants for post photos and profile images that don't have them yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, batch_size, **options):
+        targets = [
+            ('post photos', Post, 'photo', 'photo_variants', process_post_photo),
+            ('profile images', Users, 'profile_image', 'profile_image_variants', process_profile_image),
+        ]
+        for label, model, field_name, variants_field, process in targets:
+            pending = (
+                model._default_manager
+                .exclude(**{f'{field_name}__isnull': True}).exclude(**{field_name: ''})
+                .filter(**{variants_field: {}})
+                .order_by('pk')
+                .values_list('pk', flat=True)
+            )
+            processed = failed = 0
+            last_pk = 0
+            while True:
+                pks = list(pending.filter(pk__gt=last_pk)[:batch_size])
+                if not pks:
+                    break
+                last_pk = pks[-1]
+                done, _ = wait([submit(process, pk) for pk in pks])
+                errors = sum(1 for future in done if future.exception() is not None)
+                processed += len(pks) - errors
+                failed += errors
+
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} {label}, {failed} failed."))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.posts.deletion import open_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Run unfinished post/account deletion jobs to completion: pending, failed, and running jobs whose "
+        "worker stopped reporting (DELETION_STALE_AFTER). Each job resumes at the stage it reached."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, action='append', help="Only these job id(s).")
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--list', dest='list_only', action='store_true', help="Show unfinished jobs and exit.")
+
+    def handle(self, *args, job, batch_size, list_only, **options):
+        jobs = open_jobs()
+        if job:
+            jobs = jobs.filter(pk__in=job)
+
+        if list_only:
+            for entry in jobs:
+                self.stdout.write(
+                    f"{entry.pk:>8}  {entry.kind:<5} {entry.target_id:>10}  {entry.status:<8} "
+                    f"{entry.stage or '-':<9} {entry.deleted_rows:>10} rows  "
+                    f"updated {entry.updated_at:%Y-%m-%d %H:%M:%S}"
+                )
+            return
+
+        finished = skipped = failed = 0
+        for entry in jobs:
+            try:
+                done = run_job(entry.pk, batch_size)
+            except Exception as exc:
+                # The job is marked failed and is retried on the next run.
+                failed += 1
+                self.stderr.write(f"job {entry.pk}: {entry.kind} {entry.target_id} failed: {exc!r}")
+                continue
+            if done:
+                finished += 1
+                self.stdout.write(f"job {entry.pk}: {entry.kind} {entry.target_id} purged")
+            else:
+                skipped += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Finished {finished} job(s); {failed} failed, {skipped} skipped (done or running elsewhere)."
+        ))
@@ -0,0 +1,44 @@
+from concurrent.futures import wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from src.apps.posts.timeline import rebuild_timeline
+from src.apps.users.models import Users
+from src.core.background import submit
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild home timelines from the database on the background pool, e.g. after changing "
+        "TIMELINE_CELEBRITY_FOLLOWERS or losing Redis. Timelines not rebuilt here are rebuilt on first read."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help="Only these user ids.")
+        parser.add_argument('--active-days', type=int, default=settings.TIMELINE_TTL // 86400,
+                            help="Users who logged in within this many days.")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, user_ids, active_days, batch_size, **options):
+        users = Users.objects.filter(is_active=True).order_by('pk')
+        if user_ids:
+            users = users.filter(pk__in=user_ids)
+        else:
+            users = users.filter(last_login__gte=timezone.now() - timedelta(days=active_days))
+
+        rebuilt = failed = 0
+        last_pk = 0
+        while True:
+            pks = list(users.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            done, _ = wait([submit(rebuild_timeline, pk) for pk in pks])
+            errors = sum(1 for future in done if future.exception() is not None)
+            rebuilt += len(pks) - errors
+            failed += errors
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} timeline(s), {failed} failed."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from src.apps.posts.counters import find_counter_drift
+from src.apps.posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.likes_count / Post.comments_count and repair any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Only report drifted posts.")
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        last_id = Post.objects.aggregate(last=Max('pk'))['last'] or 0
+        repaired = 0
+
+        for start in range(0, last_id + 1, batch_size):
+            batch = Post.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+            drifted = find_counter_drift(batch)
+            if not drifted:
+                continue
+
+            repaired += len(drifted)
+            if dry_run:
+                for pk, likes, comments in drifted:
+                    self.stdout.write(f"post {pk}: likes={likes} comments={comments}")
+                continue
+
+            with transaction.atomic():
+                posts = [
+                    Post(pk=pk, likes_count=likes, comments_count=comments)
+                    for pk, likes, comments in drifted
+                ]
+                Post.objects.bulk_update(posts, ['likes_count', 'comments_count'])
+
+        verb = "Found" if dry_run else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {repaired} post(s) with drifted counters."))
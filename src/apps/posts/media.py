@@ -0,0 +1,8 @@
+from src.core.media import process_image_field
+from .cache import invalidate_post
+from .models import Post
+
+
+def process_post_photo(pk):
+    if process_image_field(Post, pk, 'photo', 'photo_variants'):
+        invalidate_post(pk)
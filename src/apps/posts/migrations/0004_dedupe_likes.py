@@ -0,0 +1,56 @@
+from django.db import migrations, transaction
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def dedupe_likes(apps, schema_editor):
+    """Keep the oldest like per (post, user), one post-id range per transaction."""
+    Post = apps.get_model('posts', 'Post')
+    Like = apps.get_model('posts', 'Like')
+    connection = schema_editor.connection
+    table = Like._meta.db_table
+
+    likes_count = Coalesce(
+        Subquery(
+            Like.objects.filter(post=OuterRef('pk')).order_by().values('post')
+            .annotate(total=Count('pk')).values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+    last_id = Like.objects.aggregate(last=Max('post_id'))['last'] or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    DELETE FROM {table} WHERE id IN (
+                        SELECT id FROM (
+                            SELECT id, row_number() OVER (PARTITION BY post_id, user_id ORDER BY id) AS rn
+                            FROM {table}
+                            WHERE post_id >= %s AND post_id < %s
+                        ) ranked
+                        WHERE rn > 1
+                    )
+                    RETURNING post_id
+                    """,
+                    [start, start + BATCH_SIZE],
+                )
+                affected = {row[0] for row in cursor.fetchall()}
+            if affected:
+                Post.objects.filter(pk__in=affected).update(likes_count=likes_count)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('posts', '0003_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_likes, migrations.RunPython.noop),
+    ]
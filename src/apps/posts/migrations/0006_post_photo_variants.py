@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_like_unique_post_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import migrations
+from django.db.models import Max
+
+BATCH_SIZE = 5000
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Fill both vectors one pk range per statement, keeping row locks short."""
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    config = settings.POSTS_SEARCH_CONFIG
+
+    vectors = [
+        (Post, SearchVector('title', weight='A', config=config) + SearchVector('body', weight='B', config=config)),
+        (Comment, SearchVector('content', weight='D', config=config)),
+    ]
+    for model, vector in vectors:
+        last_id = model.objects.aggregate(last=Max('pk'))['last'] or 0
+        for start in range(0, last_id + 1, BATCH_SIZE):
+            model.objects.filter(pk__gte=start, pk__lt=start + BATCH_SIZE).update(search_vector=vector)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('posts', '0006_post_photo_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='search_vector',
+            field=SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='post',
+            index=GinIndex(fields=['search_vector'], name='post_search_vector_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='comment',
+            index=GinIndex(fields=['search_vector'], name='comment_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models, transaction
+from django.db.models import Max
+import django.db.models.deletion
+
+BATCH_SIZE = 5000
+
+
+def backfill_root_paths(apps, schema_editor):
+    """Every existing comment is top-level: its path is its own id segment."""
+    Comment = apps.get_model('posts', 'Comment')
+    connection = schema_editor.connection
+    table = Comment._meta.db_table
+
+    last_id = Comment.objects.aggregate(last=Max('pk'))['last'] or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET path = lpad(to_hex(id), 8, '0') WHERE id >= %s AND id < %s",
+                    [start, start + BATCH_SIZE],
+                )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('posts', '0008_post_user_published_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, db_index=False, null=True,
+                                    on_delete=django.db.models.deletion.CASCADE, related_name='replies',
+                                    to='posts.comment'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(db_collation='C', default='', editable=False, max_length=248),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reply_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_root_paths, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['post', '-created_at', '-id'], condition=models.Q(parent__isnull=True),
+                               name='comment_post_roots_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['parent', 'id'], name='comment_parent_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['post', 'path'], name='comment_post_path_idx'),
+        ),
+    ]
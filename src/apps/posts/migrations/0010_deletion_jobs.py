@@ -0,0 +1,48 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_comment_threads'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='status',
+            field=models.CharField(
+                choices=[('draft', 'DRAFT'), ('published', 'PUBLISHED'), ('deleted', 'DELETED')],
+                default='draft',
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name='DeletionJob',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('post', 'POST'), ('user', 'USER')], max_length=10)),
+                ('target_id', models.BigIntegerField()),
+                ('status', models.CharField(
+                    choices=[('pending', 'PENDING'), ('running', 'RUNNING'), ('failed', 'FAILED'), ('done', 'DONE')],
+                    default='pending',
+                    max_length=20,
+                )),
+                ('stage', models.CharField(blank=True, default='', max_length=20)),
+                ('deleted_rows', models.BigIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['updated_at'], condition=models.Q(('status', 'done'), _negated=True),
+                                 name='deletionjob_open_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('kind', 'target_id'), name='deletionjob_unique_target'),
+                ],
+            },
+        ),
+    ]
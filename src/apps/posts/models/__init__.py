@@ -1,3 +1,4 @@
 from .post import Post
 from .likes import Like
-from .comments import Comment
\ No newline at end of file
+from .comments import Comment
+from .deletion import DeletionJob
\ No newline at end of file
@@ -1,12 +1,33 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from src.core import settings
 from .post import Post
 
+# A comment's path is its ancestors' ids followed by its own, each as a
+# fixed-width hex segment (8 digits cover every AutoField id), so sorting by
+# path gives depth-first thread order and a subtree is one path range.
+PATH_SEGMENT_WIDTH = 8
+MAX_DEPTH = 30
+
+
+def path_segment(pk):
+    return format(pk, f'0{PATH_SEGMENT_WIDTH}x')
+
 
 class Comment(models.Model):
     id = models.AutoField(primary_key=True)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
+    # Indexed together with id below.
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        related_name='replies',
+        null=True,
+        blank=True,
+        db_index=False
+    )
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -15,6 +36,39 @@ class Comment(models.Model):
     content = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # content (weight D), maintained by src.apps.posts.signals.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # "C" collation: byte-wise ordering, so path ranges and sorting follow the segments.
+    path = models.CharField(
+        max_length=PATH_SEGMENT_WIDTH * (MAX_DEPTH + 1),
+        db_collation='C',
+        default='',
+        editable=False
+    )
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Direct replies, maintained by src.apps.posts.signals.
+    reply_count = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', '-created_at', '-id'], name='comment_post_created_idx'),
+            GinIndex(fields=['search_vector'], name='comment_search_vector_idx'),
+            models.Index(fields=['post', '-created_at', '-id'], condition=models.Q(parent__isnull=True),
+                         name='comment_post_roots_idx'),
+            models.Index(fields=['parent', 'id'], name='comment_parent_idx'),
+            models.Index(fields=['post', 'path'], name='comment_post_path_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        creating = self._state.adding
+        if creating and self.parent_id:
+            self.depth = self.parent.depth + 1
+        super().save(*args, **kwargs)
+        if creating:
+            # The path ends with our own id, which only exists after the insert.
+            parent_path = self.parent.path if self.parent_id else ''
+            self.path = parent_path + path_segment(self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
 
     def __str__(self):
         return f"Comment by {self.user.username}"
\ No newline at end of file
@@ -0,0 +1,44 @@
+from django.db import models
+
+
+class DeletionJob(models.Model):
+    """
+    Progress of a background purge (``src.apps.posts.deletion``).
+
+    The target is hidden when the job is created; ``stage`` and
+    ``deleted_rows`` record how far the batched purge has got, so an
+    interrupted job resumes where it stopped.
+    """
+    KIND_CHOICES = [
+        ('post', 'POST'),
+        ('user', 'USER')
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'PENDING'),
+        ('running', 'RUNNING'),
+        ('failed', 'FAILED'),
+        ('done', 'DONE')
+    ]
+
+    id = models.AutoField(primary_key=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    target_id = models.BigIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    stage = models.CharField(max_length=20, blank=True, default='')
+    deleted_rows = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Refreshed after every batch; a running job that stops reporting is stale.
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'target_id'], name='deletionjob_unique_target'),
+        ]
+        indexes = [
+            models.Index(fields=['updated_at'], condition=~models.Q(status='done'), name='deletionjob_open_idx'),
+        ]
+
+    def __str__(self):
+        return f"Delete {self.kind} {self.target_id} ({self.status})"
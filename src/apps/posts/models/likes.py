@@ -1,8 +1,94 @@
-from django.db import models
+from django.db import connection, models
+from django.utils import timezone
 
 from src.core import settings
+from ..cache import invalidate_post
+from ..hot import record_engagement
 from .post import Post
 
+
+class LikeManager(models.Manager):
+    """
+    Like/unlike in a single statement.
+
+    Each call is one round trip: the visibility check, the insert/delete and
+    the ``likes_count`` adjustment run as data-modifying CTEs, and the unique
+    ``(post, user)`` constraint makes retries no-ops. Both methods return
+    ``(visible, changed, like)`` where ``visible`` is ``None`` when the post
+    does not exist or is deleted and waiting to be purged.
+    """
+
+    def _execute(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql.format(post_table=Post._meta.db_table, like_table=self.model._meta.db_table),
+                params,
+            )
+            return cursor.fetchone()
+
+    def like(self, post_id, user):
+        visible, created, like_id, created_at = self._execute(
+            """
+            WITH post AS (
+                SELECT id, (status = 'published' OR (status = 'draft' AND user_id = %(user_id)s)) AS visible
+                FROM {post_table} WHERE id = %(post_id)s AND status <> 'deleted'
+            ), inserted AS (
+                INSERT INTO {like_table} (post_id, user_id, created_at)
+                SELECT id, %(user_id)s, %(now)s FROM post WHERE visible
+                ON CONFLICT (post_id, user_id) DO NOTHING
+                RETURNING id, created_at
+            ), counted AS (
+                UPDATE {post_table} SET likes_count = likes_count + 1
+                WHERE id = %(post_id)s AND EXISTS (SELECT 1 FROM inserted)
+            ), existing AS (
+                SELECT id, created_at FROM {like_table}
+                WHERE post_id = %(post_id)s AND user_id = %(user_id)s
+            )
+            SELECT
+                (SELECT visible FROM post),
+                EXISTS (SELECT 1 FROM inserted),
+                COALESCE((SELECT id FROM inserted), (SELECT id FROM existing)),
+                COALESCE((SELECT created_at FROM inserted), (SELECT created_at FROM existing))
+            """,
+            {'post_id': post_id, 'user_id': user.id, 'now': timezone.now()},
+        )
+        like = None
+        if like_id is not None:
+            like = self.model(id=like_id, post_id=post_id, user=user, created_at=created_at)
+        if created:
+            self._changed(post_id, settings.HOT_LIKE_WEIGHT)
+        return visible, created, like
+
+    def unlike(self, post_id, user):
+        visible, deleted_at = self._execute(
+            """
+            WITH post AS (
+                SELECT id, (status = 'published' OR (status = 'draft' AND user_id = %(user_id)s)) AS visible
+                FROM {post_table} WHERE id = %(post_id)s AND status <> 'deleted'
+            ), deleted AS (
+                DELETE FROM {like_table}
+                WHERE post_id = %(post_id)s AND user_id = %(user_id)s
+                  AND EXISTS (SELECT 1 FROM post WHERE visible)
+                RETURNING created_at
+            ), counted AS (
+                UPDATE {post_table} SET likes_count = likes_count - 1
+                WHERE id = %(post_id)s AND EXISTS (SELECT 1 FROM deleted)
+            )
+            SELECT (SELECT visible FROM post), (SELECT created_at FROM deleted)
+            """,
+            {'post_id': post_id, 'user_id': user.id},
+        )
+        deleted = deleted_at is not None
+        if deleted:
+            self._changed(post_id, -settings.HOT_LIKE_WEIGHT, at=[deleted_at])
+        return visible, deleted, None
+
+    def _changed(self, post_id, hot_weight, at=()):
+        # The raw statements bypass the post_save/post_delete receivers.
+        invalidate_post(post_id)
+        record_engagement(post_id, hot_weight, at=at)
+
+
 class Like(models.Model):
     id = models.AutoField(primary_key=True)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='likes')
@@ -13,5 +99,15 @@ class Like(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = LikeManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', '-created_at', '-id'], name='like_post_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'user'], name='like_unique_post_user'),
+        ]
+
     def __str__(self):
-        return f"{self.user.username} → {self.post.title}"
\ No newline at end of file
+        return f"{self.user.username} → {self.post.title}"
@@ -1,26 +1,73 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from src.core import settings
 
 
+class PostManager(models.Manager):
+    """Leaves out posts that are deleted and waiting to be purged (see ``src.apps.posts.deletion``)."""
+
+    def get_queryset(self):
+        return super().get_queryset().exclude(status='deleted')
+
+
 class Post(models.Model):
     STATUS_CHOICES = [
         ('draft', 'DRAFT'),
-        ('published', 'PUBLISHED')
+        ('published', 'PUBLISHED'),
+        ('deleted', 'DELETED')
     ]
 
     id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=255)
     body = models.CharField(max_length = 1000)
     photo = models.ImageField(upload_to='post_photos/', blank=True, null=True)
+    # {variant name: storage path}, filled in by the background media pipeline.
+    photo_variants = models.JSONField(default=dict, blank=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='posts'
     )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
+    likes_count = models.IntegerField(default=0)
+    comments_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # title (weight A) + body (weight B), maintained by src.apps.posts.signals.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PostManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(status='published'),
+                name='post_published_feed_idx',
+            ),
+            models.Index(fields=['user', 'status', '-created_at', '-id'], name='post_user_status_feed_idx'),
+            # Timeline reads merge the newest posts of high-follower authors by id.
+            models.Index(fields=['user', '-id'], condition=models.Q(status='published'),
+                         name='post_user_published_id_idx'),
+            GinIndex(fields=['search_vector'], name='post_search_vector_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded status so saves can tell whether the feed changed.
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_photo = instance.__dict__.get('photo')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Variants of a replaced photo must not outlive it.
+        if self.photo.name != getattr(self, '_loaded_photo', None):
+            self.photo_variants = {}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
\ No newline at end of file
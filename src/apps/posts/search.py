@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+
+from .models import Comment, Post
+
+HEADLINE_OPTIONS = {'max_words': 35, 'min_words': 15, 'max_fragments': 2}
+
+
+def post_search_vector():
+    config = settings.POSTS_SEARCH_CONFIG
+    return SearchVector('title', weight='A', config=config) + SearchVector('body', weight='B', config=config)
+
+
+def comment_search_vector():
+    # Weight D, so a comment hit ranks below a title or body hit.
+    return SearchVector('content', weight='D', config=settings.POSTS_SEARCH_CONFIG)
+
+
+def update_post_search_vectors(queryset):
+    return queryset.update(search_vector=post_search_vector())
+
+
+def update_comment_search_vectors(queryset):
+    return queryset.update(search_vector=comment_search_vector())
+
+
+def search_query(text):
+    return SearchQuery(text, search_type='websearch', config=settings.POSTS_SEARCH_CONFIG)
+
+
+def _headline(expression, query):
+    return SearchHeadline(expression, query, config=settings.POSTS_SEARCH_CONFIG, **HEADLINE_OPTIONS)
+
+
+def search_posts(queryset, text):
+    """
+    Narrow ``queryset`` to posts whose title/body or any comment matches
+    ``text`` (websearch syntax), annotated with ``rank`` and the
+    ``title_headline`` / ``body_headline`` / ``comment_headline`` snippets.
+
+    Matching ids come from a UNION of the two GIN-indexed vectors, so the
+    caller's visibility filter is applied to matches only. Only the best
+    matching comment of a post counts towards its rank.
+    """
+    query = search_query(text)
+    matching_ids = (
+        Post.objects.filter(search_vector=query).values_list('pk', flat=True)
+        .union(Comment.objects.filter(search_vector=query).values_list('post_id', flat=True))
+    )
+    best_comment = (
+        Comment.objects
+        .filter(post=OuterRef('pk'), search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', 'id')
+    )
+    post_rank = Coalesce(SearchRank(F('search_vector'), query), Value(0.0), output_field=FloatField())
+    comment_rank = Coalesce(Subquery(best_comment.values('rank')[:1]), Value(0.0), output_field=FloatField())
+
+    return (
+        queryset
+        .filter(pk__in=matching_ids)
+        .annotate(
+            # ts_rank() returns real; as float8 the value survives the JSON
+            # cursor round trip exactly, so keyset pages neither skip nor repeat.
+            rank=Cast(post_rank + comment_rank, FloatField()),
+            title_headline=_headline('title', query),
+            body_headline=_headline('body', query),
+            comment_headline=Subquery(
+                best_comment.annotate(headline=_headline('content', query)).values('headline')[:1]
+            ),
+        )
+    )
@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.apps.users.models import Follow
+from src.core.background import submit_on_commit
+from .cache import invalidate_feed, invalidate_post
+from .hot import record_engagement, remove_post
+from .media import process_post_photo
+from .models import Comment, Like, Post
+from .search import update_comment_search_vectors, update_post_search_vectors
+from .timeline import fan_out_post, invalidate_timeline
+
+
+def _text_changed(created, update_fields, text_fields):
+    return created or update_fields is None or not text_fields.isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=Post)
+def update_post_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    if _text_changed(created, update_fields, {'title', 'body'}):
+        update_post_search_vectors(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    if _text_changed(created, update_fields, {'content'}):
+        update_comment_search_vectors(Comment.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, created, **kwargs):
+    invalidate_post(instance.pk)
+    was_published = getattr(instance, '_loaded_status', None) == 'published'
+    if was_published != (instance.status == 'published'):
+        invalidate_feed()
+        if not was_published:
+            submit_on_commit(fan_out_post, instance.pk)
+        else:
+            remove_post(instance.pk)
+    instance._loaded_status = instance.status
+    if instance.photo and instance.photo.name != getattr(instance, '_loaded_photo', None):
+        submit_on_commit(process_post_photo, instance.pk)
+    instance._loaded_photo = instance.photo.name
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    invalidate_post(instance.pk)
+    remove_post(instance.pk)
+    if instance.status == 'published':
+        invalidate_feed()
+
+
+@receiver(post_save, sender=Like)
+def increment_likes_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(likes_count=F('likes_count') + 1)
+        invalidate_post(instance.post_id)
+        record_engagement(instance.post_id, settings.HOT_LIKE_WEIGHT)
+
+
+@receiver(post_delete, sender=Like)
+def decrement_likes_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(likes_count=F('likes_count') - 1)
+    invalidate_post(instance.post_id)
+    record_engagement(instance.post_id, -settings.HOT_LIKE_WEIGHT, at=[instance.created_at])
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(comments_count=F('comments_count') + 1)
+        if instance.parent_id:
+            Comment.objects.filter(pk=instance.parent_id).update(reply_count=F('reply_count') + 1)
+        invalidate_post(instance.post_id)
+        record_engagement(instance.post_id, settings.HOT_COMMENT_WEIGHT)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(comments_count=F('comments_count') - 1)
+    if instance.parent_id:
+        Comment.objects.filter(pk=instance.parent_id).update(reply_count=F('reply_count') - 1)
+    invalidate_post(instance.post_id)
+    record_engagement(instance.post_id, -settings.HOT_COMMENT_WEIGHT, at=[instance.created_at])
+
+
+@receiver(post_save, sender=Follow)
+def invalidate_timeline_on_follow(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: invalidate_timeline(instance.follower_id))
+
+
+@receiver(post_delete, sender=Follow)
+def invalidate_timeline_on_unfollow(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_timeline(instance.follower_id))
@@ -1,3 +1,623 @@
-from django.test import TestCase
+import tempfile
+import time
+from datetime import timedelta
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from src.api.posts.pagination import PostCursorPagination
+from src.api.posts.serializers import (
+    CommentReadSerializer, CommentSerializer, LikeReadSerializer, LikeSerializer, PostReadSerializer, PostSerializer,
+)
+from src.api.posts.uploadhandlers import StreamingImageUploadHandler, UnsupportedImage, UploadRejected
+from src.api.posts.views import (
+    CommentListView, CommentThreadView, LikeListView, MyDraftPostListView, MyPublishedPostListView, PostSearchView,
+    PublicPostListView,
+)
+from src.api.routing import ReplicaReadMixin
+from src.apps.posts import hot, likebuffer
+from src.apps.posts.deletion import _purge_user_comments, delete_post, delete_user, run_job
+from src.apps.posts.models import Comment, DeletionJob, Like, Post
+from src.apps.posts.search import search_posts
+from src.apps.users.models import Follow, Users
+from src.core import instrumentation
+from src.core.middleware import ReplicaPinMiddleware
+from src.core.routers import ReplicaRouter, _pin_key, pin_to_primary, reading_from
+from src.core.testing import QueryBudgetTestCase
+
+
+class PostEndpointQueryBudgetTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.users, self.posts = self.seed(users=5, posts_per_user=20, likes_per_post=5, comments_per_post=5)
+        self.viewer = self.users[0]
+        self.post = self.posts[0]
+
+    def test_public_feed(self):
+        response = self.assertQueryBudget(1, reverse('post-list'), data={'page_size': 100})
+        self.assertEqual(len(response.data['data']['posts']), 100)
+
+    def test_public_feed_with_viewer_state(self):
+        response = self.assertQueryBudget(2, reverse('post-list'), user=self.viewer, data={'page_size': 100})
+        self.assertTrue(all(post['liked_by_me'] for post in response.data['data']['posts']))
+
+    def test_my_published_feed(self):
+        self.assertQueryBudget(2, reverse('post-my-published'), user=self.viewer)
+
+    def test_my_draft_feed(self):
+        Post.objects.bulk_create(
+            Post(user=self.viewer, title=f'Draft {n}', body='Body', status='draft') for n in range(15)
+        )
+        response = self.assertQueryBudget(2, reverse('post-my-drafts'), user=self.viewer, data={'page_size': 100})
+        posts = response.data['data']['posts']
+        self.assertEqual(len(posts), 15)
+        self.assertTrue(all(post['status'] == 'draft' for post in posts))
+
+    def test_post_detail(self):
+        self.assertQueryBudget(1, reverse('post-detail', args=[self.post.pk]))
+
+    def test_post_batch(self):
+        ids = [post.pk for post in self.posts] + [0]
+        response = self.assertQueryBudget(2, reverse('post-batch'), user=self.viewer,
+                                          data={'ids': ','.join(map(str, ids))})
+        results = response.data['data']['posts']
+        self.assertEqual([result['id'] for result in results], ids)
+        self.assertEqual(results[-1]['error'], 'not_found')
+
+    def test_like_list(self):
+        response = self.assertQueryBudget(2, reverse('post-like-list', args=[self.post.pk]), user=self.viewer)
+        self.assertEqual(len(response.data['data']['likes']), 5)
+
+    def test_comment_list(self):
+        response = self.assertQueryBudget(2, reverse('post-comment-list', args=[self.post.pk]), user=self.viewer)
+        self.assertEqual(len(response.data['data']['comments']), 5)
+
+    def test_like_state_on_someone_elses_draft(self):
+        draft = Post.objects.create(user=self.users[1], title='Draft', body='', status='draft')
+        path = reverse('post-like-state', args=[draft.pk])
+        for method, message in (('put', "Cannot like someone else's draft."),
+                                ('delete', "Cannot unlike someone else's draft.")):
+            response = self.assertQueryBudget(1, path, user=self.viewer, method=method)
+            self.assertEqual((response.status_code, response.data['message']), (403, message))
+
+    def test_comment_threads(self):
+        root = Comment.objects.create(post=self.post, user=self.viewer, content='Root')
+        replies = [Comment.objects.create(post=self.post, user=self.users[i], content='Reply', parent=root)
+                   for i in range(1, 4)]
+        nested = Comment.objects.create(post=self.post, user=self.viewer, content='Nested', parent=replies[0])
+
+        response = self.assertQueryBudget(2, reverse('comment-thread', args=[root.pk]), user=self.viewer)
+        thread = response.data['data']['comments']
+        self.assertEqual([comment['id'] for comment in thread],
+                         [root.pk, replies[0].pk, nested.pk, replies[1].pk, replies[2].pk])
+        self.assertEqual([comment['depth'] for comment in thread], [0, 1, 2, 1, 1])
+        self.assertEqual(thread[0]['reply_count'], 3)
+
+        response = self.assertQueryBudget(2, reverse('comment-replies', args=[root.pk]), user=self.viewer)
+        self.assertEqual([comment['id'] for comment in response.data['data']['comments']],
+                         [reply.pk for reply in replies])
+
+    def test_search(self):
+        response = self.assertQueryBudget(1, reverse('post-search'), data={'q': self.viewer.username})
+        posts = response.data['data']['posts']
+        self.assertEqual(len(posts), 20)
+        self.assertIn('<b>', posts[0]['highlight']['title'])
+
+    def test_search_comment_match_with_viewer_state(self):
+        response = self.assertQueryBudget(2, reverse('post-search'), user=self.viewer,
+                                          data={'q': 'comment', 'page_size': 100})
+        posts = response.data['data']['posts']
+        self.assertEqual(len(posts), 100)
+        self.assertTrue(all(post['commented_by_me'] for post in posts))
+
+    def test_search_pages_have_no_duplicates_or_gaps(self):
+        path = reverse('post-search')
+        expected = [post['id'] for post in self.client.get(
+            path, data={'q': 'comment', 'page_size': 100}).data['data']['posts']]
+
+        seen, cursor = [], None
+        while True:
+            params = {'q': 'comment', 'page_size': 7}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get(path, data=params).data['data']
+            seen.extend(post['id'] for post in data['posts'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(len(expected), 100)
+        self.assertEqual(seen, expected)
+
+
+@skipUnless(connection.vendor == 'postgresql', "EXPLAIN plans are Postgres specific.")
+class PostQueryPlanTests(QueryBudgetTestCase):
+    """
+    Every feed/ownership query must be answerable from an index.
+
+    Sequential scans are disabled for the session, so the planner only picks
+    one when no index matches the access path.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.users, self.posts = self.seed(users=10, posts_per_user=50, likes_per_post=3, comments_per_post=3)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            cursor.execute('SET enable_seqscan = off')
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = on')
+
+    def view_queryset(self, view_class, **kwargs):
+        view = view_class()
+        view.request = SimpleNamespace(user=self.users[0], query_params={})
+        view.kwargs = kwargs
+        return view.get_queryset()
+
+    def assertIndexed(self, queryset):
+        plan = queryset.explain()
+        self.assertNotIn('Seq Scan', plan, plan)
+
+    def test_public_feed(self):
+        queryset = self.view_queryset(PublicPostListView).order_by(*PostCursorPagination.ordering)
+        self.assertIndexed(queryset[:21])
+
+        last = self.posts[len(self.posts) // 2]
+        paginator = PostCursorPagination()
+        position = paginator.get_position_filter([last.created_at, last.id])
+        self.assertIndexed(queryset.filter(position)[:21])
+
+    def test_my_feeds(self):
+        for view_class in (MyPublishedPostListView, MyDraftPostListView):
+            queryset = self.view_queryset(view_class).order_by(*PostCursorPagination.ordering)
+            self.assertIndexed(queryset[:21])
+
+    def test_like_and_comment_lists(self):
+        for view_class in (LikeListView, CommentListView):
+            self.assertIndexed(self.view_queryset(view_class, post_id=self.posts[0].pk))
+
+    def test_comment_thread(self):
+        queryset = self.view_queryset(CommentThreadView, post_id=self.posts[0].pk)
+        self.assertIndexed(queryset.order_by('path')[:21])
+
+    def test_search(self):
+        queryset = search_posts(self.view_queryset(PostSearchView), self.users[1].username)
+        self.assertIndexed(queryset.order_by('-rank', '-id')[:21])
+
+
+class ReadSerializerConformanceTests(TestCase):
+    """The .values() fast path must render byte-identical JSON to the ModelSerializers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Users.objects.create(username='author', profile_image='profile_images/author.png')
+        cls.reader = Users.objects.create(username='reader')
+        cls.posts = [
+            Post.objects.create(user=cls.author, title='With photo', body='Body ✓', photo='post_photos/a b.jpg',
+                                status='published'),
+            Post.objects.create(user=cls.reader, title='Draft', body='', status='draft'),
+        ]
+        # Written with update() as the media pipeline does; save() resets variants of a new upload.
+        Post.objects.filter(pk=cls.posts[0].pk).update(photo_variants={
+            'thumb': 'post_photos/variants/0a1b_thumb.webp', 'full': 'post_photos/variants/2c3d_full.webp',
+        })
+        Users.objects.filter(pk=cls.author.pk).update(
+            profile_image_variants={'thumb': 'profile_images/variants/4e5f_thumb.webp'},
+        )
+        Like.objects.create(post=cls.posts[0], user=cls.reader)
+        comment = Comment.objects.create(post=cls.posts[0], user=cls.reader, content='Nice — really')
+        Comment.objects.create(post=cls.posts[0], user=cls.author, content='Thanks', parent=comment)
+
+    def assertSameJSON(self, expected, actual):
+        render = JSONRenderer().render
+        self.assertEqual(render(expected), render(actual))
+
+    def contexts(self):
+        request = APIRequestFactory().get('/')
+        viewer = {'liked_post_ids': {self.posts[0].pk}, 'commented_post_ids': {self.posts[0].pk}}
+        return [{}, {'request': request}, {'request': request, **viewer}]
+
+    def test_posts(self):
+        queryset = Post.objects.select_related('user').order_by('id')
+        for context in self.contexts():
+            self.assertSameJSON(
+                PostSerializer(queryset, many=True, context=context).data,
+                PostReadSerializer(context=context).serialize(queryset),
+            )
+
+    def test_comments(self):
+        queryset = Comment.objects.select_related('user').order_by('id')
+        for context in self.contexts():
+            self.assertSameJSON(
+                CommentSerializer(queryset, many=True, context=context).data,
+                CommentReadSerializer(context=context).serialize(queryset),
+            )
+
+    def test_likes(self):
+        queryset = Like.objects.select_related('user').order_by('id')
+        for context in self.contexts():
+            self.assertSameJSON(
+                LikeSerializer(queryset, many=True, context=context).data,
+                LikeReadSerializer(context=context).serialize(queryset),
+            )
+
+
+class DeletionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Users.objects.create(username='author')
+        cls.reader = Users.objects.create(username='reader')
+        cls.own = Post.objects.create(user=cls.author, title='Own', body='', status='published')
+        cls.other = Post.objects.create(user=cls.reader, title='Other', body='', status='published')
+        Follow.objects.create(follower=cls.reader, followee=cls.author)
+        for post in (cls.own, cls.other):
+            Like.objects.create(post=post, user=cls.author)
+            Like.objects.create(post=post, user=cls.reader)
+        root = Comment.objects.create(post=cls.own, user=cls.reader, content='Root')
+        reply = Comment.objects.create(post=cls.own, user=cls.author, content='Reply', parent=root)
+        Comment.objects.create(post=cls.own, user=cls.reader, content='Nested', parent=reply)
+        # On someone else's post: the author's comment takes the reply below it along.
+        question = Comment.objects.create(post=cls.other, user=cls.reader, content='Question')
+        answer = Comment.objects.create(post=cls.other, user=cls.author, content='Answer', parent=question)
+        Comment.objects.create(post=cls.other, user=cls.reader, content='Thanks', parent=answer)
+
+    def test_post_is_hidden_then_purged(self):
+        job = delete_post(self.own)
+        self.assertFalse(Post.objects.filter(pk=self.own.pk).exists())
+        self.assertTrue(Post.all_objects.filter(pk=self.own.pk, status='deleted').exists())
+
+        self.assertTrue(run_job(job.pk, batch_size=1))
+        self.assertFalse(Post.all_objects.filter(pk=self.own.pk).exists())
+        self.assertFalse(Like.objects.filter(post_id=self.own.pk).exists())
+        self.assertFalse(Comment.objects.filter(post_id=self.own.pk).exists())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.stage, job.deleted_rows), ('done', 'row', 6))
+        self.assertFalse(run_job(job.pk))
+
+    def test_deleted_post_cannot_be_liked_or_unliked(self):
+        delete_post(self.own)
+        client = APIClient()
+        # Not even by its owner: a post waiting to be purged is gone.
+        client.force_authenticate(user=self.author)
+        self.assertEqual(client.post(reverse('post-like-create', args=[self.own.pk])).status_code, 404)
+        self.assertEqual(client.put(reverse('post-like-state', args=[self.own.pk])).status_code, 404)
+        self.assertEqual(client.delete(reverse('post-like-state', args=[self.own.pk])).status_code, 404)
+        self.assertEqual(Like.objects.filter(post_id=self.own.pk).count(), 2)
+
+    def test_user_is_deactivated_then_purged_with_counters_fixed(self):
+        job = delete_user(self.author)
+        self.assertFalse(Users.objects.get(pk=self.author.pk).is_active)
+        self.assertFalse(Post.objects.filter(user=self.author).exists())
+
+        self.assertTrue(run_job(job.pk, batch_size=1))
+        self.assertFalse(Users.objects.filter(pk=self.author.pk).exists())
+        other = Post.objects.get(pk=self.other.pk)
+        self.assertEqual((other.likes_count, other.comments_count), (1, 1))
+        self.assertEqual(Comment.objects.get(post=other).reply_count, 0)
+        self.assertEqual(Users.objects.get(pk=self.reader.pk).following_count, 0)
+        self.assertEqual(DeletionJob.objects.get(pk=job.pk).status, 'done')
+
+    def test_comment_batches_are_bounded_by_deleted_rows(self):
+        answer = Comment.objects.get(content='Answer')
+        for i in range(3):
+            Comment.objects.create(post=self.other, user=self.reader, content=f'Reply {i}', parent=answer)
+
+        # Seven rows hang off the author's two comments; no batch may take more than two.
+        batches = []
+        while deleted := _purge_user_comments(self.author.pk, 2):
+            batches.append(deleted)
+        self.assertEqual(batches, [2, 2, 2, 1])
+
+        self.assertEqual(set(Comment.objects.values_list('content', flat=True)), {'Root', 'Question'})
+        self.assertEqual(set(Comment.objects.values_list('reply_count', flat=True)), {0})
+        self.assertEqual(Post.objects.get(pk=self.other.pk).comments_count, 1)
+
+
+class PerformanceMiddlewareTests(TestCase):
+    def test_disabled_by_default(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('post-list')))
+
+    @override_settings(PERF_INSTRUMENTATION=True, PERF_CAPTURE_RATE=0)
+    def test_server_timing(self):
+        timing = self.client.get(reverse('post-list'))['Server-Timing']
+        for metric in ('db;dur=', 'cache;dur=', 'serialize;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertNotIn('desc="0 queries"', timing)
+
+    @override_settings(PERF_INSTRUMENTATION=True, PERF_CAPTURE_RATE=0)
+    async def test_server_timing_on_async_views(self):
+        response = await self.async_client.get(reverse('post-list-async'))
+        self.assertIn('total;dur=', response['Server-Timing'])
+        self.assertNotIn('desc="0 queries"', response['Server-Timing'])
+
+    def test_timed_blocks_count_only_inside_a_request(self):
+        with instrumentation.timed('serialize'):
+            pass
+        stats, token = instrumentation.start(capture=False)
+        try:
+            with instrumentation.timed('serialize'), instrumentation.timed('serialize'):
+                time.sleep(0.001)
+        finally:
+            instrumentation.stop(token)
+        self.assertGreater(stats.durations['serialize'], 0)
+        self.assertEqual(set(stats.durations), {'serialize'})
+
+
+@override_settings(LIKES_STREAM_KEY='test_likes_stream', LIKES_CONSUMER_NAME='test-flusher')
+class LikeBufferReplayTests(TestCase):
+    def setUp(self):
+        self.user = Users.objects.create(username='liker')
+        self.post = Post.objects.create(user=self.user, title='Post', body='', status='published')
+        likebuffer._redis().delete('test_likes_stream')
+        likebuffer.ensure_group()
+        self.addCleanup(likebuffer._redis().delete, 'test_likes_stream')
+
+    def flush(self):
+        entries = likebuffer.read_batch(likebuffer.consumer_name(), None)
+        likebuffer.apply_batch(entries)
+        likebuffer.acknowledge(entries)
+        return entries
+
+    def test_unacknowledged_batch_is_replayed_before_newer_entries(self):
+        likebuffer.enqueue(likebuffer.LIKE, self.post.pk, self.user.pk)
+        # The flusher applies the like and dies before acknowledging it.
+        likebuffer.apply_batch(likebuffer.read_batch(likebuffer.consumer_name(), None))
+        likebuffer.enqueue(likebuffer.UNLIKE, self.post.pk, self.user.pk)
+
+        # The restarted flusher replays the pending like first, then the unlike.
+        self.assertEqual([fields[b'op'] for _, fields in self.flush()], [b'like'])
+        self.assertEqual([fields[b'op'] for _, fields in self.flush()], [b'unlike'])
+        self.assertEqual(self.flush(), [])
+
+        self.assertFalse(Like.objects.filter(post=self.post, user=self.user).exists())
+        self.assertEqual(Post.objects.get(pk=self.post.pk).likes_count, 0)
+
+    def test_batches_move_likes_count_by_the_rows_that_changed(self):
+        other = Users.objects.create(username='other')
+        Like.objects.create(post=self.post, user=other)
+        # Drift is left for recount_post_counters; a batch only applies its own delta.
+        Post.objects.filter(pk=self.post.pk).update(likes_count=10)
+
+        likebuffer.enqueue(likebuffer.LIKE, self.post.pk, self.user.pk)
+        likebuffer.enqueue(likebuffer.LIKE, self.post.pk, other.pk)
+        entries = likebuffer.read_batch(likebuffer.consumer_name(), None)
+        likebuffer.apply_batch(entries)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).likes_count, 11)
+
+        # A replayed batch inserts nothing and changes nothing.
+        likebuffer.apply_batch(entries)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).likes_count, 11)
+
+        likebuffer.enqueue(likebuffer.UNLIKE, self.post.pk, self.user.pk)
+        likebuffer.enqueue(likebuffer.UNLIKE, self.post.pk, other.pk)
+        likebuffer.acknowledge(entries)
+        self.flush()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).likes_count, 9)
+        self.assertFalse(Like.objects.filter(post=self.post).exists())
+
+
+class _ReplicaReadView(ReplicaReadMixin, APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        # Where the ORM would send a read, without needing the replica to exist.
+        return Response({'db': Post.objects.all().db})
+
+
+@override_settings(
+    DATABASE_REPLICAS=['replica1'],
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Users.objects.create(username='writer')
+        self.factory = APIRequestFactory()
+
+    def read(self, user=None):
+        request = self.factory.get('/')
+        if user is not None:
+            force_authenticate(request, user=user)
+        return _ReplicaReadView.as_view()(request).data['db']
+
+    def test_router_sends_reads_to_the_chosen_alias_and_writes_to_the_primary(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Post))
+        with reading_from('replica1'):
+            self.assertEqual(router.db_for_read(Post), 'replica1')
+            self.assertEqual(router.db_for_write(Post), 'default')
+        self.assertIsNone(router.db_for_read(Post))
+        self.assertFalse(router.allow_migrate('replica1', 'posts'))
+
+    def test_mixin_reads_from_a_replica_until_the_user_writes(self):
+        self.assertEqual(self.read(), 'replica1')
+        self.assertEqual(self.read(self.user), 'replica1')
+        pin_to_primary(self.user.pk)
+        self.assertEqual(self.read(self.user), 'default')
+        # The alias is reset once the response is finalized.
+        self.assertEqual(Post.objects.all().db, 'default')
+
+    def test_middleware_pins_after_successful_writes(self):
+        def write(status_code):
+            request = self.factory.post('/')
+            request.user = self.user
+            return request, HttpResponse(status=status_code)
+
+        sync_middleware = ReplicaPinMiddleware(lambda request: response)
+        request, response = write(400)
+        sync_middleware(request)
+        self.assertIsNone(cache.get(_pin_key(self.user.pk)))
+        request, response = write(201)
+        sync_middleware(request)
+        self.assertIsNotNone(cache.get(_pin_key(self.user.pk)))
+
+        cache.clear()
+
+        async def get_response(request):
+            return response
+
+        async_middleware = ReplicaPinMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(async_middleware))
+        request, response = write(201)
+        async_to_sync(async_middleware)(request)
+        self.assertIsNotNone(cache.get(_pin_key(self.user.pk)))
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "Needs DB_REPLICAS; each replica mirrors the test database.")
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ReplicaMirrorTests(TransactionTestCase):
+    # Committed rows are visible through the mirrors, so reads really go to a replica alias.
+    databases = '__all__'
+
+    def test_public_feed_reads_from_a_replica(self):
+        author = Users.objects.create(username='author')
+        post = Post.objects.create(user=author, title='Mirrored', body='', status='published')
+        with override_settings(DATABASE_REPLICAS=settings.DATABASE_REPLICAS[:1]):
+            with CaptureQueriesContext(connections[settings.DATABASE_REPLICAS[0]]) as replica:
+                response = self.client.get(reverse('post-list'))
+        self.assertEqual([p['id'] for p in response.data['data']['posts']], [post.pk])
+        self.assertTrue(replica.captured_queries)
+
+
+@override_settings(HOT_HALF_LIFE=3600, HOT_MIN_SCORE=0.05, HOT_MAX_SIZE=10000)
+class HotPostsTests(TestCase):
+    def setUp(self):
+        for name, key in (('HOT_KEY', 'test_hot_posts'), ('HOT_EPOCH_KEY', 'test_hot_posts_epoch')):
+            patcher = mock.patch.object(hot, name, key)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        hot._redis().delete(hot.HOT_KEY, hot.HOT_EPOCH_KEY)
+        self.addCleanup(hot._redis().delete, 'test_hot_posts', 'test_hot_posts_epoch')
+
+    def record(self, post_id, weight, at=()):
+        with self.captureOnCommitCallbacks(execute=True):
+            hot.record_engagement(post_id, weight, at=at)
+
+    def score(self, post_id):
+        return hot._redis().zscore(hot.HOT_KEY, post_id)
+
+    def test_top_posts_by_engagement(self):
+        self.record(1, 1.0)
+        self.record(2, 3.0)
+        self.record(3, 2.0)
+        self.record(1, 0.5)
+        self.assertEqual(hot.top_post_ids(2), [2, 3])
+        self.assertEqual(hot.top_post_ids(10), [2, 3, 1])
+
+    def test_newer_engagement_outweighs_older(self):
+        # With the epoch an hour back, engagement now counts double.
+        hot._redis().set(hot.HOT_EPOCH_KEY, time.time() - 3600)
+        self.record(1, 1.0)
+        self.assertAlmostEqual(self.score(1), 2.0, places=2)
+
+    def test_decay_rescales_and_compacts(self):
+        hot._redis().set(hot.HOT_EPOCH_KEY, time.time() - 3600)
+        self.record(1, 1.0)
+        self.record(2, 0.04)
+        removed, remaining = hot.decay()
+        self.assertEqual((removed, remaining), (1, 1))
+        # Rebased on now: the double-weight like is worth 1 again.
+        self.assertAlmostEqual(self.score(1), 1.0, places=2)
+        self.assertIsNone(self.score(2))
+
+        with override_settings(HOT_MAX_SIZE=1):
+            self.record(3, 5.0)
+            self.assertEqual(hot.decay(), (1, 1))
+        self.assertEqual(hot.top_post_ids(10), [3])
+
+    def test_taking_back_engagement_subtracts_what_it_added(self):
+        liked_at = timezone.now() - timedelta(hours=2)
+        self.record(1, 1.0, at=[liked_at])
+        self.record(2, 1.0)
+        hot.decay()
+
+        # Removed after a decay: only the like's decayed share goes, not a fresh like's worth.
+        self.record(1, -1.0, at=[liked_at])
+        self.assertIsNone(self.score(1))
+        self.assertEqual(hot.top_post_ids(10), [2])
+
+    def test_unlike_takes_back_its_own_weight(self):
+        user = Users.objects.create(username='liker')
+        post = Post.objects.create(user=user, title='Post', body='', status='published')
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.like(post.pk, user)
+        Like.objects.filter(post=post).update(created_at=timezone.now() - timedelta(hours=1))
+        hot._redis().zadd(hot.HOT_KEY, {post.pk: 0.5})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.unlike(post.pk, user)
+        self.assertIsNone(self.score(post.pk))
+
+
+@override_settings(POST_PHOTO_MAX_BYTES=64 * 1024, POST_PHOTO_MAX_PIXELS=10_000, POST_PHOTO_HEADER_BYTES=1024)
+class StreamingImageUploadHandlerTests(SimpleTestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        override = override_settings(FILE_UPLOAD_TEMP_DIR=temp_dir.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def image(self, size, image_format='PNG'):
+        buffer = BytesIO()
+        Image.new('RGB', size).save(buffer, format=image_format)
+        return buffer.getvalue()
+
+    def upload(self, data, chunk_size=512):
+        handler = StreamingImageUploadHandler()
+        handler.new_file('photo', 'photo', 'application/octet-stream', len(data))
+        self.addCleanup(handler.file.close)
+        for start in range(0, len(data), chunk_size):
+            handler.receive_data_chunk(data[start:start + chunk_size], start)
+        return handler.file_complete(len(data))
+
+    def test_accepts_an_image_within_limits(self):
+        data = self.image((100, 100))
+        self.assertEqual(self.upload(data).size, len(data))
+
+    def test_rejects_a_declared_body_over_the_byte_limit_before_reading_it(self):
+        handler = StreamingImageUploadHandler()
+        with self.assertRaises(UploadRejected):
+            handler.handle_raw_input(None, {}, 64 * 1024 + settings.DATA_UPLOAD_MAX_MEMORY_SIZE + 1, b'')
+
+    def test_rejects_a_stream_over_the_byte_limit(self):
+        # A valid header passes the checks; the byte count still stops it.
+        data = self.image((50, 50)) + b'\0' * (64 * 1024)
+        with self.assertRaises(UploadRejected) as raised:
+            self.upload(data)
+        self.assertEqual(raised.exception.status_code, 413)
+
+    def test_rejects_too_many_pixels_from_the_header_alone(self):
+        handler = StreamingImageUploadHandler()
+        handler.new_file('photo', 'photo', 'image/png', None)
+        self.addCleanup(handler.file.close)
+        with self.assertRaises(UploadRejected) as raised:
+            # 200 x 200 is 40,000 pixels; the first chunk carries the whole header.
+            handler.receive_data_chunk(self.image((200, 200))[:1024], 0)
+        self.assertEqual(raised.exception.status_code, 413)
+
+    def test_rejects_unsupported_formats(self):
+        with self.assertRaises(UnsupportedImage) as raised:
+            self.upload(self.image((10, 10), 'BMP'))
+        self.assertEqual(raised.exception.status_code, 400)
+
+        with self.assertRaises(UnsupportedImage):
+            self.upload(b'not an image at all')
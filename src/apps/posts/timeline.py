@@ -0,0 +1,147 @@
+"""
+Home timelines: one Redis sorted set of post ids per user.
+
+Posts are fanned out on write to the timelines of their author's followers,
+except for authors with ``TIMELINE_CELEBRITY_FOLLOWERS`` or more followers,
+whose posts are merged in from the database when a timeline is read. Scores
+are the post ids themselves, which follow creation order, so a page is one
+``ZREVRANGEBYSCORE`` below the cursor id.
+
+Only timelines that already exist are written to; a missing timeline is
+rebuilt from the database on its next read, so inactive users cost nothing
+once theirs expires. A sentinel member keeps an empty timeline distinguishable
+from a missing one.
+"""
+from django.conf import settings
+from django.db.models import Q
+from django_redis import get_redis_connection
+
+from src.apps.users.models import Follow, Users
+from .models import Post
+
+SENTINEL = '0'
+
+# Add the post to every listed timeline that exists, then trim it to length.
+_FAN_OUT = """
+local added = 0
+for _, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('ZADD', key, ARGV[1], ARGV[1])
+        redis.call('ZREMRANGEBYRANK', key, 0, -tonumber(ARGV[2]) - 1)
+        added = added + 1
+    end
+end
+return added
+"""
+_fan_out_script = None
+
+
+def _redis():
+    return get_redis_connection('default')
+
+
+def timeline_key(user_id):
+    return f"timeline_{user_id}"
+
+
+def _fan_out(keys, post_id):
+    global _fan_out_script
+    if _fan_out_script is None:
+        _fan_out_script = _redis().register_script(_FAN_OUT)
+    return _fan_out_script(keys=keys, args=[post_id, settings.TIMELINE_MAX_LENGTH])
+
+
+def _followee_ids(user_id, celebrities):
+    followees = Follow.objects.filter(follower_id=user_id)
+    if celebrities:
+        followees = followees.filter(followee__followers_count__gte=settings.TIMELINE_CELEBRITY_FOLLOWERS)
+    else:
+        followees = followees.filter(followee__followers_count__lt=settings.TIMELINE_CELEBRITY_FOLLOWERS)
+    return followees.values('followee_id')
+
+
+def _published_by(authors):
+    return Post.objects.filter(authors, status='published').order_by('-id').values_list('id', flat=True)
+
+
+def fan_out_post(post_id):
+    """
+    Push a published post into its followers' timelines, in batches of
+    ``TIMELINE_FANOUT_BATCH``. Returns the number of timelines written to.
+    """
+    post = Post.objects.filter(pk=post_id, status='published').values('user_id').first()
+    if post is None:
+        return 0
+    author_id = post['user_id']
+
+    written = _fan_out([timeline_key(author_id)], post_id)
+    followers_count = Users.objects.filter(pk=author_id).values_list('followers_count', flat=True).first()
+    if followers_count is None or followers_count >= settings.TIMELINE_CELEBRITY_FOLLOWERS:
+        return written
+
+    followers = Follow.objects.filter(followee_id=author_id).order_by('follower_id')
+    last_id = 0
+    while True:
+        batch = list(
+            followers.filter(follower_id__gt=last_id)
+            .values_list('follower_id', flat=True)[:settings.TIMELINE_FANOUT_BATCH]
+        )
+        if not batch:
+            return written
+        last_id = batch[-1]
+        written += _fan_out([timeline_key(follower_id) for follower_id in batch], post_id)
+
+
+def rebuild_timeline(user_id):
+    """Materialize a timeline from the database, swapping it in atomically."""
+    ids = list(
+        _published_by(Q(user_id=user_id) | Q(user_id__in=_followee_ids(user_id, celebrities=False)))
+        [:settings.TIMELINE_MAX_LENGTH]
+    )
+    key = timeline_key(user_id)
+    building = f"{key}_building"
+    pipe = _redis().pipeline()
+    pipe.delete(building)
+    pipe.zadd(building, {SENTINEL: 0, **{str(pk): pk for pk in ids}})
+    pipe.expire(building, settings.TIMELINE_TTL)
+    pipe.rename(building, key)
+    pipe.execute()
+    return len(ids)
+
+
+def invalidate_timeline(user_id):
+    """Drop a timeline whose inputs changed (follow/unfollow); the next read rebuilds it."""
+    _redis().delete(timeline_key(user_id))
+
+
+def timeline_page(user_id, before, size):
+    """
+    Return up to ``size + 1`` post ids older than ``before`` (``None`` for
+    the newest), newest first; the extra id tells whether there is a next page.
+    """
+    redis = _redis()
+    key = timeline_key(user_id)
+    if not redis.exists(key):
+        rebuild_timeline(user_id)
+
+    upper = f"({before}" if before is not None else '+inf'
+    pipe = redis.pipeline()
+    pipe.zrevrangebyscore(key, upper, '(0', start=0, num=size + 1)
+    pipe.zcard(key)
+    pipe.expire(key, settings.TIMELINE_TTL)
+    members, length, _ = pipe.execute()
+    ids = [int(member) for member in members]
+
+    # Pages past the trimmed tail come from the database.
+    if len(ids) <= size and length >= settings.TIMELINE_MAX_LENGTH:
+        oldest = ids[-1] if ids else before
+        older = _published_by(Q(user_id=user_id) | Q(user_id__in=_followee_ids(user_id, celebrities=False)))
+        if oldest is not None:
+            older = older.filter(id__lt=oldest)
+        ids += list(older[:size + 1 - len(ids)])
+
+    celebrity_posts = _published_by(Q(user_id__in=_followee_ids(user_id, celebrities=True)))
+    if before is not None:
+        celebrity_posts = celebrity_posts.filter(id__lt=before)
+    ids = sorted(set(ids).union(celebrity_posts[:size + 1]), reverse=True)
+    return ids[:size + 1]
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from src.core.cache import bump_version, get_versions
+from .models import Users
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+_stats = Counter()
+
+
+def user_version_key(user_id):
+    return f"auth_user_version_{user_id}"
+
+
+def _local_get(key):
+    with _local_lock:
+        entry = _local.get(key)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if expires_at <= time.monotonic():
+            del _local[key]
+            return None
+        _local.move_to_end(key)
+        return user
+
+
+def _local_set(key, user):
+    with _local_lock:
+        _local[key] = (user, time.monotonic() + settings.AUTH_USER_LOCAL_TTL)
+        _local.move_to_end(key)
+        while len(_local) > settings.AUTH_USER_LOCAL_SIZE:
+            _local.popitem(last=False)
+
+
+# What authentication and the views read from request.user. The password hash
+# is never cached; any other field loads from Postgres on first access.
+CACHED_FIELDS = (
+    'id', 'username', 'email', 'is_active', 'is_staff', 'is_superuser',
+    'profile_image', 'profile_image_variants',
+)
+
+
+def get_user(user_id):
+    """
+    Resolve a user for authentication: in-process LRU, then Redis, then Postgres.
+
+    Both tiers are keyed by the user's current version, which is read from
+    Redis on every call, so a bump is visible to every process immediately.
+    They hold the ``CACHED_FIELDS`` values only; callers get a fresh instance
+    with the remaining fields deferred.
+    """
+    version = get_versions([user_version_key(user_id)])[user_version_key(user_id)]
+    key = (user_id, version)
+
+    values = _local_get(key)
+    if values is not None:
+        _stats['local_hits'] += 1
+        return Users.from_db('default', CACHED_FIELDS, values)
+
+    redis_key = f"auth_user_fields_{user_id}_{version}"
+    values = cache.get(redis_key)
+    if values is not None:
+        _stats['redis_hits'] += 1
+    else:
+        _stats['misses'] += 1
+        values = Users.objects.filter(pk=user_id).values_list(*CACHED_FIELDS).first()
+        if values is None:
+            return None
+        cache.set(redis_key, values, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+
+    _local_set(key, values)
+    return Users.from_db('default', CACHED_FIELDS, values)
+
+
+def invalidate_user(user_id):
+    transaction.on_commit(lambda: bump_version(user_version_key(user_id)))
+
+
+def cache_stats():
+    lookups = sum(_stats.values())
+    hits = _stats['local_hits'] + _stats['redis_hits']
+    return {
+        'local_hits': _stats['local_hits'],
+        'redis_hits': _stats['redis_hits'],
+        'misses': _stats['misses'],
+        'hit_rate': hits / lookups if lookups else None,
+        'local_size': len(_local),
+    }
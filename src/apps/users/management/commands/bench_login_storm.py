@@ -0,0 +1,101 @@
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from src.apps.posts.models import Post
+from src.apps.users.models import Users
+
+USERNAME_PREFIX = 'bench_login_'
+PASSWORD = 'bench-password'
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _summary(latencies):
+    return (
+        f"p50 {statistics.median(latencies) * 1000:8.2f} ms   "
+        f"p99 {_percentile(latencies, 0.99) * 1000:8.2f} ms"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure public-feed latency on a fixed pool of request threads, alone and during a login storm, "
+        "with password hashing in the process pool and (--inline) in the request threads. "
+        "Latency includes the time a request waits for a free thread."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help="Request threads, as in a threaded server.")
+        parser.add_argument('--feed-requests', type=int, default=500)
+        parser.add_argument('--logins', type=int, default=200)
+        parser.add_argument('--rate', type=float, default=200, help="Requests submitted per second.")
+        parser.add_argument('--inline', action='store_true',
+                            help="Also run the storm with Django's plain PBKDF2PasswordHasher.")
+
+    def handle(self, *args, threads, feed_requests, logins, rate, inline, **options):
+        if not Post.objects.filter(status='published').exists():
+            raise CommandError("Seed at least one published post first.")
+
+        # One hash shared by every account; only verification cost matters here.
+        encoded = make_password(PASSWORD)
+        Users.objects.bulk_create(
+            Users(username=f"{USERNAME_PREFIX}{i}", email=f"{USERNAME_PREFIX}{i}@example.com", password=encoded)
+            for i in range(logins)
+        )
+        try:
+            self.report('baseline', self.run(threads, feed_requests, 0, rate))
+            self.report('storm', self.run(threads, feed_requests, logins, rate))
+            if inline:
+                with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.PBKDF2PasswordHasher']):
+                    self.report('storm inline', self.run(threads, feed_requests, logins, rate))
+        finally:
+            Users.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def run(self, threads, feed_requests, logins, rate):
+        rng = random.Random(0)
+        feed_path, login_path = reverse('post-list'), reverse('login')
+
+        def feed(queued_at):
+            Client(headers={'host': 'localhost'}).get(feed_path)
+            return 'feed', time.perf_counter() - queued_at
+
+        def login(i):
+            # Distinct addresses and accounts keep the auth throttles out of the picture.
+            address = f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"
+            client = Client(headers={'host': 'localhost'}, REMOTE_ADDR=address)
+            response = client.post(login_path, {'username': f"{USERNAME_PREFIX}{i}", 'password': PASSWORD},
+                                   content_type='application/json')
+            return 'login', response.status_code
+
+        jobs = [('feed', None)] * feed_requests + [('login', i) for i in range(logins)]
+        rng.shuffle(jobs)
+        futures = []
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            # Open-loop arrivals: requests keep coming at a fixed rate whether
+            # or not the threads keep up, as they would from real clients.
+            start = time.perf_counter()
+            for n, (kind, arg) in enumerate(jobs):
+                time.sleep(max(0.0, start + n / rate - time.perf_counter()))
+                futures.append(pool.submit(feed, time.perf_counter()) if kind == 'feed' else pool.submit(login, arg))
+            results = [future.result() for future in futures]
+
+        return (
+            [value for kind, value in results if kind == 'feed'],
+            Counter(value for kind, value in results if kind == 'login'),
+        )
+
+    def report(self, label, result):
+        latencies, logins = result
+        statuses = '   '.join(f"{code}: {count}" for code, count in sorted(logins.items()))
+        self.stdout.write(f"{label:<13} feed {_summary(latencies)}   {statuses or 'no logins'}")
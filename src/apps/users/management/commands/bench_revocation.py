@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from src.apps.users.models import Users
+from src.apps.users.revocation import is_revoked, revoke_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Time revocation checks against the Redis store, and against the simplejwt DB blacklist "
+        "when rest_framework_simplejwt.token_blacklist is installed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--checks', type=int, default=10000)
+
+    def handle(self, *args, checks, **options):
+        user = Users(id=0, username='bench')
+        tokens = [RefreshToken.for_user(user) for _ in range(100)]
+        for token in tokens[::2]:
+            revoke_token(token)
+
+        redis = self.time(lambda token: is_revoked(token), tokens, checks)
+        self.stdout.write(f"redis      {redis * 1e6:8.1f} us/check   {1 / redis:10.0f} checks/s")
+
+        if 'rest_framework_simplejwt.token_blacklist' not in settings.INSTALLED_APPS:
+            self.stdout.write("db         skipped: token_blacklist is not installed")
+            return
+
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        # Same lookup simplejwt's BlacklistMixin.check_blacklist performs.
+        db = self.time(lambda token: BlacklistedToken.objects.filter(token__jti=token['jti']).exists(), tokens, checks)
+        self.stdout.write(f"db         {db * 1e6:8.1f} us/check   {1 / db:10.0f} checks/s   x{db / redis:5.1f}")
+
+    def time(self, check, tokens, checks):
+        start = time.perf_counter()
+        for i in range(checks):
+            check(tokens[i % len(tokens)])
+        return (time.perf_counter() - start) / checks
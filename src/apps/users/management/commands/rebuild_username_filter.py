@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.users.usernames import rebuild_username_filter, username_filter
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the Redis Bloom filter behind username availability checks from the users table. "
+        "Run after deploys that resize it, after Redis data loss, or periodically to drop renamed usernames."
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_username_filter()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} username(s) in {username_filter.size} bits with {username_filter.hashes} hashes."
+        ))
@@ -0,0 +1,8 @@
+from src.core.media import process_image_field
+from .cache import invalidate_user
+from .models import Users
+
+
+def process_profile_image(pk):
+    if process_image_field(Users, pk, 'profile_image', 'profile_image_variants'):
+        invalidate_user(pk)
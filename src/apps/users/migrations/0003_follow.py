@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_users_profile_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='users',
+            name='followers_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='users',
+            name='following_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('followee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                               related_name='followers', to=settings.AUTH_USER_MODEL)),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                               related_name='following', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['followee', 'follower'], name='follow_followee_follower_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('follower', 'followee'), name='follow_unique_follower_followee'),
+                    models.CheckConstraint(condition=models.Q(('follower', models.F('followee')), _negated=True),
+                                           name='follow_not_self'),
+                ],
+            },
+        ),
+    ]
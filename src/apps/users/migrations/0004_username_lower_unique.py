@@ -0,0 +1,46 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def check_case_duplicates(apps, schema_editor):
+    Users = apps.get_model('users', 'Users')
+    duplicates = list(
+        Users.objects.annotate(username_lower=Lower('username'))
+        .values('username_lower')
+        .annotate(total=models.Count('pk'))
+        .filter(total__gt=1)
+        .values_list('username_lower', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Usernames differing only in case must be resolved before adding the unique index: "
+            + ", ".join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('users', '0003_follow'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "users_username_lower_unique" '
+                    'ON "users_users" (lower("username"))',
+                    'DROP INDEX CONCURRENTLY IF EXISTS "users_username_lower_unique"',
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='users',
+                    constraint=models.UniqueConstraint(Lower('username'), name='users_username_lower_unique'),
+                ),
+            ],
+        ),
+    ]
@@ -1 +1,2 @@
-from .user import Users
\ No newline at end of file
+from .user import Users
+from .follow import Follow
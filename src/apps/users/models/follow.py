@@ -0,0 +1,22 @@
+from django.db import models
+
+from .user import Users
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(Users, on_delete=models.CASCADE, related_name='following')
+    followee = models.ForeignKey(Users, on_delete=models.CASCADE, related_name='followers')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['follower', 'followee'], name='follow_unique_follower_followee'),
+            models.CheckConstraint(condition=~models.Q(follower=models.F('followee')), name='follow_not_self'),
+        ]
+        indexes = [
+            # Fan-out walks an author's followers in follower order.
+            models.Index(fields=['followee', 'follower'], name='follow_followee_follower_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.follower_id} follows {self.followee_id}"
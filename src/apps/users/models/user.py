@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 
 class Users(AbstractUser):
     bio = models.TextField(blank=True, null=True)
@@ -8,6 +9,28 @@ class Users(AbstractUser):
         blank=True,
         null=True
     )
+    # {variant name: storage path}, filled in by the background media pipeline.
+    profile_image_variants = models.JSONField(default=dict, blank=True)
+    # Maintained from Follow signals; followers_count decides fan-out vs. merge-on-read.
+    followers_count = models.IntegerField(default=0)
+    following_count = models.IntegerField(default=0)
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Usernames are unique regardless of case; lookups go through lower(username).
+            models.UniqueConstraint(Lower('username'), name='users_username_lower_unique'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_profile_image = instance.__dict__.get('profile_image')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.profile_image.name != getattr(self, '_loaded_profile_image', None):
+            self.profile_image_variants = {}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.username
@@ -0,0 +1,64 @@
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+
+def _jti_key(jti):
+    return f"revoked_jti_{jti}"
+
+
+def _user_key(user_id):
+    return f"revoked_user_before_{user_id}"
+
+
+def _remaining_lifetime(token):
+    return int(token['exp'] - time.time())
+
+
+def revoke_token(token):
+    """Revoke one token until it would have expired anyway."""
+    ttl = _remaining_lifetime(token)
+    if ttl > 0:
+        cache.set(_jti_key(token[api_settings.JTI_CLAIM]), 1, timeout=ttl)
+
+
+def claim_token(token):
+    """
+    Atomically mark a token as used; ``False`` if it already was (or was revoked).
+
+    This is what makes rotated refresh tokens single-use: two concurrent
+    refreshes with the same token cannot both win the ``SET NX``.
+    """
+    ttl = _remaining_lifetime(token)
+    if ttl <= 0:
+        return False
+    return cache.add(_jti_key(token[api_settings.JTI_CLAIM]), 1, timeout=ttl)
+
+
+def revoke_all_for_user(user_id):
+    """Revoke every token issued to the user so far, in one write."""
+    lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+    cache.set(_user_key(user_id), time.time(), timeout=int(lifetime.total_seconds()))
+
+
+def _revoked(token, found, jti_key, user_key):
+    if jti_key in found:
+        return True
+    revoked_before = found.get(user_key)
+    return revoked_before is not None and token.get('iat', 0) < revoked_before
+
+
+def _keys(token):
+    return _jti_key(token[api_settings.JTI_CLAIM]), _user_key(token.get(api_settings.USER_ID_CLAIM))
+
+
+def is_revoked(token):
+    """One Redis round trip: the token's own jti plus the user's revoke-all watermark."""
+    jti_key, user_key = _keys(token)
+    return _revoked(token, cache.get_many([jti_key, user_key]), jti_key, user_key)
+
+
+async def ais_revoked(token):
+    jti_key, user_key = _keys(token)
+    return _revoked(token, await cache.aget_many([jti_key, user_key]), jti_key, user_key)
@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.core.background import submit_on_commit
+from .cache import invalidate_user
+from .media import process_profile_image
+from .models import Follow, Users
+from .usernames import remember_username
+
+
+@receiver(post_save, sender=Users)
+def invalidate_saved_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+    image = instance.profile_image
+    if image and image.name != getattr(instance, '_loaded_profile_image', None):
+        submit_on_commit(process_profile_image, instance.pk)
+    instance._loaded_profile_image = image.name
+
+
+@receiver(post_save, sender=Users)
+def add_saved_username(sender, instance, update_fields=None, **kwargs):
+    # Covers registration, renames and admin edits alike; saves that cannot
+    # change the username (e.g. last_login) skip the Redis round trip.
+    if update_fields is None or 'username' in update_fields:
+        username = instance.username
+        transaction.on_commit(lambda: remember_username(username))
+
+
+@receiver(post_delete, sender=Users)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def increment_follow_counts(sender, instance, created, **kwargs):
+    if created:
+        Users.objects.filter(pk=instance.followee_id).update(followers_count=F('followers_count') + 1)
+        Users.objects.filter(pk=instance.follower_id).update(following_count=F('following_count') + 1)
+        # .update() skips post_save, so the cached users are dropped here.
+        invalidate_user(instance.followee_id)
+        invalidate_user(instance.follower_id)
+
+
+@receiver(post_delete, sender=Follow)
+def decrement_follow_counts(sender, instance, **kwargs):
+    Users.objects.filter(pk=instance.followee_id).update(followers_count=F('followers_count') - 1)
+    Users.objects.filter(pk=instance.follower_id).update(following_count=F('following_count') - 1)
+    invalidate_user(instance.followee_id)
+    invalidate_user(instance.follower_id)
@@ -1,3 +1,150 @@
-from django.test import TestCase
+import os
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import SimpleTestCase, TestCase
+from django.urls import resolve, reverse
+from django_redis import get_redis_connection
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from src.api.throttling import AuthIPThrottle, AuthUsernameThrottle
+from src.api.users.views import UserLoginView
+from src.apps.users import usernames
+from src.apps.users.cache import get_user
+from src.apps.users.models import Users
+from src.core import hashers
+from src.core.bloom import RedisBloomFilter
+from src.core.hashers import PooledPBKDF2PasswordHasher
+from src.core.testing import QueryBudgetTestCase
+
+
+class UserEndpointQueryBudgetTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.users, _ = self.seed(users=50, posts_per_user=1, likes_per_post=0, comments_per_post=0)
+
+    def test_user_list(self):
+        response = self.assertQueryBudget(1, reverse('user-list'), user=self.users[0])
+        self.assertEqual(len(response.data['data']['users']), 50)
+
+    def test_user_detail(self):
+        self.assertQueryBudget(1, reverse('user-detail', args=[self.users[1].pk]), user=self.users[0])
+
+    def test_username_availability_is_case_insensitive(self):
+        response = self.assertQueryBudget(1, reverse('username-available'), data={'username': 'SeedUser1'})
+        self.assertFalse(response.data['data']['available'])
+
+        response = self.assertQueryBudget(1, reverse('username-available'), data={'username': 'freshname'})
+        self.assertTrue(response.data['data']['available'])
+
+
+class UsernameFilterTests(TestCase):
+    def setUp(self):
+        self.filter = RedisBloomFilter('test_username_bloom', capacity=1000, error_rate=0.01)
+        patcher = mock.patch.object(usernames, 'username_filter', self.filter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.filter._redis().delete, self.filter.key, self.filter.built_key)
+        self.filter._redis().delete(self.filter.key, self.filter.built_key)
+        Users.objects.create(username='Existing')
+
+    def test_unbuilt_filter_falls_back_to_the_database(self):
+        # add() alone creates the bitmap, but without a rebuild it is not trusted.
+        self.filter.add('someone')
+        self.assertIsNone(self.filter.might_contain('freshname'))
+        with self.assertNumQueries(1):
+            self.assertFalse(usernames.is_username_taken('freshname'))
+
+    def test_built_filter_answers_without_the_database(self):
+        self.assertEqual(usernames.rebuild_username_filter(), 1)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(usernames.is_username_taken('freshname'))
+        self.assertTrue(usernames.is_username_taken('EXISTING'))
+
+    def test_saved_usernames_are_added_on_commit(self):
+        usernames.rebuild_username_filter()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user = Users.objects.create(username='Newcomer')
+        self.assertTrue(self.filter.might_contain('newcomer'))
+
+        user.username = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(update_fields=['username'])
+        self.assertTrue(self.filter.might_contain('renamed'))
+
+
+class PooledPasswordHasherTests(SimpleTestCase):
+    def test_matches_django_pbkdf2(self):
+        pooled = PooledPBKDF2PasswordHasher()
+        encoded = pooled.encode('correct horse', 'somesalt', iterations=1000)
+        self.assertEqual(encoded, PBKDF2PasswordHasher().encode('correct horse', 'somesalt', iterations=1000))
+        self.assertTrue(PBKDF2PasswordHasher().verify('correct horse', encoded))
+        self.assertFalse(pooled.verify('wrong horse', encoded))
+
+    def test_recovers_from_a_broken_pool(self):
+        pool, _ = hashers._get_pool()
+        # A worker exiting mid-task breaks the executor for every caller.
+        with self.assertRaises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()
+
+        encoded = PooledPBKDF2PasswordHasher().encode('correct horse', 'somesalt', iterations=1000)
+        self.assertTrue(PBKDF2PasswordHasher().verify('correct horse', encoded))
+        self.assertIsNot(hashers._get_pool()[0], pool)
+
+
+class AuthThrottleTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def request(self, throttle, data=None, ip='203.0.113.7'):
+        request = Request(self.factory.post('/', data or {}, format='json', REMOTE_ADDR=ip), parsers=[JSONParser()])
+        key = throttle.get_cache_key(request, None)
+        if key is not None:
+            self.addCleanup(get_redis_connection('default').delete, key)
+        return throttle.allow_request(request, None)
+
+    def test_ip_window_admits_the_rate_then_rejects(self):
+        throttle = type('TestIPThrottle', (AuthIPThrottle,), {'rate': '2/min'})
+        get_redis_connection('default').delete('throttle_auth_ip_203.0.113.7')
+
+        self.assertEqual([self.request(throttle()) for _ in range(2)], [True, True])
+        rejected = throttle()
+        self.assertFalse(self.request(rejected))
+        self.assertTrue(0 < rejected.wait() <= 60)
+        # Other clients have their own window.
+        self.assertTrue(self.request(throttle(), ip='203.0.113.8'))
+
+    def test_username_window_is_per_account(self):
+        throttle = type('TestUsernameThrottle', (AuthUsernameThrottle,), {'rate': '1/min'})
+        redis = get_redis_connection('default')
+        redis.delete('throttle_auth_username_victim', 'throttle_auth_username_other')
+
+        self.assertTrue(self.request(throttle(), {'username': 'Victim'}))
+        self.assertFalse(self.request(throttle(), {'username': 'VICTIM'}, ip='198.51.100.1'))
+        self.assertTrue(self.request(throttle(), {'username': 'other'}))
+        # Without a username there is nothing to key on.
+        self.assertTrue(self.request(throttle()))
+
+    def test_token_endpoint_is_throttled_like_login(self):
+        view = resolve(reverse('token_obtain_pair')).func
+        self.assertEqual(view.view_initkwargs['throttle_classes'], UserLoginView.throttle_classes)
+
+
+class AuthUserCacheTests(QueryBudgetTestCase):
+    def test_cached_user_never_carries_the_password_hash(self):
+        user = Users.objects.create(username='cached', email='cached@example.com', password='pbkdf2_sha256$1$s$h')
+
+        self.assertEqual(get_user(user.pk).username, 'cached')
+        with self.assertNumQueries(0):
+            cached = get_user(user.pk)
+        self.assertIn('password', cached.get_deferred_fields())
+        self.assertEqual((cached.pk, cached.email, cached.is_active), (user.pk, 'cached@example.com', True))
+
+        # Reading a field that is not cached loads it from Postgres.
+        with self.assertNumQueries(1):
+            self.assertEqual(cached.password, 'pbkdf2_sha256$1$s$h')
@@ -0,0 +1,55 @@
+import logging
+
+from django.conf import settings
+from django.db.models.functions import Lower
+from redis.exceptions import RedisError
+
+from src.core.bloom import RedisBloomFilter
+from .models import Users
+
+logger = logging.getLogger(__name__)
+
+username_filter = RedisBloomFilter(
+    'username_bloom',
+    capacity=settings.USERNAME_BLOOM_CAPACITY,
+    error_rate=settings.USERNAME_BLOOM_ERROR_RATE,
+)
+
+
+def username_exists(username):
+    """Case-insensitive lookup served by the unique ``lower(username)`` index."""
+    return Users.objects.alias(username_lower=Lower('username')).filter(username_lower=username.lower()).exists()
+
+
+def is_username_taken(username):
+    """
+    Whether ``username`` is taken, in any letter case.
+
+    The Bloom filter answers "definitely not" without touching Postgres;
+    "maybe", a missing filter and an unreachable Redis are all settled by
+    the indexed lookup.
+    """
+    try:
+        if username_filter.might_contain(username.lower()) is False:
+            return False
+    except RedisError:
+        logger.warning("Username filter unavailable; checking the database", exc_info=True)
+    return username_exists(username)
+
+
+def remember_username(username):
+    # Called on commit of every Users save that may set a username (signals.py). A name
+    # missing from the filter would read as available; rebuild_username_filter repairs that.
+    try:
+        username_filter.add(username.lower())
+    except RedisError:
+        logger.exception("Could not add %r to the username filter", username)
+
+
+def rebuild_username_filter():
+    usernames = (
+        Users.objects.annotate(username_lower=Lower('username'))
+        .values_list('username_lower', flat=True)
+        .iterator(chunk_size=10000)
+    )
+    return username_filter.rebuild(usernames)
@@ -0,0 +1,43 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_WORKERS,
+                thread_name_prefix='posthub-background',
+            )
+        return _executor
+
+
+def _run(fn, args, kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(fn, '__qualname__', fn))
+        raise
+    finally:
+        # Worker threads own their DB connections; don't leak them between tasks.
+        connections.close_all()
+
+
+def submit(fn, *args, **kwargs):
+    """Run ``fn`` on the process-wide background pool, off the request thread."""
+    return _get_executor().submit(_run, fn, args, kwargs)
+
+
+def submit_on_commit(fn, *args, **kwargs):
+    """``submit`` once the current transaction commits, so the task sees its writes."""
+    transaction.on_commit(lambda: submit(fn, *args, **kwargs))
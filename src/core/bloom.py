@@ -0,0 +1,70 @@
+import hashlib
+import math
+
+from django_redis import get_redis_connection
+
+
+class RedisBloomFilter:
+    """
+    A Bloom filter stored as a plain Redis bitmap (no RedisBloom module needed).
+
+    Sized for ``capacity`` members at ``error_rate`` false positives; the
+    ``k`` bit positions come from double hashing one BLAKE2b digest. Only a
+    full ``rebuild`` sets the ``<key>_built`` marker: ``add`` alone can create
+    the bitmap, so without the marker (or with the bitmap lost) the filter is
+    treated as never built and ``might_contain`` reports ``None``, letting
+    callers fall back to the source of truth instead of reading every value
+    as absent.
+    """
+
+    def __init__(self, key, capacity, error_rate):
+        self.key = key
+        self.built_key = f"{key}_built"
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+
+    def _redis(self):
+        return get_redis_connection('default')
+
+    def positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def might_contain(self, value):
+        pipe = self._redis().pipeline(transaction=False)
+        pipe.exists(self.key, self.built_key)
+        for position in self.positions(value):
+            pipe.getbit(self.key, position)
+        exists, *bits = pipe.execute()
+        if exists < 2:
+            return None
+        return all(bits)
+
+    def add(self, value, pipe=None, key=None):
+        target = pipe if pipe is not None else self._redis().pipeline(transaction=False)
+        for position in self.positions(value):
+            target.setbit(key or self.key, position, 1)
+        if pipe is None:
+            target.execute()
+
+    def rebuild(self, values, batch_size=10000):
+        """Build from an iterable of values into a scratch key, then swap it in atomically."""
+        redis = self._redis()
+        building = f"{self.key}_building"
+        redis.delete(building)
+        # Allocate the whole bitmap up front so an empty source still yields a filter.
+        redis.setbit(building, self.size - 1, 0)
+
+        pipe = redis.pipeline(transaction=False)
+        count = 0
+        for count, value in enumerate(values, 1):
+            self.add(value, pipe=pipe, key=building)
+            if count % batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+        swap = redis.pipeline(transaction=True)
+        swap.rename(building, self.key)
+        swap.set(self.built_key, 1)
+        swap.execute()
+        return count
@@ -0,0 +1,179 @@
+import asyncio
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .routers import reading_from
+
+
+def get_versions(keys):
+    """
+    Return ``{key: version}`` for a batch of version counters.
+
+    A missing counter is initialised to a fresh random token rather than a
+    fixed value, so an evicted counter can never resurrect entries that were
+    cached under an older version.
+    """
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex[:12], timeout=None)
+        versions.update(cache.get_many(missing))
+    return versions
+
+
+async def aget_versions(keys):
+    versions = await cache.aget_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            await cache.aadd(key, uuid.uuid4().hex[:12], timeout=None)
+        versions.update(await cache.aget_many(missing))
+    return versions
+
+
+def bump_version(key):
+    cache.set(key, uuid.uuid4().hex[:12], timeout=None)
+
+
+def bump_versions(keys):
+    cache.set_many({key: uuid.uuid4().hex[:12] for key in keys}, timeout=None)
+
+
+def _lock_key(key):
+    return f"{key}_lock"
+
+
+def _acquire(key):
+    return cache.add(_lock_key(key), 1, timeout=settings.CACHE_LOCK_TIMEOUT)
+
+
+async def _aacquire(key):
+    return await cache.aadd(_lock_key(key), 1, timeout=settings.CACHE_LOCK_TIMEOUT)
+
+
+def _envelope(value, timeout):
+    # Entries are stored past their soft expiry so that, once stale, one caller
+    # refreshes them while everyone else keeps getting the stale value.
+    # Jitter spreads out entries that were written together.
+    fresh_for = timeout * random.uniform(0.9, 1.0)
+    return {'value': value, 'fresh_until': time.time() + fresh_for}
+
+
+def read_through_many(keys, builder, timeout):
+    """
+    Read ``{ident: cache_key}`` through the cache, calling ``builder(idents)``
+    once with every identifier that needs (re)building.
+
+    Stale entries are refreshed by whichever caller wins the per-key lock; the
+    rest serve the stale value. Missing entries whose lock is held elsewhere
+    are polled briefly before falling back to building them directly.
+    """
+    entries = cache.get_many(list(keys.values()))
+    now = time.time()
+    result = {}
+    rebuild, waiting, locked = [], [], []
+
+    for ident, key in keys.items():
+        entry = entries.get(key)
+        if entry is not None:
+            result[ident] = entry['value']
+            if entry['fresh_until'] <= now and _acquire(key):
+                rebuild.append(ident)
+                locked.append(key)
+        elif _acquire(key):
+            rebuild.append(ident)
+            locked.append(key)
+        else:
+            waiting.append(ident)
+
+    for _ in range(settings.CACHE_LOCK_POLL_ATTEMPTS):
+        if not waiting:
+            break
+        time.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        entries = cache.get_many([keys[ident] for ident in waiting])
+        for ident in list(waiting):
+            entry = entries.get(keys[ident])
+            if entry is not None:
+                result[ident] = entry['value']
+                waiting.remove(ident)
+    rebuild.extend(waiting)
+
+    if rebuild:
+        try:
+            # A lagging replica would cache old data under the new version.
+            with reading_from(None):
+                built = builder(rebuild)
+            cache.set_many(
+                {keys[ident]: _envelope(value, timeout) for ident, value in built.items()},
+                timeout=timeout + settings.CACHE_STALE_GRACE,
+            )
+            result.update(built)
+        finally:
+            if locked:
+                cache.delete_many([_lock_key(key) for key in locked])
+
+    return result
+
+
+def read_through(key, builder, timeout):
+    return read_through_many({key: key}, lambda idents: {key: builder()}, timeout)[key]
+
+
+async def aread_through_many(keys, builder, timeout):
+    """Async counterpart of ``read_through_many``; ``builder`` is a coroutine function."""
+    entries = await cache.aget_many(list(keys.values()))
+    now = time.time()
+    result = {}
+    rebuild, waiting, locked = [], [], []
+
+    for ident, key in keys.items():
+        entry = entries.get(key)
+        if entry is not None:
+            result[ident] = entry['value']
+            if entry['fresh_until'] <= now and await _aacquire(key):
+                rebuild.append(ident)
+                locked.append(key)
+        elif await _aacquire(key):
+            rebuild.append(ident)
+            locked.append(key)
+        else:
+            waiting.append(ident)
+
+    for _ in range(settings.CACHE_LOCK_POLL_ATTEMPTS):
+        if not waiting:
+            break
+        await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        entries = await cache.aget_many([keys[ident] for ident in waiting])
+        for ident in list(waiting):
+            entry = entries.get(keys[ident])
+            if entry is not None:
+                result[ident] = entry['value']
+                waiting.remove(ident)
+    rebuild.extend(waiting)
+
+    if rebuild:
+        try:
+            with reading_from(None):
+                built = await builder(rebuild)
+            await cache.aset_many(
+                {keys[ident]: _envelope(value, timeout) for ident, value in built.items()},
+                timeout=timeout + settings.CACHE_STALE_GRACE,
+            )
+            result.update(built)
+        finally:
+            if locked:
+                await cache.adelete_many([_lock_key(key) for key in locked])
+
+    return result
+
+
+async def aread_through(key, builder, timeout):
+    async def build(idents):
+        return {key: await builder()}
+
+    return (await aread_through_many({key: key}, build, timeout))[key]
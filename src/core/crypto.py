@@ -0,0 +1,14 @@
+"""
+Key derivation run in the password-hashing worker processes.
+
+Kept free of Django imports: ``pbkdf2`` runs in spawned worker processes
+(see ``src.core.hashers``).
+"""
+import base64
+import hashlib
+
+
+def pbkdf2(password, salt, iterations, digest_name):
+    """Base64 PBKDF2 digest, as ``django.utils.crypto.pbkdf2`` + ``PBKDF2PasswordHasher.encode`` produce it."""
+    raw = hashlib.pbkdf2_hmac(digest_name, password.encode(), salt.encode(), iterations)
+    return base64.b64encode(raw).decode('ascii').strip()
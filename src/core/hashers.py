@@ -0,0 +1,75 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .crypto import pbkdf2
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = None
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-ins in progress, try again shortly.'
+    default_code = 'password_hashing_busy'
+
+
+def _get_pool():
+    # Spawned, not forked: forking a threaded Django process is unsafe.
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE)
+        return _pool, _slots
+
+
+def _discard_pool(broken):
+    # A worker died (OOM kill, segfault) and took the whole executor with it.
+    # Only the first thread to notice replaces it; the slots carry over.
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    ``PBKDF2PasswordHasher`` whose key derivation runs in a bounded process pool.
+
+    Same algorithm name and encoding, so existing hashes verify unchanged.
+    Each request process admits at most ``PASSWORD_HASH_WORKERS +
+    PASSWORD_HASH_QUEUE`` hashes at a time; a request that cannot get a slot
+    within ``PASSWORD_HASH_WAIT`` seconds fails with ``PasswordHashingBusy``
+    (503) instead of queueing, so a login flood cannot hold every request
+    worker hostage. A broken pool is replaced and the hash retried once.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        self._check_encode_args(password, salt)
+        iterations = iterations or self.iterations
+        pool, slots = _get_pool()
+        if not slots.acquire(timeout=settings.PASSWORD_HASH_WAIT):
+            raise PasswordHashingBusy()
+        try:
+            try:
+                hash = pool.submit(pbkdf2, password, salt, iterations, self.digest().name).result()
+            except BrokenProcessPool:
+                _discard_pool(pool)
+                pool, _ = _get_pool()
+                hash = pool.submit(pbkdf2, password, salt, iterations, self.digest().name).result()
+        finally:
+            slots.release()
+        return "%s$%d$%s$%s" % (self.algorithm, iterations, salt, hash)
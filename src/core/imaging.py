@@ -0,0 +1,32 @@
+"""
+Image re-encoding used by the media pipeline.
+
+Kept free of Django imports: ``render_variants`` runs in spawned worker
+processes (see ``src.core.media``).
+"""
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+
+def render_variants(data, sizes, image_format='WEBP', quality=80):
+    """
+    Return ``{name: bytes}`` with one re-encoded variant per ``sizes`` entry,
+    each bounded to ``size x size`` pixels without upscaling.
+
+    EXIF orientation is applied to the pixels first; nothing else from the
+    source metadata (EXIF, GPS, ICC, XMP) is written to the variants.
+    """
+    with Image.open(BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    variants = {}
+    for name, size in sizes.items():
+        variant = image.copy()
+        variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        variant.save(buffer, format=image_format, quality=quality)
+        variants[name] = buffer.getvalue()
+    return variants
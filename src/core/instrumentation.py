@@ -0,0 +1,230 @@
+"""
+Per-request performance instrumentation (``PerformanceMiddleware``).
+
+Each request collects DB query count and time (a query hook on every
+connection), cache hits, misses and time (``InstrumentedRedisCache``),
+serializer time (``timed('serialize')`` around the read serializers) and
+render time (from just before the response renders until its post-render
+callback). The totals go out as a ``Server-Timing`` header and one JSON log
+line. A sample of requests (``PERF_CAPTURE_RATE``) also records every query
+and, when served synchronously, runs under cProfile; those that turn out
+slower than ``PERF_SLOW_REQUEST_MS`` are written to ``PERF_CAPTURE_DIR``.
+
+Everything is off unless ``PERF_INSTRUMENTATION`` is set. The middleware then
+removes itself, the plain cache backend stays in place and no query hook is
+added, leaving ``timed`` blocks as a single context variable lookup.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from django.conf import settings
+from django_redis.cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_stats', default=None)
+# cProfile can only run one profiler at a time.
+_profiling = threading.Lock()
+
+
+class RequestStats:
+    def __init__(self, capture=False):
+        self.capture = capture
+        self.durations = defaultdict(float)
+        self.db_queries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.queries = []
+        # Names being timed right now; nested calls are covered by the outer one.
+        self.active = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_queries += 1
+            self.durations['db'] += duration
+            if self.capture:
+                self.queries.append({
+                    'alias': context['connection'].alias,
+                    'sql': sql,
+                    'ms': round(duration * 1000, 3),
+                })
+
+    def server_timing(self, total):
+        metrics = [
+            f'db;dur={self.durations["db"] * 1000:.1f};desc="{self.db_queries} queries"',
+            f'cache;dur={self.durations["cache"] * 1000:.1f};'
+            f'desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'serialize;dur={self.durations["serialize"] * 1000:.1f}',
+            f'render;dur={self.durations["render"] * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ]
+        return ', '.join(metrics)
+
+    def summary(self, request, response, total):
+        return {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_queries': self.db_queries,
+            'db_ms': round(self.durations['db'] * 1000, 2),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_ms': round(self.durations['cache'] * 1000, 2),
+            'serialize_ms': round(self.durations['serialize'] * 1000, 2),
+            'render_ms': round(self.durations['render'] * 1000, 2),
+        }
+
+
+def start(capture):
+    stats = RequestStats(capture)
+    return stats, _current.set(stats)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def start_profile():
+    if not _profiling.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiling tool is active in this process.
+        _profiling.release()
+        return None
+    return profiler
+
+
+def stop_profile(profiler):
+    profiler.disable()
+    _profiling.release()
+
+
+def save_capture(summary, queries, profiler):
+    """Write a slow request's queries and profile to ``PERF_CAPTURE_DIR``."""
+    directory = settings.PERF_CAPTURE_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{summary['method']}"
+    capture = {**summary, 'queries': queries}
+    if profiler is not None:
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(40)
+        capture['profile'] = text.getvalue()
+        profiler.dump_stats(directory / f"{name}.prof")
+    (directory / f"{name}.json").write_text(json.dumps(capture, indent=2))
+
+
+class timed:
+    """
+    Add the time spent in the block to the current request's ``name`` total.
+
+    Outside an instrumented request this is one context variable lookup.
+    Nested blocks of the same name are covered by the outermost one.
+    """
+    __slots__ = ('name', 'stats', 'begin')
+
+    def __init__(self, name):
+        self.name = name
+        self.stats = None
+
+    def __enter__(self):
+        stats = _current.get()
+        if stats is not None and self.name not in stats.active:
+            stats.active.add(self.name)
+            self.stats = stats
+            self.begin = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.stats is not None:
+            self.stats.durations[self.name] += time.perf_counter() - self.begin
+            self.stats.active.discard(self.name)
+            self.stats = None
+
+
+def record_query(execute, sql, params, many, context):
+    """Query hook left on each connection; hands the query to the current request's stats."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def add_query_hook(connection, **kwargs):
+    # Also the connection_created receiver. A reconnect reuses the wrapper
+    # object, and its hooks with it.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def time_rendering(response):
+    """
+    Time a DRF response's rendering, which Django does after the view returns;
+    call just before it renders (``process_template_response``).
+    """
+    stats = _current.get()
+    if stats is None:
+        return
+    begin = time.perf_counter()
+
+    def finished(response):
+        stats.durations['render'] += time.perf_counter() - begin
+
+    response.add_post_render_callback(finished)
+
+
+class InstrumentedRedisCache(RedisCache):
+    """``django_redis`` backend that reports hits, misses and time to the current request."""
+
+    def _record(self, begin, hits=0, misses=0):
+        stats = _current.get()
+        if stats is not None:
+            stats.durations['cache'] += time.perf_counter() - begin
+            stats.cache_hits += hits
+            stats.cache_misses += misses
+
+    def get(self, key, default=None, *args, **kwargs):
+        begin = time.perf_counter()
+        value = super().get(key, default, *args, **kwargs)
+        missed = value is default
+        self._record(begin, hits=int(not missed), misses=int(missed))
+        return value
+
+    def get_many(self, keys, *args, **kwargs):
+        keys = list(keys)
+        begin = time.perf_counter()
+        found = super().get_many(keys, *args, **kwargs)
+        self._record(begin, hits=len(found), misses=len(keys) - len(found))
+        return found
+
+
+def _timed_cache_call(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        begin = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._record(begin)
+    return wrapper
+
+
+for _name in ('set', 'set_many', 'add', 'delete', 'delete_many', 'incr', 'decr', 'has_key', 'touch'):
+    if hasattr(RedisCache, _name):
+        setattr(InstrumentedRedisCache, _name, _timed_cache_call(getattr(RedisCache, _name)))
@@ -0,0 +1,77 @@
+import hashlib
+import multiprocessing
+import posixpath
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from .imaging import render_variants
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    # Spawned, not forked: forking a threaded Django process is unsafe.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.MEDIA_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pool
+
+
+def variant_urls(variants, storage, request=None):
+    """``{name: url}`` for a ``*_variants`` JSON field, absolute when a request is given."""
+    urls = {}
+    for name, path in (variants or {}).items():
+        url = storage.url(path)
+        urls[name] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+
+def process_image_field(model, pk, field_name, variants_field):
+    """
+    Re-encode ``model.<field_name>`` into the configured size variants.
+
+    Variants are written next to the upload as ``variants/<sha256>_<name>.<ext>``,
+    so identical output is stored once and URLs change whenever the content
+    does. The field is repointed at the metadata-free ``full`` variant and the
+    original upload is removed. Returns ``False`` when the row is gone or the
+    image was replaced while this job ran.
+    """
+    manager = model._default_manager
+    instance = manager.filter(pk=pk).first()
+    file = getattr(instance, field_name, None) if instance is not None else None
+    if not file:
+        return False
+
+    original = file.name
+    with file.open('rb') as handle:
+        data = handle.read()
+
+    image_format = settings.MEDIA_VARIANT_FORMAT
+    rendered = _get_pool().submit(
+        render_variants, data, settings.MEDIA_VARIANTS, image_format, settings.MEDIA_VARIANT_QUALITY,
+    ).result()
+
+    storage = file.storage
+    directory = posixpath.join(posixpath.dirname(original), 'variants')
+    variants = {}
+    for name, content in rendered.items():
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        path = posixpath.join(directory, f"{digest}_{name}.{image_format.lower()}")
+        if not storage.exists(path):
+            path = storage.save(path, ContentFile(content))
+        variants[name] = path
+
+    updated = manager.filter(pk=pk, **{field_name: original}).update(
+        **{field_name: variants['full'], variants_field: variants}
+    )
+    if updated and original != variants['full']:
+        storage.delete(original)
+    return bool(updated)
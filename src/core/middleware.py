@@ -0,0 +1,123 @@
+import json
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from . import instrumentation
+from .background import submit
+from .routers import apin_to_primary, pin_to_primary
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaPinMiddleware:
+    """
+    Pin a user to the primary for ``DATABASE_REPLICA_PIN_SECONDS`` after each
+    successful write they make, so their next reads see it despite replica lag.
+
+    Runs after the response, when DRF has authenticated the user; disabled
+    when no replicas are configured. Works under WSGI and ASGI alike.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        user_id = self.writer(request, response)
+        if user_id is not None:
+            pin_to_primary(user_id)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # request.user may still be the lazy session user, which must not
+            # be resolved on the event loop.
+            user_id = await sync_to_async(self.writer)(request, response)
+            if user_id is not None:
+                await apin_to_primary(user_id)
+        return response
+
+    @staticmethod
+    def writer(request, response):
+        """The id of the user whose successful write this was, if any."""
+        user = getattr(request, 'user', None)
+        if (request.method not in SAFE_METHODS and response.status_code < 400
+                and user is not None and user.is_authenticated):
+            return user.pk
+        return None
+
+
+class PerformanceMiddleware:
+    """
+    Report where each request's time went (``src.core.instrumentation``):
+    a ``Server-Timing`` header, a JSON log line, and for sampled slow
+    requests a capture of every query plus (under WSGI) a profile.
+
+    Raises ``MiddlewareNotUsed`` unless ``PERF_INSTRUMENTATION`` is set.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERF_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        connection_created.connect(instrumentation.add_query_hook)
+        for connection in connections.all(initialized_only=True):
+            instrumentation.add_query_hook(connection)
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = instrumentation.start(capture=random.random() < settings.PERF_CAPTURE_RATE)
+        profiler = instrumentation.start_profile() if stats.capture else None
+        begin = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            total = time.perf_counter() - begin
+            if profiler is not None:
+                instrumentation.stop_profile(profiler)
+            instrumentation.stop(token)
+        return self.report(request, response, stats, total, profiler)
+
+    async def __acall__(self, request):
+        # No profile: cProfile would follow the event loop through other requests.
+        stats, token = instrumentation.start(capture=random.random() < settings.PERF_CAPTURE_RATE)
+        begin = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            total = time.perf_counter() - begin
+            instrumentation.stop(token)
+        return self.report(request, response, stats, total, None)
+
+    def process_template_response(self, request, response):
+        # The outermost middleware's hook runs last, right before rendering.
+        instrumentation.time_rendering(response)
+        return response
+
+    def report(self, request, response, stats, total, profiler):
+        response['Server-Timing'] = stats.server_timing(total)
+        summary = stats.summary(request, response, total)
+        instrumentation.logger.info(json.dumps(summary))
+        if stats.capture and total * 1000 >= settings.PERF_SLOW_REQUEST_MS:
+            submit(instrumentation.save_capture, summary, stats.queries, profiler)
+        return response
@@ -0,0 +1,78 @@
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Database alias the current request reads from; None means the primary.
+_read_alias = contextvars.ContextVar('db_read_alias', default=None)
+
+
+def _pin_key(user_id):
+    return f"db_primary_pin_{user_id}"
+
+
+def pin_to_primary(user_id):
+    """After a user's write, serve their reads from the primary until the replicas have caught up."""
+    cache.set(_pin_key(user_id), 1, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+async def apin_to_primary(user_id):
+    await cache.aset(_pin_key(user_id), 1, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def read_alias_for(user):
+    """The replica to serve ``user``'s read-only request from, or ``None`` for the primary."""
+    if not settings.DATABASE_REPLICAS:
+        return None
+    if user.is_authenticated and cache.get(_pin_key(user.pk)) is not None:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+async def aread_alias_for(user):
+    if not settings.DATABASE_REPLICAS:
+        return None
+    if user.is_authenticated and await cache.aget(_pin_key(user.pk)) is not None:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def set_read_alias(alias):
+    return _read_alias.set(alias)
+
+
+def reset_read_alias(token):
+    _read_alias.reset(token)
+
+
+@contextmanager
+def reading_from(alias):
+    """Route ORM reads inside the block to ``alias`` (``None``: the primary)."""
+    token = set_read_alias(alias)
+    try:
+        yield
+    finally:
+        reset_read_alias(token)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the replica chosen for the current request and everything
+    else to the primary. Outside ``reading_from`` (writes, background tasks,
+    management commands) the primary serves reads too.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas are physical copies of the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
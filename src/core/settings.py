@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
+import socket
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import timedelta
@@ -27,6 +28,72 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 AUTH_USER_MODEL = 'users.Users'
 
+# Media pipeline: size variants (longest side in px) generated for uploaded
+# post photos and profile images. 'full' replaces the original upload.
+MEDIA_VARIANTS = {
+    'thumb': 160,
+    'small': 480,
+    'medium': 1080,
+    'full': 2048,
+}
+MEDIA_VARIANT_FORMAT = 'WEBP'
+MEDIA_VARIANT_QUALITY = 80
+MEDIA_PROCESS_WORKERS = int(os.getenv('MEDIA_PROCESS_WORKERS', os.cpu_count() or 1))
+
+# Home timelines (src/apps/posts/timeline.py): Redis sorted sets of post ids,
+# fanned out on publish except for authors with at least
+# TIMELINE_CELEBRITY_FOLLOWERS followers, whose posts are merged on read.
+TIMELINE_MAX_LENGTH = int(os.getenv('TIMELINE_MAX_LENGTH', 800))
+TIMELINE_CELEBRITY_FOLLOWERS = int(os.getenv('TIMELINE_CELEBRITY_FOLLOWERS', 10000))
+TIMELINE_FANOUT_BATCH = 1000
+TIMELINE_TTL = 7 * 24 * 3600
+
+# Hot posts (src/apps/posts/hot.py): engagement halves in weight every
+# HOT_HALF_LIFE seconds. Run `decay_hot_posts` periodically (e.g. hourly).
+HOT_HALF_LIFE = int(os.getenv('HOT_HALF_LIFE', 6 * 3600))
+HOT_LIKE_WEIGHT = 1.0
+HOT_COMMENT_WEIGHT = 3.0
+HOT_MAX_SIZE = 10000
+HOT_MIN_SCORE = 0.05
+
+# Write-behind likes (src/apps/posts/likebuffer.py): when enabled, like and
+# unlike requests are queued on a Redis stream and applied in batches by
+# `flush_likes`, which must be running.
+LIKES_WRITE_BEHIND = os.getenv('LIKES_WRITE_BEHIND', 'false').lower() == 'true'
+LIKES_STREAM_KEY = 'likes_stream'
+LIKES_STREAM_GROUP = 'like_flushers'
+LIKES_FLUSH_BATCH = int(os.getenv('LIKES_FLUSH_BATCH', 500))
+# Must stay the same across restarts of the flusher (one per stream).
+LIKES_CONSUMER_NAME = os.getenv('LIKES_CONSUMER_NAME', socket.gethostname())
+LIKES_CLAIM_IDLE_MS = 60_000
+
+# Background deletion (src/apps/posts/deletion.py): deleted posts and accounts
+# are hidden at once and purged DELETION_BATCH_SIZE rows at a time. Jobs whose
+# worker has not reported for DELETION_STALE_AFTER seconds are picked up again
+# by `purge_deletions`.
+DELETION_BATCH_SIZE = int(os.getenv('DELETION_BATCH_SIZE', 1000))
+DELETION_BATCH_PAUSE = 0.01
+DELETION_STALE_AFTER = 300
+
+# Username availability Bloom filter (src/apps/users/usernames.py). Size it
+# for the expected number of accounts; rebuild with `rebuild_username_filter`.
+USERNAME_BLOOM_CAPACITY = int(os.getenv('USERNAME_BLOOM_CAPACITY', 10_000_000))
+USERNAME_BLOOM_ERROR_RATE = 0.001
+
+# Photo upload limits, enforced while the upload streams in
+# (src/api/posts/uploadhandlers.py).
+POST_PHOTO_MAX_BYTES = int(os.getenv('POST_PHOTO_MAX_BYTES', 10 * 1024 * 1024))
+POST_PHOTO_MAX_PIXELS = int(os.getenv('POST_PHOTO_MAX_PIXELS', 40_000_000))
+# How far into the file the image header must appear.
+POST_PHOTO_HEADER_BYTES = 256 * 1024
+POST_PHOTO_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+# Spool uploads next to MEDIA_ROOT, on the same volume so saving them is a
+# rename rather than a copy, but outside it so unchecked files are never served.
+FILE_UPLOAD_TEMP_DIR = os.getenv('FILE_UPLOAD_TEMP_DIR', os.path.join(BASE_DIR, 'upload_tmp'))
+
+# Thread pool for work moved off the request thread (src/core/background.py)
+BACKGROUND_WORKERS = int(os.getenv('BACKGROUND_WORKERS', 4))
+
 
 
 # Quick-start development settings - unsuitable for production
@@ -63,26 +130,67 @@ INSTALLED_APPS = [
 ]
 
 
+# Set to 'src.api.renderers.ORJSONRenderer' for the orjson-backed renderer.
+API_JSON_RENDERER = os.getenv('API_JSON_RENDERER', 'rest_framework.renderers.JSONRenderer')
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'src.api.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        API_JSON_RENDERER,
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    # Sliding-window limits for the auth endpoints (src/api/throttling.py)
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': os.getenv('AUTH_IP_THROTTLE_RATE', '30/min'),
+        'auth_username': os.getenv('AUTH_USERNAME_THROTTLE_RATE', '10/min'),
+        'username_check': os.getenv('USERNAME_CHECK_THROTTLE_RATE', '120/min'),
+    },
 }
 
+# Cursor pagination for the post feeds
+POSTS_PAGE_SIZE = int(os.getenv('POSTS_PAGE_SIZE', 20))
+POSTS_MAX_PAGE_SIZE = int(os.getenv('POSTS_MAX_PAGE_SIZE', 100))
+POSTS_BATCH_MAX_IDS = int(os.getenv('POSTS_BATCH_MAX_IDS', 300))
+# Text search configuration for post/comment search vectors. Changing it
+# requires rebuilding the stored vectors.
+POSTS_SEARCH_CONFIG = os.getenv('POSTS_SEARCH_CONFIG', 'english')
+
+# Authenticated-user cache: per-process LRU in front of Redis
+AUTH_USER_LOCAL_TTL = int(os.getenv('AUTH_USER_LOCAL_TTL', 30))
+AUTH_USER_LOCAL_SIZE = int(os.getenv('AUTH_USER_LOCAL_SIZE', 1024))
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 300))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': True,
+    # Rotation is enforced by the Redis revocation store (src.apps.users.revocation),
+    # not by the token_blacklist app.
+    'BLACKLIST_AFTER_ROTATION': False,
+    'TOKEN_REFRESH_SERIALIZER': 'src.api.users.serializers.RevocableTokenRefreshSerializer',
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Request instrumentation (src/core/instrumentation.py): Server-Timing
+# headers and a JSON log line per request. PERF_CAPTURE_RATE of requests are
+# profiled, and those slower than PERF_SLOW_REQUEST_MS are saved to
+# PERF_CAPTURE_DIR with their queries. Off by default; no overhead when off.
+PERF_INSTRUMENTATION = os.getenv('PERF_INSTRUMENTATION', 'false').lower() == 'true'
+PERF_SLOW_REQUEST_MS = int(os.getenv('PERF_SLOW_REQUEST_MS', 500))
+PERF_CAPTURE_RATE = float(os.getenv('PERF_CAPTURE_RATE', 0.01))
+PERF_CAPTURE_DIR = BASE_DIR / 'perf_captures'
+
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": (
+            "src.core.instrumentation.InstrumentedRedisCache" if PERF_INSTRUMENTATION
+            else "django_redis.cache.RedisCache"
+        ),
         "LOCATION": "redis://127.0.0.1:6379/1",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
@@ -90,6 +198,15 @@ CACHES = {
     }
 }
 
+# Read-through caching for post detail and the first public-feed pages
+POST_CACHE_TIMEOUT = int(os.getenv('POST_CACHE_TIMEOUT', 300))
+FEED_CACHE_TIMEOUT = int(os.getenv('FEED_CACHE_TIMEOUT', 30))
+FEED_CACHE_PAGES = int(os.getenv('FEED_CACHE_PAGES', 3))
+CACHE_STALE_GRACE = 60
+CACHE_LOCK_TIMEOUT = 10
+CACHE_LOCK_POLL_ATTEMPTS = 10
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
         'Bearer': {
@@ -104,6 +221,7 @@ SWAGGER_SETTINGS = {
 
 
 MIDDLEWARE = [
+    'src.core.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -111,6 +229,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'src.core.middleware.ReplicaPinMiddleware',
 ]
 
 ROOT_URLCONF = 'src.core.urls'
@@ -137,22 +256,73 @@ WSGI_APPLICATION = 'src.core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# Connections are kept open per worker thread for DB_CONN_MAX_AGE seconds and
+# health-checked before reuse. DB_POOL=true uses psycopg 3's connection pool
+# instead (needs the psycopg[pool] package; Django then requires
+# CONN_MAX_AGE = 0).
+DB_POOL = os.getenv('DB_POOL', 'false').lower() == 'true'
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+DB_POOL_TIMEOUT = 10
+
+
+def _database(host, port):
+    database = {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
-        'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT', 5433),
+        'HOST': host,
+        'PORT': port,
+        'CONN_MAX_AGE': 0 if DB_POOL else DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
     }
+    if DB_POOL:
+        database['OPTIONS'] = {'pool': {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }}
+    return database
+
+
+DATABASES = {
+    'default': _database(os.getenv('DB_HOST'), os.getenv('DB_PORT', 5433)),
 }
 
+# Streaming replicas as "host:port,host:port" (same credentials as the
+# primary). Read-only views read from one of them (src/core/routers.py),
+# except for users pinned to the primary for DATABASE_REPLICA_PIN_SECONDS
+# after a write of their own; it should exceed the usual replication lag.
+DATABASE_REPLICAS = []
+for _number, _replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1):
+    _host, _, _port = _replica.strip().partition(':')
+    DATABASES[f'replica{_number}'] = {**_database(_host, _port or 5432), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{_number}')
+DATABASE_ROUTERS = ['src.core.routers.ReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv('DATABASE_REPLICA_PIN_SECONDS', 5))
+
 
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# The first hasher hashes new passwords; the pooled one shares the
+# pbkdf2_sha256 format, so existing hashes keep verifying.
+PASSWORD_HASHERS = [
+    'src.core.hashers.PooledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# Per request process: hashing processes, extra hashes allowed to wait for
+# one, and how long a request may wait for a slot before getting a 503.
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', 8))
+PASSWORD_HASH_WAIT = 0.5
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from src.apps.posts.models import Comment, Like, Post
+from src.apps.posts.search import update_comment_search_vectors, update_post_search_vectors
+from src.apps.users.models import Users
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class QueryBudgetTestCase(APITestCase):
+    """
+    Base class for endpoint query-budget tests.
+
+    ``assertQueryBudget`` fails when a request runs more SQL statements than its
+    budget and prints every captured statement, so an N+1 regression shows up as
+    a list of near-identical queries in the failure message. Each test starts
+    with an empty in-process cache, so budgets measure the cache-miss path.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def seed(self, users=5, posts_per_user=10, likes_per_post=5, comments_per_post=5, status='published'):
+        accounts = Users.objects.bulk_create(
+            Users(username=f'seeduser{i}', email=f'seed{i}@example.com')
+            for i in range(users)
+        )
+        posts = Post.objects.bulk_create(
+            Post(user=author, title=f'Post {n} by {author.username}', body='Body', status=status)
+            for author in accounts
+            for n in range(posts_per_user)
+        )
+        Like.objects.bulk_create(
+            Like(post=post, user=accounts[i % users])
+            for post in posts
+            for i in range(likes_per_post)
+        )
+        Comment.objects.bulk_create(
+            Comment(post=post, user=accounts[i % users], content=f'Comment {i}')
+            for post in posts
+            for i in range(comments_per_post)
+        )
+        # bulk_create skips the signals that maintain the search vectors.
+        update_post_search_vectors(Post.objects.filter(user__in=accounts))
+        update_comment_search_vectors(Comment.objects.filter(user__in=accounts))
+        return accounts, posts
+
+    def assertQueryBudget(self, budget, path, user=None, method='get', **kwargs):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as captured:
+            response = getattr(self.client, method)(path, **kwargs)
+
+        if len(captured) > budget:
+            statements = '\n'.join(f"{i}. {q['sql']}" for i, q in enumerate(captured.captured_queries, 1))
+            self.fail(
+                f"{method.upper()} {path} ran {len(captured)} queries, budget is {budget}:\n{statements}"
+            )
+        return response
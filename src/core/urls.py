@@ -7,6 +7,7 @@ from rest_framework import permissions
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from src.api.throttling import AuthIPThrottle, AuthUsernameThrottle
 from src.core import settings
 
 schema_view = get_schema_view(
@@ -25,7 +26,9 @@ urlpatterns = [
     path('api/users/', include('src.api.users.urls')),
     path('api/posts/', include('src.api.posts.urls')),
 
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    # Same credential check as auth/login/, so the same throttles apply.
+    path('api/token/', TokenObtainPairView.as_view(throttle_classes=[AuthIPThrottle, AuthUsernameThrottle]),
+         name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
     path('', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),